@@ -69,6 +69,17 @@ DATABASES = {
     }
 }
 
+# Cache shared by every worker process: version tokens of template plans,
+# statistics snapshots and calendar feeds must be seen by all of them. The
+# table is created by migration 0010; a Redis or Memcached backend can be
+# used instead where available.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'apqp_cache',
+    }
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -165,3 +176,7 @@ JWT_AUTH = {
     'JWT_EXPIRATION_DELTA': timedelta(days=1),
     'JWT_ALGORITHM': 'HS256',
 }
+
+# Working calendar used to plan timelines
+TIMELINE_WEEKEND_DAYS = [5, 6]  # Saturday and Sunday (Monday is 0)
+TIMELINE_HOLIDAYS = []  # Plant holidays as ISO dates, e.g. '2025-12-25'
@@ -0,0 +1,54 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from core.models import Project
+from core.services.analyse import api as analyse_api
+
+# Analyses measured per project
+PROJECT_ANALYSES = {
+    'deadline_violations': analyse_api.analyze_deadline_violations,
+    'critical_path': analyse_api.analyze_critical_path,
+    'resource_allocation': analyse_api.detect_resource_allocation_problems,
+    'schedule_risk': analyse_api.analyze_schedule_risk,
+}
+
+
+class Command(BaseCommand):
+    help = "Measure statement count and latency of a project analysis"
+
+    def add_arguments(self, parser):
+        parser.add_argument('analysis', choices=sorted(PROJECT_ANALYSES))
+        parser.add_argument('--project', type=int, help="Project ID (defaults to the largest project)")
+        parser.add_argument('--runs', type=int, default=5, help="Number of runs (default: 5)")
+
+    def handle(self, *args, **options):
+        project_id = options['project'] or self._largest_project_id()
+        analysis = PROJECT_ANALYSES[options['analysis']]
+
+        statements = []
+        durations = []
+        for _ in range(options['runs']):
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                result = analysis(project_id)
+                durations.append(time.perf_counter() - start)
+            statements.append(len(queries.captured_queries))
+
+        if isinstance(result, dict) and result.get('error'):
+            raise CommandError(result['error'])
+
+        durations.sort()
+        self.stdout.write(
+            f"{options['analysis']} on project {project_id}: {max(statements)} statements, "
+            f"median {durations[len(durations) // 2] * 1000:.1f} ms over {options['runs']} runs"
+        )
+
+    def _largest_project_id(self):
+        project = Project.objects.annotate(
+            output_count=Count('ppaps__phases__outputs')
+        ).order_by('-output_count', 'id').first()
+        if project is None:
+            raise CommandError("No project found to run the benchmark with")
+        return project.id
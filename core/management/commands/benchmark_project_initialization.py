@@ -0,0 +1,75 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from core.models import Client, Team
+from core.services.project.initialization import initialize_project
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare statement count and latency of the per-record and bulk "
+        "project initialization paths. Every run is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--client', type=int, help="Client ID (defaults to the first client)")
+        parser.add_argument('--team', type=int, help="Team ID (defaults to the first team)")
+        parser.add_argument('--level', type=int, default=3, help="PPAP level (default: 3)")
+        parser.add_argument('--runs', type=int, default=5, help="Runs per path (default: 5)")
+
+    def handle(self, *args, **options):
+        client = self._get(Client, options['client'])
+        team = self._get(Team, options['team'])
+
+        results = {}
+        for label, bulk in (('per-record', False), ('bulk', True)):
+            statements = []
+            durations = []
+            for _ in range(options['runs']):
+                count, duration = self._run(client.id, team.id, options['level'], bulk)
+                statements.append(count)
+                durations.append(duration)
+            durations.sort()
+            results[label] = (max(statements), durations[len(durations) // 2])
+
+            self.stdout.write(
+                f"{label:>10}: {max(statements)} statements, "
+                f"median {durations[len(durations) // 2] * 1000:.1f} ms over {options['runs']} runs"
+            )
+
+        per_record, bulk = results['per-record'], results['bulk']
+        if bulk[0] and bulk[1]:
+            self.stdout.write(self.style.SUCCESS(
+                f"bulk path: {per_record[0] / bulk[0]:.1f}x fewer statements, "
+                f"{per_record[1] / bulk[1]:.1f}x faster"
+            ))
+
+    def _get(self, model, pk):
+        instance = model.objects.filter(id=pk).first() if pk else model.objects.order_by('id').first()
+        if instance is None:
+            raise CommandError(f"No {model.__name__} found to run the benchmark with")
+        return instance
+
+    def _run(self, client_id, team_id, level, bulk):
+        """Initialize one project inside a transaction that is rolled back"""
+        start = time.perf_counter()
+        try:
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as queries:
+                    # Run the commit callbacks as the commit would
+                    with TestCase.captureOnCommitCallbacks(execute=True):
+                        initialize_project(
+                            "Benchmark project", "Initialization benchmark",
+                            client_id, team_id, ppap_level=level, bulk=bulk
+                        )
+                duration = time.perf_counter() - start
+                raise _Rollback()
+        except _Rollback:
+            pass
+        return len(queries.captured_queries), duration
@@ -0,0 +1,65 @@
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from core.models import Project
+from core.services.timeline.functions import set_project_timeline
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure statement count and latency of set_project_timeline on one "
+        "project (by default the one with the most outputs, e.g. a 500-output "
+        "PPAP). Every run is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--project', type=int, help="Project ID (defaults to the project with the most outputs)")
+        parser.add_argument('--days', type=int, default=180, help="Days until the deadline (default: 180)")
+        parser.add_argument('--runs', type=int, default=5, help="Runs (default: 5)")
+
+    def handle(self, *args, **options):
+        projects = Project.objects.annotate(outputs=Count('ppap__phases__outputs'))
+        if options['project']:
+            project = projects.filter(id=options['project']).first()
+        else:
+            project = projects.order_by('-outputs', 'id').first()
+        if project is None:
+            raise CommandError("No project found to run the benchmark with")
+
+        deadline = timezone.now() + timedelta(days=options['days'])
+        statements = []
+        durations = []
+        for _ in range(options['runs']):
+            count, duration = self._run(project.id, deadline)
+            statements.append(count)
+            durations.append(duration)
+        durations.sort()
+
+        self.stdout.write(
+            f"project {project.id} ({project.outputs} outputs): {max(statements)} statements, "
+            f"median {durations[len(durations) // 2] * 1000:.1f} ms over {options['runs']} runs"
+        )
+
+    def _run(self, project_id, deadline):
+        """Set the timeline of a project inside a transaction that is rolled back"""
+        start = time.perf_counter()
+        try:
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as queries:
+                    # Run the commit callbacks as the commit would
+                    with TestCase.captureOnCommitCallbacks(execute=True):
+                        set_project_timeline(project_id, deadline)
+                duration = time.perf_counter() - start
+                raise _Rollback()
+        except _Rollback:
+            pass
+        return len(queries.captured_queries), duration
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from core.models import Project
+from core.services.project.rollup import rebuild_project_rollup
+
+
+class Command(BaseCommand):
+    help = "Rebuild the project rollup counters from scratch"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project', type=int, action='append', dest='project_ids',
+            help="Only rebuild this project (can be repeated)"
+        )
+
+    def handle(self, *args, **options):
+        project_ids = Project.objects.order_by('id').values_list('id', flat=True)
+        if options['project_ids']:
+            project_ids = project_ids.filter(id__in=options['project_ids'])
+
+        rebuilt = 0
+        for project_id in project_ids.iterator():
+            rebuild_project_rollup(project_id)
+            rebuilt += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rebuilt} project rollup(s)"))
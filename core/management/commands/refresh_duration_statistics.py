@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from core.services.analyse.durations import refresh_duration_statistics
+
+
+class Command(BaseCommand):
+    help = "Recompute the cached duration distributions of output and phase templates"
+
+    def handle(self, *args, **options):
+        written = refresh_duration_statistics()
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} duration distribution(s)"))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from core.services.analyse.early_warnings import refresh_early_warnings
+
+
+class Command(BaseCommand):
+    help = "Update the early warnings of entities that changed since the last run"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help="Re-evaluate every entity instead of only the changed ones"
+        )
+
+    def handle(self, *args, **options):
+        run = refresh_early_warnings(full=options['full'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{'Full' if run.full else 'Incremental'} refresh: {run.evaluated} evaluated, "
+            f"{run.upserted} upserted, {run.removed} removed "
+            f"in {(run.finished_at - run.started_at).total_seconds():.2f}s"
+        ))
@@ -0,0 +1,77 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+import django
+from django.core.management.base import BaseCommand
+
+# Pool processes are spawned, not forked, so none shares the parent's
+# database connections. They import this module before Django is set up,
+# hence no model or service import at module level.
+
+
+def _initialize_process():
+    django.setup()
+
+
+def _compute_metric(metric, parameters):
+    from core.services.analyse.reports import compute_report_metric
+    return compute_report_metric(metric, parameters)
+
+
+class Command(BaseCommand):
+    help = "Compute pending report jobs, running each metric family in a process pool"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 1,
+                            help="Worker processes (default: number of CPUs)")
+        parser.add_argument('--poll-interval', type=float, default=2.0,
+                            help="Seconds to wait when no job is pending (default: 2)")
+        parser.add_argument('--stale-after', type=int, default=30,
+                            help="Minutes after which a running job is requeued (default: 30)")
+        parser.add_argument('--once', action='store_true',
+                            help="Exit once no job is pending")
+
+    def handle(self, *args, **options):
+        from core.services.analyse.reports import (
+            claim_report_jobs,
+            complete_report_job,
+            requeue_stale_report_jobs
+        )
+
+        requeued = requeue_stale_report_jobs(timedelta(minutes=options['stale_after']))
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale report job(s)")
+
+        with ProcessPoolExecutor(
+            max_workers=options['processes'],
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_initialize_process
+        ) as pool:
+            while True:
+                jobs = claim_report_jobs(options['processes'])
+                if not jobs:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                # Submit every metric of the claimed jobs before waiting on any
+                futures = [
+                    (job, {
+                        metric: pool.submit(_compute_metric, metric, job.parameters)
+                        for metric in job.parameters['metrics']
+                    })
+                    for job in jobs
+                ]
+
+                for job, metric_futures in futures:
+                    try:
+                        data = {metric: future.result() for metric, future in metric_futures.items()}
+                    except Exception as e:
+                        complete_report_job(job, error=str(e))
+                        self.stderr.write(f"Report job {job.id} failed: {e}")
+                    else:
+                        complete_report_job(job, data)
+                        self.stdout.write(f"Report job {job.id} completed")
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HistoryEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('type', models.CharField(max_length=50)),
+                ('details', models.TextField(blank=True)),
+                ('timestamp', models.DateTimeField()),
+                ('history', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='history_events', to='core.history')),
+            ],
+            options={
+                'db_table': 'history_event',
+                'ordering': ['history_id', 'id'],
+                'indexes': [models.Index(fields=['history', 'id'], name='history_event_history_idx')],
+            },
+        ),
+    ]
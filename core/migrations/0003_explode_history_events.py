@@ -0,0 +1,103 @@
+import json
+from datetime import timezone as dt_timezone
+
+from django.db import migrations
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+BATCH_SIZE = 2000
+
+
+def _parse_legacy_events(history):
+    """Turn a legacy History.event blob into (type, details, timestamp) tuples"""
+    try:
+        data = json.loads(history.event)
+    except (json.JSONDecodeError, TypeError):
+        data = None
+
+    if isinstance(data, list):
+        events = []
+        for item in data:
+            if not isinstance(item, dict):
+                continue
+            timestamp = item.get('timestamp')
+            parsed = parse_datetime(timestamp) if isinstance(timestamp, str) else None
+            if parsed and timezone.is_naive(parsed):
+                parsed = timezone.make_aware(parsed, dt_timezone.utc)
+            events.append((
+                str(item.get('type') or 'action')[:50],
+                str(item.get('details') or ''),
+                parsed or history.created_at
+            ))
+        return events
+
+    # Plain text (or non-list JSON) blobs become a single event, matching
+    # the fallback used by process_history_records
+    if not history.event:
+        return []
+    return [(history.table_name[:50] or 'action', str(history.event), history.created_at)]
+
+
+def explode_history_events(apps, schema_editor):
+    History = apps.get_model('core', 'History')
+    HistoryEvent = apps.get_model('core', 'HistoryEvent')
+
+    pending_events = []
+    exploded_ids = []
+
+    for history in History.objects.exclude(event='[]').only(
+        'id', 'event', 'table_name', 'created_at'
+    ).iterator(chunk_size=BATCH_SIZE):
+        for event_type, details, timestamp in _parse_legacy_events(history):
+            pending_events.append(HistoryEvent(
+                history_id=history.id,
+                type=event_type,
+                details=details,
+                timestamp=timestamp
+            ))
+        exploded_ids.append(history.id)
+
+        if len(exploded_ids) >= BATCH_SIZE:
+            HistoryEvent.objects.bulk_create(pending_events, batch_size=BATCH_SIZE)
+            History.objects.filter(id__in=exploded_ids).update(event='[]')
+            pending_events = []
+            exploded_ids = []
+
+    if exploded_ids:
+        HistoryEvent.objects.bulk_create(pending_events, batch_size=BATCH_SIZE)
+        History.objects.filter(id__in=exploded_ids).update(event='[]')
+
+
+def implode_history_events(apps, schema_editor):
+    History = apps.get_model('core', 'History')
+    HistoryEvent = apps.get_model('core', 'HistoryEvent')
+
+    current_id = None
+    current_events = []
+
+    def flush():
+        if current_id is not None:
+            History.objects.filter(id=current_id).update(event=json.dumps(current_events))
+
+    for event in HistoryEvent.objects.order_by('history_id', 'id').iterator(chunk_size=BATCH_SIZE):
+        if event.history_id != current_id:
+            flush()
+            current_id = event.history_id
+            current_events = []
+        current_events.append({
+            "type": event.type,
+            "details": event.details,
+            "timestamp": event.timestamp.isoformat()
+        })
+    flush()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_historyevent'),
+    ]
+
+    operations = [
+        migrations.RunPython(explode_history_events, implode_history_events),
+    ]
@@ -0,0 +1,64 @@
+from django.db import migrations
+from django.db.models import CharField, F, Value
+from django.db.models.functions import Cast, Concat
+
+# Fields derived from the primary key, per model, as written by the former
+# save() overrides and by HistoryIdMixin
+DERIVED_ID_SUFFIXES = {
+    'Project': {'history_id': 'project'},
+    'PPAP': {'history_id': 'ppap'},
+    'Phase': {'history_id': 'phase'},
+    'Output': {'history_id': 'output'},
+    'Document': {'history_id': 'document'},
+    'Team': {'history_id': 'team'},
+    'Department': {'history_id': 'department'},
+    'User': {'history_id': 'user'},
+    'Person': {'contact_id': 'person', 'history_id': 'person'},
+    'Permission': {'history_id': 'permission'},
+    'Authorization': {'history_id': 'authorization'},
+    'Client': {'contact_id': 'client', 'history_id': 'history'},
+}
+
+SAMPLE_SIZE = 5
+
+
+def verify_derived_ids(apps, schema_editor):
+    """
+    Check that existing rows already hold the IDs HistoryIdMixin derives
+
+    The mixin only changes how IDs are written for new rows, so nothing is
+    rewritten here. History rows reference these IDs, so rows that do not
+    follow the scheme (for instance temp_ values left behind by an
+    interrupted two-step save) are not fixed automatically: the migration
+    stops and lists them so they can be repaired before migrating again.
+    """
+    errors = []
+    for model_name, suffixes in DERIVED_ID_SUFFIXES.items():
+        model = apps.get_model('core', model_name)
+        for field, suffix in suffixes.items():
+            expected = Concat(Cast('id', CharField()), Value(suffix), output_field=CharField())
+            mismatched = model.objects.using(schema_editor.connection.alias).annotate(
+                expected_id=expected
+            ).exclude(**{field: F('expected_id')})
+
+            count = mismatched.count()
+            if count:
+                sample = list(mismatched.order_by('id').values_list('id', field)[:SAMPLE_SIZE])
+                errors.append(
+                    f"{model._meta.db_table}.{field}: {count} row(s) do not match "
+                    f"f\"{{id}}{suffix}\" (e.g. {sample})"
+                )
+
+    if errors:
+        raise RuntimeError("Rows with non-derived IDs found:\n  " + "\n  ".join(errors))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_explode_history_events'),
+    ]
+
+    operations = [
+        migrations.RunPython(verify_derived_ids, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+CUSTOM_LEVEL = 0
+
+
+def populate_element_levels(apps, schema_editor):
+    """Explode PPAPElement.level strings into ppap_element_level rows"""
+    PPAPElement = apps.get_model('core', 'PPAPElement')
+    PPAPElementLevel = apps.get_model('core', 'PPAPElementLevel')
+
+    rows = []
+    for element_id, level_string in PPAPElement.objects.values_list('id', 'level').iterator():
+        levels = set()
+        for token in (level_string or '').split(','):
+            token = token.strip().lower()
+            if token == 'custom':
+                levels.add(CUSTOM_LEVEL)
+            elif token.isdigit() and int(token) > 0:
+                levels.add(int(token))
+        rows.extend(PPAPElementLevel(element_id=element_id, level=level) for level in sorted(levels))
+
+    PPAPElementLevel.objects.bulk_create(rows, batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_verify_derived_ids'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PPAPElementLevel',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('level', models.PositiveSmallIntegerField()),
+                ('element', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='levels', to='core.ppapelement')),
+            ],
+            options={
+                'db_table': 'ppap_element_level',
+                'ordering': ['element_id', 'level'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='ppapelementlevel',
+            constraint=models.UniqueConstraint(fields=('level', 'element'), name='ppap_element_level_unique'),
+        ),
+        migrations.RunPython(populate_element_levels, migrations.RunPython.noop),
+    ]
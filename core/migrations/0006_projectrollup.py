@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-17 19:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_ppapelementlevel'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectRollup',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rollup', serialize=False, to='core.project')),
+                ('outputs_total', models.IntegerField(default=0)),
+                ('outputs_by_status', models.JSONField(default=dict)),
+                ('phases_total', models.IntegerField(default=0)),
+                ('phases_completed', models.IntegerField(default=0)),
+                ('overdue_outputs', models.IntegerField(default=0)),
+                ('overdue_as_of', models.DateTimeField(blank=True, null=True)),
+                ('documents', models.IntegerField(default=0)),
+                ('last_activity_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'project_rollup',
+                'ordering': ['project_id'],
+            },
+        ),
+    ]
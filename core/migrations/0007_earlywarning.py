@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-17 20:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_projectrollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EarlyWarningRun',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('full', models.BooleanField(default=False)),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('last_event_id', models.BigIntegerField(default=0)),
+                ('evaluated', models.IntegerField(default=0)),
+                ('upserted', models.IntegerField(default=0)),
+                ('removed', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'early_warning_run',
+                'ordering': ['-id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='EarlyWarning',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('fingerprint', models.CharField(max_length=64, unique=True)),
+                ('type', models.CharField(max_length=50)),
+                ('level', models.CharField(max_length=20)),
+                ('entity_type', models.CharField(max_length=50)),
+                ('entity_id', models.CharField(max_length=100)),
+                ('entity_name', models.CharField(blank=True, max_length=255)),
+                ('reference_at', models.DateTimeField(blank=True, null=True)),
+                ('details', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='early_warnings', to='core.project')),
+            ],
+            options={
+                'db_table': 'early_warning',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['level', 'type'], name='early_warning_level_type_idx'), models.Index(fields=['entity_type', 'entity_id'], name='early_warning_entity_idx')],
+            },
+        ),
+    ]
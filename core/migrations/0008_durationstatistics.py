@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-17 20:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_earlywarning'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DurationStatistics',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('count', models.IntegerField(default=0)),
+                ('mean', models.FloatField()),
+                ('p50', models.FloatField()),
+                ('p90', models.FloatField()),
+                ('p95', models.FloatField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('output_template', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='duration_statistics', to='core.outputtemplate')),
+                ('phase_template', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='duration_statistics', to='core.phasetemplate')),
+            ],
+            options={
+                'db_table': 'duration_statistics',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='durationstatistics',
+            constraint=models.CheckConstraint(check=models.Q(models.Q(('output_template__isnull', False), ('phase_template__isnull', True)), models.Q(('output_template__isnull', True), ('phase_template__isnull', False)), _connector='OR'), name='duration_statistics_one_template'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 20:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_create_cache_table'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='historyevent',
+            index=models.Index(fields=['timestamp'], name='history_event_timestamp_idx'),
+        ),
+    ]
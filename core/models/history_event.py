@@ -0,0 +1,19 @@
+from django.db import models
+
+class HistoryEvent(models.Model):
+    id = models.BigAutoField(primary_key=True)
+    history = models.ForeignKey('History', on_delete=models.CASCADE, related_name='history_events', db_index=False)
+    type = models.CharField(max_length=50)
+    details = models.TextField(blank=True)
+    timestamp = models.DateTimeField()
+
+    class Meta:
+        db_table = 'history_event'
+        ordering = ['history_id', 'id']
+        indexes = [
+            models.Index(fields=['history', 'id'], name='history_event_history_idx'),
+            models.Index(fields=['timestamp'], name='history_event_timestamp_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.type} on {self.history_id} - {self.timestamp}"
@@ -0,0 +1,128 @@
+import uuid
+from django.db import connections, router
+
+
+def reserve_ids(model, count, using=None):
+    """
+    Reserve primary key values from the sequence of a model's table
+
+    Args:
+        model: Model class with an auto-incremented primary key
+        count (int): Number of IDs to reserve
+        using (str, optional): Database alias
+
+    Returns:
+        list or None: Reserved IDs in increasing order, or None when the
+        database backend has no sequence to draw from
+    """
+    using = using or router.db_for_write(model)
+    connection = connections[using]
+
+    if connection.vendor != 'postgresql':
+        return None
+    if count <= 0:
+        return []
+
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)",
+            [table, model._meta.pk.column, count]
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+class HistoryIdMixin:
+    """
+    Derive history_id (and similar ID-based fields) from the primary key
+
+    Subclasses map each derived field to its suffix, e.g.
+    {'history_id': 'phase'} gives history_id = f"{id}phase". On PostgreSQL
+    the primary key is reserved from the table sequence before the INSERT,
+    so the row is written with its final values in a single INSERT, and
+    bulk_create_with_history_ids() does the same for many rows. Other
+    backends insert with temporary values and rewrite them right after.
+    """
+    derived_id_suffixes = {}
+
+    def assign_derived_ids(self):
+        """Set the derived fields from the current primary key"""
+        for field, suffix in self.derived_id_suffixes.items():
+            setattr(self, field, f"{self.pk}{suffix}")
+
+    def _assign_temporary_ids(self):
+        """Fill empty derived fields with unique placeholders"""
+        temp_uuid = uuid.uuid4().hex
+        for field in self.derived_id_suffixes:
+            if not getattr(self, field):
+                setattr(self, field, f"temp_{temp_uuid}")
+
+    def save(self, *args, **kwargs):
+        # Existing records and records with an explicit ID are saved normally
+        if self.pk is not None or not self._state.adding:
+            return super().save(*args, **kwargs)
+
+        model = type(self)
+        using = kwargs.get('using') or router.db_for_write(model, instance=self)
+
+        ids = reserve_ids(model, 1, using=using)
+        if ids is not None:
+            self.pk = ids[0]
+            self.assign_derived_ids()
+            kwargs['force_insert'] = True
+            return super().save(*args, **kwargs)
+
+        # No sequence available: insert first, then rewrite the derived fields
+        self._assign_temporary_ids()
+        super().save(*args, **kwargs)
+        self.assign_derived_ids()
+        model._base_manager.using(using).filter(pk=self.pk).update(**{
+            field: getattr(self, field) for field in self.derived_id_suffixes
+        })
+
+    @classmethod
+    def bulk_create_with_history_ids(cls, objs, using=None, batch_size=None):
+        """
+        Bulk create instances with their derived fields set
+
+        Args:
+            objs (list): Unsaved instances
+            using (str, optional): Database alias
+            batch_size (int, optional): Rows per INSERT statement
+
+        Returns:
+            list: The created instances, with id and derived fields set
+        """
+        objs = list(objs)
+        if not objs:
+            return objs
+
+        using = using or router.db_for_write(cls)
+        manager = cls._base_manager.using(using)
+
+        ids = reserve_ids(cls, len(objs), using=using)
+        if ids is not None:
+            for obj, obj_id in zip(objs, ids):
+                obj.pk = obj_id
+                obj.assign_derived_ids()
+            manager.bulk_create(objs, batch_size=batch_size)
+            return objs
+
+        for obj in objs:
+            obj._assign_temporary_ids()
+        manager.bulk_create(objs, batch_size=batch_size)
+
+        # Backends that cannot return IDs from a bulk insert are looked up
+        # through the temporary history IDs
+        if any(obj.pk is None for obj in objs):
+            ids_by_history_id = dict(manager.filter(
+                history_id__in=[obj.history_id for obj in objs]
+            ).values_list('history_id', 'pk'))
+            for obj in objs:
+                obj.pk = ids_by_history_id[obj.history_id]
+
+        for obj in objs:
+            obj.assign_derived_ids()
+        manager.bulk_update(objs, list(cls.derived_id_suffixes), batch_size=batch_size)
+
+        return objs
@@ -1,4 +1,5 @@
 from django.db import models
+from core.models.mixins import HistoryIdMixin
 import uuid
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 
@@ -23,7 +24,7 @@ class UserManager(BaseUserManager):
 
         return self.create_user(username, password, **extra_fields)
 
-class User(AbstractBaseUser, PermissionsMixin):
+class User(HistoryIdMixin, AbstractBaseUser, PermissionsMixin):
     id = models.AutoField(primary_key=True)
     username = models.CharField(max_length=150, unique=True)
     password = models.CharField(max_length=128)
@@ -40,40 +41,12 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = 'username'
     REQUIRED_FIELDS = []
 
+    # Fields derived from the ID when the record is inserted
+    derived_id_suffixes = {'history_id': 'user'}
+
     class Meta:
         db_table = 'user'
         ordering = ['username']
 
     def __str__(self):
         return self.username
-
-    def save(self, *args, **kwargs):
-        # Prepare for a new record
-        create_new = self.id is None
-        
-        # For new records, set a temporary unique value before first save
-        if create_new:
-            # Generate a temporary unique ID to avoid constraint violation
-            import uuid
-            temp_uuid = uuid.uuid4().hex
-            
-            # Set temporary unique values for constrained fields
-            if not self.history_id:
-                self.history_id = f"temp_{temp_uuid}"
-            
-            # First save to get an ID
-            super().save(*args, **kwargs)
-            
-            # Now set the real ID based on the output ID
-            new_history_id = f"{self.id}user"
-            
-            # Use update to avoid another save() call
-            User.objects.filter(id=self.id).update(
-                history_id=new_history_id
-            )
-            
-            # Update the instance attribute to match the database
-            self.history_id = new_history_id
-        else:
-            # For existing records, save normally
-            super().save(*args, **kwargs)
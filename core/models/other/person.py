@@ -1,7 +1,8 @@
 from django.db import models
+from core.models.mixins import HistoryIdMixin
 import uuid
 
-class Person(models.Model):
+class Person(HistoryIdMixin, models.Model):
     id = models.AutoField(primary_key=True)
     first_name = models.CharField(max_length=255)
     last_name = models.CharField(max_length=255)
@@ -12,45 +13,12 @@ class Person(models.Model):
     is_user = models.BooleanField(default=False)
     history_id = models.CharField(max_length=100, unique=True)
 
+    # Fields derived from the ID when the record is inserted
+    derived_id_suffixes = {'contact_id': 'person', 'history_id': 'person'}
+
     class Meta:
         db_table = 'person'
         ordering = ['last_name', 'first_name']
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
-
-    def save(self, *args, **kwargs):
-        # Prepare for a new record
-        create_new = self.id is None
-        
-        # For new records, set a temporary unique values before first save
-        if create_new:
-            # Generate a temporary unique ID to avoid constraint violation
-            import uuid
-            temp_uuid = uuid.uuid4().hex
-            
-            # Set temporary unique values for constrained fields
-            if not self.contact_id:
-                self.contact_id = f"temp_{temp_uuid}"
-            if not self.history_id:
-                self.history_id = f"temp_{temp_uuid}"
-            
-            # First save to get an ID
-            super().save(*args, **kwargs)
-            
-            # Now set the real IDs based on the person ID
-            new_contact_id = f"{self.id}person"
-            new_history_id = f"{self.id}person"
-            
-            # Use update to avoid another save() call
-            Person.objects.filter(id=self.id).update(
-                contact_id=new_contact_id,
-                history_id=new_history_id
-            )
-            
-            # Update the instance attributes to match the database
-            self.contact_id = new_contact_id
-            self.history_id = new_history_id
-        else:
-            # For existing records, save normally
-            super().save(*args, **kwargs)
@@ -0,0 +1,39 @@
+from django.db import models
+
+class ReportJob(models.Model):
+    """
+    Custom report computed in the background
+
+    Jobs are created by the report-jobs API and picked up by
+    `manage.py run_report_worker`. parameters holds the normalized report
+    parameters and cache_key their digest: a completed job is reused by
+    later submissions with the same key until it expires.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    cache_key = models.CharField(max_length=64)
+    parameters = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+    requested_by = models.ForeignKey('User', on_delete=models.SET_NULL, null=True, blank=True, related_name='report_jobs')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'report_job'
+        ordering = ['-id']
+        indexes = [
+            models.Index(fields=['cache_key', 'status'], name='report_job_cache_key_idx'),
+            models.Index(fields=['status', 'id'], name='report_job_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"Report job {self.id} ({self.status})"
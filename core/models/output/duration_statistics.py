@@ -0,0 +1,41 @@
+from django.db import models
+from django.db.models import Q
+
+class DurationStatistics(models.Model):
+    """
+    Distribution of historical durations of one output or phase template
+
+    Durations are started_at -> finished_at of the History of completed
+    outputs (or phases) of the template, in days. Rows are refreshed when
+    an output or phase completes; rebuilt with
+    `manage.py refresh_duration_statistics`.
+    """
+    id = models.AutoField(primary_key=True)
+    output_template = models.OneToOneField(
+        'OutputTemplate', on_delete=models.CASCADE, null=True, blank=True, related_name='duration_statistics'
+    )
+    phase_template = models.OneToOneField(
+        'PhaseTemplate', on_delete=models.CASCADE, null=True, blank=True, related_name='duration_statistics'
+    )
+    count = models.IntegerField(default=0)
+    mean = models.FloatField()
+    p50 = models.FloatField()
+    p90 = models.FloatField()
+    p95 = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'duration_statistics'
+        ordering = ['id']
+        constraints = [
+            models.CheckConstraint(
+                check=Q(output_template__isnull=False, phase_template__isnull=True) |
+                      Q(output_template__isnull=True, phase_template__isnull=False),
+                name='duration_statistics_one_template'
+            ),
+        ]
+
+    def __str__(self):
+        if self.output_template_id:
+            return f"Durations of OutputTemplate {self.output_template_id}"
+        return f"Durations of PhaseTemplate {self.phase_template_id}"
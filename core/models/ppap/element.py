@@ -11,3 +11,17 @@ class PPAPElement(models.Model):
 
     def __str__(self):
         return self.name
+
+    def sync_levels(self):
+        """Rewrite the normalized level rows from the level string (run on post_save)"""
+        from core.models import PPAPElementLevel
+
+        levels = PPAPElementLevel.parse_levels(self.level)
+        stored = set(self.levels.values_list('level', flat=True))
+
+        if stored - levels:
+            self.levels.filter(level__in=stored - levels).delete()
+        if levels - stored:
+            PPAPElementLevel.objects.bulk_create([
+                PPAPElementLevel(element=self, level=level) for level in sorted(levels - stored)
+            ])
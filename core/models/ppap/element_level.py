@@ -0,0 +1,77 @@
+from django.db import models
+
+class PPAPElementLevel(models.Model):
+    """
+    One PPAP level at which a PPAPElement is required
+
+    Normalized, indexed form of PPAPElement.level ("1,4,custom"); the
+    'custom' marker is stored as level 0.
+    """
+    CUSTOM_LEVEL = 0
+
+    id = models.AutoField(primary_key=True)
+    element = models.ForeignKey('PPAPElement', on_delete=models.CASCADE, related_name='levels')
+    level = models.PositiveSmallIntegerField()
+
+    class Meta:
+        db_table = 'ppap_element_level'
+        ordering = ['element_id', 'level']
+        constraints = [
+            models.UniqueConstraint(fields=['level', 'element'], name='ppap_element_level_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.element_id} at level {self.level}"
+
+    @classmethod
+    def parse_levels(cls, level_string):
+        """
+        Parse a comma-separated level string into level numbers
+
+        Args:
+            level_string (str): Levels such as "1,4,custom"
+
+        Returns:
+            set: Level numbers, CUSTOM_LEVEL standing for 'custom'.
+            Unknown tokens are ignored.
+        """
+        levels = set()
+        for token in (level_string or '').split(','):
+            token = token.strip().lower()
+            if token == 'custom':
+                levels.add(cls.CUSTOM_LEVEL)
+            elif token.isdigit() and int(token) > 0:
+                levels.add(int(token))
+        return levels
+
+    @classmethod
+    def matching_levels(cls, ppap_level):
+        """
+        Get the stored levels that select elements for a PPAP level
+
+        Args:
+            ppap_level: PPAP level
+
+        Returns:
+            list: The level itself (when numeric) and CUSTOM_LEVEL
+        """
+        levels = [cls.CUSTOM_LEVEL]
+        if str(ppap_level).strip().isdigit() and int(ppap_level) > 0:
+            levels.append(int(ppap_level))
+        return levels
+
+    @classmethod
+    def element_ids_for_level(cls, ppap_level):
+        """
+        Get the IDs of the elements required at a PPAP level
+
+        Resolved on the (level, element) index; meant to be used as an
+        element_id__in subquery.
+
+        Args:
+            ppap_level: PPAP level
+
+        Returns:
+            QuerySet: element_id values
+        """
+        return cls.objects.filter(level__in=cls.matching_levels(ppap_level)).values('element_id')
@@ -1,8 +1,9 @@
 from django.db import models
+from core.models.mixins import HistoryIdMixin
 import uuid
 import json
 
-class Client(models.Model):
+class Client(HistoryIdMixin, models.Model):
     id = models.AutoField(primary_key=True)
     name = models.CharField(max_length=255)
     address = models.TextField()
@@ -12,6 +13,9 @@ class Client(models.Model):
     contact_id = models.CharField(max_length=100, unique=True)
     history_id = models.CharField(max_length=100, unique=True)
 
+    # Fields derived from the ID when the record is inserted
+    derived_id_suffixes = {'contact_id': 'client', 'history_id': 'history'}
+
     class Meta:
         db_table = 'client'
         ordering = ['name']
@@ -20,23 +24,7 @@ class Client(models.Model):
         return self.name
 
     def save(self, *args, **kwargs):
-        create_new = self.id is None
-        
-        # Generate IDs before first save for new objects
-        if create_new:
-            # Save once to get an ID
-            super().save(*args, **kwargs)
-            
-            # Set the IDs
-            self.contact_id = f"{self.id}client"
-            self.history_id = f"{self.id}history"
-            
-            # Update only the specific fields
-            kwargs['update_fields'] = ['contact_id', 'history_id'] if kwargs.get('update_fields') else None
-            super().save(*args, **kwargs)
-        else:
-            # Normal save for updates
-            super().save(*args, **kwargs)
+        super().save(*args, **kwargs)
         
         # Ensure code is JSON
         if isinstance(self.code, str):
@@ -0,0 +1,34 @@
+from django.db import models
+
+class EarlyWarning(models.Model):
+    """
+    A persisted early warning about a project entity
+
+    Maintained by `manage.py refresh_early_warnings`. The fingerprint
+    identifies the warning (type + entity) so refreshes update rows in
+    place. reference_at is the deadline or last activity the warning is
+    about; day counts are derived from it when warnings are read.
+    """
+    id = models.BigAutoField(primary_key=True)
+    fingerprint = models.CharField(max_length=64, unique=True)
+    type = models.CharField(max_length=50)
+    level = models.CharField(max_length=20)
+    entity_type = models.CharField(max_length=50)
+    entity_id = models.CharField(max_length=100)
+    entity_name = models.CharField(max_length=255, blank=True)
+    project = models.ForeignKey('Project', on_delete=models.CASCADE, null=True, blank=True, related_name='early_warnings')
+    reference_at = models.DateTimeField(null=True, blank=True)
+    details = models.JSONField(default=dict)  # Stores type specific values (responsible, completion_percentage, ...)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'early_warning'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['level', 'type'], name='early_warning_level_type_idx'),
+            models.Index(fields=['entity_type', 'entity_id'], name='early_warning_entity_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.type} ({self.level}) on {self.entity_type} {self.entity_id}"
@@ -0,0 +1,25 @@
+from django.db import models
+
+class EarlyWarningRun(models.Model):
+    """
+    Watermark of an early warning refresh
+
+    The next incremental refresh only re-evaluates entities with history
+    events after last_event_id or shortly before started_at, or whose time
+    thresholds were crossed since the previous run started.
+    """
+    id = models.AutoField(primary_key=True)
+    full = models.BooleanField(default=False)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True, blank=True)
+    last_event_id = models.BigIntegerField(default=0)
+    evaluated = models.IntegerField(default=0)
+    upserted = models.IntegerField(default=0)
+    removed = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'early_warning_run'
+        ordering = ['-id']
+
+    def __str__(self):
+        return f"Early warning run {self.id}"
@@ -0,0 +1,28 @@
+from django.db import models
+
+class ProjectRollup(models.Model):
+    """
+    Precomputed counters of a project, maintained incrementally
+
+    Updated by the status-change and document paths; rebuilt from scratch
+    with `manage.py rebuild_project_rollups`. overdue_outputs depends on
+    the clock and is refreshed on every update, its freshness being given
+    by overdue_as_of.
+    """
+    project = models.OneToOneField('Project', on_delete=models.CASCADE, primary_key=True, related_name='rollup')
+    outputs_total = models.IntegerField(default=0)
+    outputs_by_status = models.JSONField(default=dict)  # Stores {status: count}
+    phases_total = models.IntegerField(default=0)
+    phases_completed = models.IntegerField(default=0)
+    overdue_outputs = models.IntegerField(default=0)
+    overdue_as_of = models.DateTimeField(null=True, blank=True)
+    documents = models.IntegerField(default=0)
+    last_activity_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'project_rollup'
+        ordering = ['project_id']
+
+    def __str__(self):
+        return f"Rollup for Project {self.project_id}"
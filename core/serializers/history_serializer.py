@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from core.models import History
-import json
+from core.services.history.initialization import parse_legacy_events
 
 class HistorySerializer(serializers.ModelSerializer):
     events = serializers.SerializerMethodField()
@@ -14,13 +14,14 @@ class HistorySerializer(serializers.ModelSerializer):
         ]
     
     def get_events(self, obj):
-        """Parse the JSON events string into a list of event objects"""
-        try:
-            return json.loads(obj.event)
-        except (json.JSONDecodeError, TypeError):
-            # If event isn't valid JSON, return it as a single event
-            return [{
-                "type": "unknown",
-                "details": obj.event or "No details available",
-                "timestamp": obj.created_at.isoformat() if obj.created_at else None
-            }]
+        """Combine legacy JSON events with rows from the history_event table"""
+        events = parse_legacy_events(obj.event, 'unknown', obj.created_at)
+        
+        # Uses the prefetch cache when the queryset prefetches history_events
+        events.extend({
+            "type": event.type,
+            "details": event.details,
+            "timestamp": event.timestamp.isoformat()
+        } for event in obj.history_events.all())
+        
+        return events
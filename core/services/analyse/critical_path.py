@@ -0,0 +1,408 @@
+# Critical path method (CPM) over the phases and outputs of a project
+from collections import deque
+from itertools import groupby
+from datetime import timedelta
+from django.db.models import Count, DateTimeField, OuterRef, Subquery
+from django.utils import timezone
+
+from core.models import Project, PPAP, Phase, Output, History, Todo, DurationStatistics
+
+COMPLETED_STATUSES = ['Completed', 'Approved']
+
+# Outputs that no longer take time
+CLOSED_OUTPUT_STATUSES = COMPLETED_STATUSES + ['Cancelled', 'Deprecated']
+
+# Duration of an output whose template has no completed history, in days
+DEFAULT_OUTPUT_DURATION = 7.0
+
+# Nodes with less slack than this (in days) are critical
+CRITICAL_SLACK = 1e-6
+
+# Todos above which a phase responsible is considered overallocated
+OVERALLOCATION_TODOS = 10
+
+def topological_order(nodes, predecessors):
+    """
+    Order the nodes of a dependency graph so predecessors come first (Kahn)
+
+    Args:
+        nodes (iterable): Nodes of the graph
+        predecessors (dict): Node -> iterable of nodes it depends on
+
+    Returns:
+        tuple: (ordered nodes, {node: list of successors})
+
+    Raises:
+        ValueError: If the dependencies contain a cycle
+    """
+    successors = {node: [] for node in nodes}
+    pending = {node: 0 for node in nodes}
+    for node, node_predecessors in predecessors.items():
+        for predecessor in node_predecessors:
+            successors[predecessor].append(node)
+            pending[node] += 1
+
+    queue = deque(node for node in pending if pending[node] == 0)
+    order = []
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for successor in successors[node]:
+            pending[successor] -= 1
+            if pending[successor] == 0:
+                queue.append(successor)
+
+    if len(order) != len(pending):
+        cyclic = sorted(str(node) for node, count in pending.items() if count > 0)
+        raise ValueError(f"Dependency cycle between {', '.join(cyclic)}")
+
+    return order, successors
+
+def schedule_network(durations, predecessors):
+    """
+    Run the forward and backward CPM passes over an activity network
+
+    Nodes are visited in topological order, so both passes are O(V + E).
+
+    Args:
+        durations (dict): Duration of every node
+        predecessors (dict): Node -> iterable of nodes it depends on
+
+    Returns:
+        dict: Node -> dict with earliest_start, earliest_finish,
+            latest_start, latest_finish and slack
+
+    Raises:
+        ValueError: If the dependencies contain a cycle
+    """
+    order, successors = topological_order(durations, predecessors)
+
+    earliest_finish = {}
+    for node in order:
+        start = max((earliest_finish[p] for p in predecessors.get(node, ())), default=0.0)
+        earliest_finish[node] = start + durations[node]
+
+    makespan = max(earliest_finish.values(), default=0.0)
+
+    latest_start = {}
+    for node in reversed(order):
+        finish = min((latest_start[s] for s in successors[node]), default=makespan)
+        latest_start[node] = finish - durations[node]
+
+    return {
+        node: {
+            'earliest_start': earliest_finish[node] - durations[node],
+            'earliest_finish': earliest_finish[node],
+            'latest_start': latest_start[node],
+            'latest_finish': latest_start[node] + durations[node],
+            'slack': latest_start[node] - (earliest_finish[node] - durations[node]),
+        }
+        for node in durations
+    }
+
+def template_duration_estimates(output_template_ids):
+    """
+    Mean historical duration of completed outputs, per template
+
+    Read from the cached duration distributions.
+
+    Args:
+        output_template_ids: OutputTemplate IDs
+
+    Returns:
+        tuple: ({template_id: mean days}, {phase_template_id: mean days})
+    """
+    rows = DurationStatistics.objects.filter(output_template_id__in=output_template_ids).values_list(
+        'output_template_id', 'output_template__phase_id', 'count', 'mean'
+    )
+
+    by_template = {}
+    phase_totals = {}
+    for template_id, phase_template_id, count, mean in rows:
+        by_template[template_id] = mean
+        total, total_count = phase_totals.get(phase_template_id, (0.0, 0))
+        phase_totals[phase_template_id] = (total + mean * count, total_count + count)
+
+    by_phase_template = {
+        phase_template_id: total / count for phase_template_id, (total, count) in phase_totals.items()
+    }
+    return by_template, by_phase_template
+
+def _history_field(field):
+    return Subquery(
+        History.objects.filter(id=OuterRef('history_id')).values(field)[:1],
+        output_field=DateTimeField()
+    )
+
+def build_project_network(ppap, now=None):
+    """
+    Build the activity network of a PPAP
+
+    Outputs are activities; every phase is a zero-duration milestone that
+    finishes with its outputs. Outputs start after the milestones of the
+    previous phase order (phases sharing an order run in parallel), and
+    after the outputs of the templates listed in their template's
+    configuration under "depends_on" (OutputTemplate IDs or names).
+    Durations are the remaining days of work, estimated from the cached
+    historical mean of the output template, then of its phase template.
+
+    Args:
+        ppap (PPAP): PPAP to plan
+        now (datetime, optional): Reference time
+
+    Returns:
+        dict: phases and outputs (value rows), durations, predecessors and
+            output_estimates ({output_id: historical mean or None})
+    """
+    now = now or timezone.now()
+
+    phases = list(Phase.objects.filter(ppap=ppap).annotate(
+        deadline=_history_field('deadline'),
+        finished_at=_history_field('finished_at')
+    ).order_by('template__order', 'id').values(
+        'id', 'status', 'template_id', 'template__name', 'template__order',
+        'responsible_id', 'responsible__username', 'deadline', 'finished_at'
+    ))
+
+    outputs = list(Output.objects.filter(phase__ppap=ppap).annotate(
+        deadline=_history_field('deadline'),
+        started_at=_history_field('started_at')
+    ).order_by('id').values(
+        'id', 'status', 'phase_id', 'template_id', 'template__name', 'template__phase_id',
+        'template__configuration', 'user__username', 'deadline', 'started_at'
+    ))
+
+    by_template, by_phase_template = template_duration_estimates({o['template_id'] for o in outputs})
+
+    durations = {}
+    predecessors = {}
+    output_estimates = {}
+
+    outputs_by_phase = {}
+    for output in outputs:
+        outputs_by_phase.setdefault(output['phase_id'], []).append(output)
+
+    previous_milestones = []
+    for _, phase_group in groupby(phases, key=lambda phase: phase['template__order']):
+        milestones = []
+        for phase in phase_group:
+            milestone = ('phase', phase['id'])
+            phase_outputs = outputs_by_phase.get(phase['id'], [])
+            durations[milestone] = 0.0
+            predecessors[milestone] = [('output', o['id']) for o in phase_outputs] or list(previous_milestones)
+            milestones.append(milestone)
+
+            for output in phase_outputs:
+                node = ('output', output['id'])
+                estimate = by_template.get(output['template_id'], by_phase_template.get(output['template__phase_id']))
+                output_estimates[output['id']] = estimate
+
+                if output['status'] in CLOSED_OUTPUT_STATUSES:
+                    remaining = 0.0
+                else:
+                    remaining = estimate if estimate is not None else DEFAULT_OUTPUT_DURATION
+                    if output['started_at'] and output['status'] != 'Not Started':
+                        elapsed = (now - output['started_at']).total_seconds() / 86400
+                        remaining = max(remaining - elapsed, 0.0)
+
+                durations[node] = remaining
+                predecessors[node] = list(previous_milestones)
+
+        previous_milestones = milestones
+
+    # Explicit dependencies between output templates
+    nodes_by_template = {}
+    for output in outputs:
+        node = ('output', output['id'])
+        nodes_by_template.setdefault(output['template_id'], []).append(node)
+        nodes_by_template.setdefault(output['template__name'], []).append(node)
+
+    for output in outputs:
+        configuration = output['template__configuration'] or {}
+        depends_on = configuration.get('depends_on', []) if isinstance(configuration, dict) else []
+        if not isinstance(depends_on, list):
+            depends_on = [depends_on]
+
+        node = ('output', output['id'])
+        for dependency in depends_on:
+            for predecessor in nodes_by_template.get(dependency, []):
+                if predecessor != node and predecessor not in predecessors[node]:
+                    predecessors[node].append(predecessor)
+
+    return {
+        'phases': phases,
+        'outputs': outputs,
+        'durations': durations,
+        'predecessors': predecessors,
+        'output_estimates': output_estimates,
+    }
+
+def _bottlenecks(phases, now):
+    """Missing responsible, overdue and overallocated phases, with one todo count query"""
+    open_phases = [phase for phase in phases if phase['status'] not in COMPLETED_STATUSES]
+    todo_counts = dict(Todo.objects.filter(
+        user_id__in={phase['responsible_id'] for phase in open_phases if phase['responsible_id']}
+    ).order_by().values_list('user_id').annotate(count=Count('id')))
+
+    bottlenecks = []
+    for phase in open_phases:
+        phase_name = phase['template__name'] or "Unknown Phase"
+        if not phase['responsible_id']:
+            bottlenecks.append({
+                "type": "missing_responsible",
+                "phase_id": phase['id'],
+                "phase_name": phase_name,
+                "impact": "high",
+                "recommendation": "Assign a responsible person to this phase"
+            })
+
+        if phase['deadline'] and phase['deadline'] < now:
+            bottlenecks.append({
+                "type": "overdue_phase",
+                "phase_id": phase['id'],
+                "phase_name": phase_name,
+                "days_overdue": (now - phase['deadline']).days,
+                "impact": "high",
+                "recommendation": "Review and address phase delay"
+            })
+
+        todos_count = todo_counts.get(phase['responsible_id'], 0)
+        if todos_count > OVERALLOCATION_TODOS:
+            bottlenecks.append({
+                "type": "resource_overallocation",
+                "phase_id": phase['id'],
+                "phase_name": phase_name,
+                "responsible": phase['responsible__username'],
+                "todos_count": todos_count,
+                "impact": "medium",
+                "recommendation": "Consider redistributing work or adjusting timeline"
+            })
+
+    return bottlenecks
+
+def compute_critical_path(ppap, now=None):
+    """
+    Schedule a PPAP with CPM and extract its critical path
+
+    Args:
+        ppap (PPAP): PPAP to analyze
+        now (datetime, optional): Reference time, day 0 of the schedule
+
+    Returns:
+        dict: schedule (every phase with its outputs, times in days from
+            now and slack), critical_path (critical phases with their
+            critical outputs, in order), project_duration (days) and
+            estimated_completion
+    """
+    now = now or timezone.now()
+    network = build_project_network(ppap, now)
+    times = schedule_network(network['durations'], network['predecessors'])
+
+    def timing(node):
+        node_times = times[node]
+        return {
+            "earliest_start": round(node_times['earliest_start'], 2),
+            "earliest_finish": round(node_times['earliest_finish'], 2),
+            "latest_start": round(node_times['latest_start'], 2),
+            "latest_finish": round(node_times['latest_finish'], 2),
+            "slack": round(node_times['slack'], 2),
+            "is_critical": node_times['slack'] < CRITICAL_SLACK,
+        }
+
+    outputs_by_phase = {}
+    for output in network['outputs']:
+        node = ('output', output['id'])
+        estimate = network['output_estimates'].get(output['id'])
+        outputs_by_phase.setdefault(output['phase_id'], []).append({
+            "output_id": output['id'],
+            "output_name": output['template__name'] or "Unknown Output",
+            "deadline": output['deadline'].isoformat() if output['deadline'] else None,
+            "status": output['status'],
+            "avg_duration": round(estimate, 2) if estimate is not None else None,
+            "remaining_duration": round(network['durations'][node], 2),
+            "responsible": output['user__username'],
+            **timing(node)
+        })
+
+    schedule = []
+    completions = []
+    for phase in network['phases']:
+        node = ('phase', phase['id'])
+        if phase['status'] in COMPLETED_STATUSES and phase['finished_at']:
+            estimated_completion = phase['finished_at']
+        else:
+            estimated_completion = now + timedelta(days=times[node]['earliest_finish'])
+        completions.append(estimated_completion)
+
+        schedule.append({
+            "phase_id": phase['id'],
+            "phase_name": phase['template__name'] or "Unknown Phase",
+            "status": phase['status'],
+            "deadline": phase['deadline'].isoformat() if phase['deadline'] else None,
+            "estimated_completion": estimated_completion.isoformat(),
+            "at_risk": bool(phase['deadline'] and estimated_completion > phase['deadline']),
+            "outputs": outputs_by_phase.get(phase['id'], []),
+            **timing(node)
+        })
+
+    critical_path = [
+        {
+            **{key: value for key, value in phase.items() if key != 'outputs'},
+            "critical_outputs": [output for output in phase['outputs'] if output['is_critical']]
+        }
+        for phase in schedule if phase['is_critical']
+    ]
+
+    return {
+        "schedule": schedule,
+        "critical_path": critical_path,
+        "project_duration": round(max((t['earliest_finish'] for t in times.values()), default=0.0), 2),
+        "estimated_completion": max(completions).isoformat() if completions else None,
+        "bottlenecks": _bottlenecks(network['phases'], now),
+    }
+
+def analyze_critical_path(project_id):
+    """
+    Analyze critical path for project completion
+
+    Args:
+        project_id (int): ID of the project to analyze
+
+    Returns:
+        dict: Critical path analysis including:
+            - critical_path: Critical phases and outputs, in order
+            - schedule: CPM times and slack of every phase and output
+            - bottlenecks: Identified bottlenecks
+            - project_duration: Remaining days on the critical path
+            - estimated_completion: Estimated completion date
+
+    Raises:
+        ValueError: If the output dependencies contain a cycle
+    """
+    try:
+        project = Project.objects.get(id=project_id)
+        ppap = PPAP.objects.filter(project=project).first()
+
+        if not ppap:
+            return {
+                "critical_path": [],
+                "schedule": [],
+                "bottlenecks": [],
+                "project_duration": 0,
+                "estimated_completion": None,
+                "message": "No PPAP associated with this project"
+            }
+
+        return compute_critical_path(ppap)
+
+    except Project.DoesNotExist:
+        return {
+            "error": f"Project with ID {project_id} not found"
+        }
+    except ValueError:
+        # A dependency cycle is a problem of the project's templates
+        raise
+    except Exception as e:
+        return {
+            "error": str(e)
+        }
@@ -0,0 +1,218 @@
+# Cached duration distributions per output and phase template
+import math
+from django.db import transaction
+from django.db.models import DateTimeField, OuterRef, Subquery
+from core.models import Phase, Output, History, DurationStatistics
+
+COMPLETED_STATUSES = ['Completed', 'Approved']
+
+# Below this many completed samples a template's p90 is too noisy to flag
+# bottlenecks, and DEFAULT_BOTTLENECK_DAYS is used instead
+MIN_BOTTLENECK_SAMPLES = 5
+DEFAULT_BOTTLENECK_DAYS = 14
+
+def _history_field(field):
+    return Subquery(
+        History.objects.filter(id=OuterRef('history_id')).values(field)[:1],
+        output_field=DateTimeField()
+    )
+
+def percentile(sorted_values, fraction):
+    """
+    Percentile of sorted values, interpolating linearly between ranks
+
+    Args:
+        sorted_values (list): Values in ascending order
+        fraction (float): Percentile as a fraction (0.9 for p90)
+
+    Returns:
+        float: Percentile value, None if there are no values
+    """
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * fraction
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def _distribution(durations):
+    durations = sorted(durations)
+    return {
+        'count': len(durations),
+        'mean': sum(durations) / len(durations),
+        'p50': percentile(durations, 0.5),
+        'p90': percentile(durations, 0.9),
+        'p95': percentile(durations, 0.95),
+    }
+
+def _durations_by_template(model, template_ids=None):
+    """Completed durations in days, grouped by template, with one query"""
+    rows = model.objects.filter(status__in=COMPLETED_STATUSES).annotate(
+        history_started_at=_history_field('started_at'),
+        history_finished_at=_history_field('finished_at')
+    ).filter(
+        history_started_at__isnull=False,
+        history_finished_at__isnull=False
+    )
+    if template_ids is not None:
+        rows = rows.filter(template_id__in=template_ids)
+
+    durations = {}
+    for template_id, started_at, finished_at in rows.order_by().values_list(
+        'template_id', 'history_started_at', 'history_finished_at'
+    ):
+        days = max((finished_at - started_at).total_seconds() / 86400, 0.0)
+        durations.setdefault(template_id, []).append(days)
+    return durations
+
+@transaction.atomic
+def refresh_duration_statistics(output_template_ids=None, phase_template_ids=None):
+    """
+    Recompute the duration distributions of some templates
+
+    With no arguments every template is recomputed. Templates without
+    completed history lose their row.
+
+    Args:
+        output_template_ids (iterable, optional): OutputTemplate IDs
+        phase_template_ids (iterable, optional): PhaseTemplate IDs
+
+    Returns:
+        int: Number of distributions written
+    """
+    everything = output_template_ids is None and phase_template_ids is None
+    rows = []
+
+    for model, field, template_ids in (
+        (Output, 'output_template', output_template_ids),
+        (Phase, 'phase_template', phase_template_ids),
+    ):
+        if not everything and not template_ids:
+            continue
+
+        template_ids = None if everything else set(template_ids)
+        durations = _durations_by_template(model, template_ids)
+
+        stale = DurationStatistics.objects.filter(**{f'{field}__isnull': False})
+        if template_ids is not None:
+            stale = stale.filter(**{f'{field}_id__in': template_ids})
+        stale.delete()
+
+        rows.extend(
+            DurationStatistics(**{f'{field}_id': template_id}, **_distribution(values))
+            for template_id, values in durations.items()
+        )
+
+    DurationStatistics.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+def refresh_durations_on_commit(output_template_id=None, phase_template_id=None):
+    """
+    Refresh the distribution of a template once the transaction commits
+
+    Called when an output or phase enters or leaves a completed status;
+    deferring to commit lets the finished_at of its history be written
+    first.
+
+    Args:
+        output_template_id (int, optional): OutputTemplate ID
+        phase_template_id (int, optional): PhaseTemplate ID
+    """
+    transaction.on_commit(lambda: refresh_duration_statistics(
+        output_template_ids=[output_template_id] if output_template_id else [],
+        phase_template_ids=[phase_template_id] if phase_template_id else []
+    ))
+
+def _serialize(statistics):
+    return {
+        "count": statistics.count,
+        "mean": round(statistics.mean, 2),
+        "p50": round(statistics.p50, 2),
+        "p90": round(statistics.p90, 2),
+        "p95": round(statistics.p95, 2),
+        "updated_at": statistics.updated_at.isoformat(),
+    }
+
+def bottleneck_threshold(statistics):
+    """
+    Days an output may stay in progress before it is a bottleneck
+
+    Args:
+        statistics (dict): Distribution of the output template, see
+            get_output_template_durations, or None
+
+    Returns:
+        float: p90 of the template's durations, or DEFAULT_BOTTLENECK_DAYS
+            with fewer than MIN_BOTTLENECK_SAMPLES samples
+    """
+    if statistics and statistics["count"] >= MIN_BOTTLENECK_SAMPLES:
+        return statistics["p90"]
+    return DEFAULT_BOTTLENECK_DAYS
+
+def get_output_template_durations(output_template_ids=None):
+    """
+    Get cached duration distributions of output templates
+
+    Args:
+        output_template_ids (iterable, optional): Restrict to these templates
+
+    Returns:
+        dict: {output_template_id: {count, mean, p50, p90, p95, updated_at}},
+            durations in days; templates without history are absent
+    """
+    statistics = DurationStatistics.objects.filter(output_template__isnull=False)
+    if output_template_ids is not None:
+        statistics = statistics.filter(output_template_id__in=output_template_ids)
+    return {row.output_template_id: _serialize(row) for row in statistics}
+
+def get_phase_template_durations(phase_template_ids=None):
+    """
+    Get cached duration distributions of phase templates
+
+    Args:
+        phase_template_ids (iterable, optional): Restrict to these templates
+
+    Returns:
+        dict: {phase_template_id: {count, mean, p50, p90, p95, updated_at}},
+            durations in days; templates without history are absent
+    """
+    statistics = DurationStatistics.objects.filter(phase_template__isnull=False)
+    if phase_template_ids is not None:
+        statistics = statistics.filter(phase_template_id__in=phase_template_ids)
+    return {row.phase_template_id: _serialize(row) for row in statistics}
+
+def get_duration_statistics(output_template_ids=None, phase_template_ids=None):
+    """
+    Get cached duration distributions with template names
+
+    Args:
+        output_template_ids (iterable, optional): Restrict output templates
+        phase_template_ids (iterable, optional): Restrict phase templates
+
+    Returns:
+        dict: output_templates and phase_templates lists
+    """
+    statistics = DurationStatistics.objects.select_related('output_template', 'phase_template')
+    if output_template_ids is not None or phase_template_ids is not None:
+        statistics = statistics.filter(
+            output_template_id__in=output_template_ids or [],
+        ) | statistics.filter(
+            phase_template_id__in=phase_template_ids or []
+        )
+
+    result = {"output_templates": [], "phase_templates": []}
+    for row in statistics:
+        if row.output_template_id:
+            result["output_templates"].append({
+                "output_template_id": row.output_template_id,
+                "name": row.output_template.name,
+                "phase_template_id": row.output_template.phase_id,
+                **_serialize(row)
+            })
+        else:
+            result["phase_templates"].append({
+                "phase_template_id": row.phase_template_id,
+                "name": row.phase_template.name,
+                **_serialize(row)
+            })
+    return result
@@ -0,0 +1,420 @@
+# Early warning engine backed by the early_warning table
+import hashlib
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import (
+    Q, Count, Max, IntegerField, DateTimeField, CharField, OuterRef, Subquery, Case, When, Value
+)
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+
+from core.models import (
+    Project, Phase, Output, History, HistoryEvent, EarlyWarning, EarlyWarningRun
+)
+
+ACTIVE_PHASE_STATUSES = ['Not Started', 'In Progress']
+ACTIVE_PROJECT_STATUSES = ['In Progress', 'Not Started', 'On Hold']
+COMPLETED_STATUSES = ['Completed', 'Approved']
+
+# Thresholds, expressed as in the original checks on whole days
+APPROACHING_WINDOW = timedelta(days=8)      # 0 <= days to deadline <= 7
+APPROACHING_HIGH = timedelta(days=4)        # days to deadline <= 3
+STALLED_AFTER = timedelta(days=15)          # more than 14 days without update
+INACTIVE_AFTER = timedelta(days=31)         # more than 30 days without update
+MIN_COMPLETION_PERCENTAGE = 70
+
+# Events are re-scanned this far back in time, so events of transactions
+# that committed after a run started (with IDs below its watermark) are
+# still picked up by the next run
+EVENT_COMMIT_OVERLAP = timedelta(minutes=15)
+
+# Warning types evaluated per entity type
+PHASE_WARNING_TYPES = ['approaching_deadline', 'unassigned_responsibility']
+OUTPUT_WARNING_TYPES = ['stalled_activity', 'rejected_output']
+PROJECT_WARNING_TYPES = ['inactive_project']
+HISTORY_WARNING_TYPES = ['overdue_deadline']
+
+def warning_fingerprint(warning_type, entity_type, entity_id):
+    """
+    Compute the identity of a warning
+
+    Args:
+        warning_type (str): Warning type
+        entity_type (str): Entity type
+        entity_id: Entity ID
+
+    Returns:
+        str: SHA-1 hex digest
+    """
+    return hashlib.sha1(f"{warning_type}|{entity_type}|{entity_id}".encode()).hexdigest()
+
+def _warning(warning_type, level, entity_type, entity_id, entity_name, project_id, reference_at=None, **details):
+    return {
+        'fingerprint': warning_fingerprint(warning_type, entity_type, entity_id),
+        'type': warning_type,
+        'level': level,
+        'entity_type': entity_type,
+        'entity_id': str(entity_id),
+        'entity_name': entity_name or '',
+        'project_id': project_id,
+        'reference_at': reference_at,
+        'details': details,
+    }
+
+def _history_value(field):
+    return Subquery(
+        History.objects.filter(id=OuterRef('history_id')).values(field)[:1],
+        output_field=DateTimeField()
+    )
+
+def _output_count(**filters):
+    return Coalesce(Subquery(
+        Output.objects.filter(phase=OuterRef('pk'), **filters).order_by().values('phase').annotate(
+            count=Count('id')
+        ).values('count'),
+        output_field=IntegerField()
+    ), 0)
+
+def _evaluate_phases(phases, now):
+    """Approaching deadlines and unassigned responsibility of phases"""
+    warnings = []
+
+    rows = phases.filter(status__in=ACTIVE_PHASE_STATUSES).annotate(
+        history_deadline=_history_value('deadline')
+    ).filter(
+        history_deadline__gte=now,
+        history_deadline__lt=now + APPROACHING_WINDOW
+    ).annotate(
+        total_outputs=_output_count(),
+        completed_outputs=_output_count(status__in=COMPLETED_STATUSES)
+    ).values(
+        'id', 'template__name', 'ppap__project_id', 'responsible__username',
+        'history_deadline', 'total_outputs', 'completed_outputs'
+    )
+    for row in rows:
+        total = row['total_outputs']
+        completion_percentage = row['completed_outputs'] / total * 100 if total > 0 else 0
+        if completion_percentage < MIN_COMPLETION_PERCENTAGE:
+            warnings.append(_warning(
+                'approaching_deadline',
+                'high' if row['history_deadline'] < now + APPROACHING_HIGH else 'medium',
+                'phase', row['id'], row['template__name'] or "Unknown Phase", row['ppap__project_id'],
+                reference_at=row['history_deadline'],
+                completion_percentage=completion_percentage,
+                responsible=row['responsible__username']
+            ))
+
+    rows = phases.filter(responsible=None, status__in=ACTIVE_PHASE_STATUSES).values(
+        'id', 'template__name', 'ppap__project_id'
+    )
+    for row in rows:
+        warnings.append(_warning(
+            'unassigned_responsibility', 'high',
+            'phase', row['id'], row['template__name'] or "Unknown Phase", row['ppap__project_id']
+        ))
+
+    return warnings
+
+def _evaluate_outputs(outputs, now):
+    """Stalled activity and rejections of outputs"""
+    warnings = []
+
+    rows = outputs.filter(status='In Progress').annotate(
+        history_updated_at=_history_value('updated_at')
+    ).filter(
+        history_updated_at__lte=now - STALLED_AFTER
+    ).values('id', 'template__name', 'phase__ppap__project_id', 'user__username', 'history_updated_at')
+    for row in rows:
+        warnings.append(_warning(
+            'stalled_activity', 'medium',
+            'output', row['id'], row['template__name'] or "Unknown Output", row['phase__ppap__project_id'],
+            reference_at=row['history_updated_at'],
+            responsible=row['user__username']
+        ))
+
+    rows = outputs.filter(status='Rejected').values(
+        'id', 'template__name', 'phase__ppap__project_id', 'user__username'
+    )
+    for row in rows:
+        warnings.append(_warning(
+            'rejected_output', 'high',
+            'output', row['id'], row['template__name'] or "Unknown Output", row['phase__ppap__project_id'],
+            responsible=row['user__username']
+        ))
+
+    return warnings
+
+def _evaluate_projects(projects, now):
+    """Projects without recent activity"""
+    rows = projects.filter(status__in=ACTIVE_PROJECT_STATUSES).annotate(
+        history_updated_at=_history_value('updated_at')
+    ).filter(
+        history_updated_at__lte=now - INACTIVE_AFTER
+    ).values('id', 'name', 'history_updated_at')
+
+    return [_warning(
+        'inactive_project', 'medium',
+        'project', row['id'], row['name'], row['id'],
+        reference_at=row['history_updated_at']
+    ) for row in rows]
+
+def _evaluate_histories(histories, now):
+    """Overdue deadlines of any history record"""
+    def project_of(model, project_path):
+        return Subquery(
+            model.objects.filter(history_id=OuterRef('id')).values(project_path)[:1],
+            output_field=IntegerField()
+        )
+
+    rows = histories.filter(deadline__lt=now, finished_at=None).annotate(
+        project_id=Case(
+            When(table_name='phase', then=project_of(Phase, 'ppap__project_id')),
+            When(table_name='output', then=project_of(Output, 'phase__ppap__project_id')),
+            When(table_name='project', then=project_of(Project, 'id')),
+            default=Value(None),
+            output_field=IntegerField()
+        )
+    ).order_by().values('id', 'table_name', 'title', 'deadline', 'project_id')
+
+    return [_warning(
+        'overdue_deadline', 'high',
+        row['table_name'], row['id'], row['title'], row['project_id'],
+        reference_at=row['deadline']
+    ) for row in rows]
+
+def evaluate_warnings(now=None, phases=None, outputs=None, projects=None, histories=None):
+    """
+    Evaluate early warnings for sets of entities
+
+    Every warning type is computed with a constant number of queries;
+    the arguments default to all entities.
+
+    Args:
+        now (datetime, optional): Reference time
+        phases, outputs, projects, histories (QuerySet, optional): Entities
+            to evaluate
+
+    Returns:
+        list: Warning dicts in storage form
+    """
+    now = now or timezone.now()
+    return (
+        _evaluate_phases(Phase.objects.all() if phases is None else phases, now) +
+        _evaluate_outputs(Output.objects.all() if outputs is None else outputs, now) +
+        _evaluate_projects(Project.objects.all() if projects is None else projects, now) +
+        _evaluate_histories(History.objects.all() if histories is None else histories, now)
+    )
+
+def _changed_history_ids(last_run, last_event_id, now):
+    """History IDs with new events, or whose time thresholds were crossed"""
+    since = last_run.started_at
+
+    changed = set(HistoryEvent.objects.filter(
+        Q(id__gt=last_run.last_event_id) | Q(timestamp__gt=since - EVENT_COMMIT_OVERLAP),
+        id__lte=last_event_id
+    ).values_list('history_id', flat=True).distinct())
+
+    changed.update(History.objects.filter(
+        # Overdue, and end of the approaching window
+        Q(deadline__gt=since, deadline__lte=now) |
+        # Approaching deadline becomes high
+        Q(deadline__gt=since + APPROACHING_HIGH, deadline__lte=now + APPROACHING_HIGH) |
+        # Deadline enters the approaching window
+        Q(deadline__gt=since + APPROACHING_WINDOW, deadline__lte=now + APPROACHING_WINDOW) |
+        # Outputs and projects becoming stalled or inactive
+        Q(updated_at__gt=since - STALLED_AFTER, updated_at__lte=now - STALLED_AFTER) |
+        Q(updated_at__gt=since - INACTIVE_AFTER, updated_at__lte=now - INACTIVE_AFTER)
+    ).values_list('id', flat=True))
+
+    return changed
+
+def _remove_orphan_warnings():
+    """Delete warnings about phases, outputs or projects that no longer exist"""
+    removed = 0
+    for model, entity_type, types in (
+        (Phase, 'phase', PHASE_WARNING_TYPES),
+        (Output, 'output', OUTPUT_WARNING_TYPES),
+        (Project, 'project', PROJECT_WARNING_TYPES),
+    ):
+        removed += EarlyWarning.objects.filter(entity_type=entity_type, type__in=types).exclude(
+            entity_id__in=model.objects.annotate(
+                entity_id=Cast('id', CharField())
+            ).values('entity_id')
+        ).delete()[0]
+    return removed
+
+@transaction.atomic
+def refresh_early_warnings(full=False):
+    """
+    Bring the early_warning table up to date
+
+    An incremental refresh only re-evaluates:
+    - entities whose history got new events (status, deadline, assignment
+      changes...) since the last run;
+    - phases whose outputs changed;
+    - entities whose deadline or last activity crossed a warning
+      threshold since the last run.
+    The first run, or full=True, evaluates everything.
+
+    New events are found by ID above the last run's watermark, and by
+    timestamp up to EVENT_COMMIT_OVERLAP (15 minutes) before the last run
+    started, so a transaction that committed after that run began is still
+    picked up. The overlap is a heuristic: an event timestamped more than
+    EVENT_COMMIT_OVERLAP before the last run but committed after it is
+    missed until the next full refresh.
+
+    Args:
+        full (bool): Re-evaluate every entity
+
+    Returns:
+        EarlyWarningRun: Record of this run
+    """
+    now = timezone.now()
+    last_run = EarlyWarningRun.objects.filter(finished_at__isnull=False).first()
+    full = full or last_run is None
+    last_event_id = HistoryEvent.objects.aggregate(last=Max('id'))['last'] or 0
+
+    run = EarlyWarningRun.objects.create(full=full, started_at=now, last_event_id=last_event_id)
+
+    if full:
+        warnings = evaluate_warnings(now)
+        stale = EarlyWarning.objects.all()
+        run.evaluated = len(warnings)
+    else:
+        history_ids = _changed_history_ids(last_run, last_event_id, now)
+        output_ids = set(Output.objects.filter(history_id__in=history_ids).values_list('id', flat=True))
+        phase_ids = set(Phase.objects.filter(
+            Q(history_id__in=history_ids) | Q(outputs__id__in=output_ids)
+        ).values_list('id', flat=True))
+        project_ids = set(Project.objects.filter(history_id__in=history_ids).values_list('id', flat=True))
+
+        warnings = evaluate_warnings(
+            now,
+            phases=Phase.objects.filter(id__in=phase_ids),
+            outputs=Output.objects.filter(id__in=output_ids),
+            projects=Project.objects.filter(id__in=project_ids),
+            histories=History.objects.filter(id__in=history_ids)
+        )
+        stale = EarlyWarning.objects.filter(
+            Q(entity_type='phase', type__in=PHASE_WARNING_TYPES, entity_id__in=[str(i) for i in phase_ids]) |
+            Q(entity_type='output', type__in=OUTPUT_WARNING_TYPES, entity_id__in=[str(i) for i in output_ids]) |
+            Q(entity_type='project', type__in=PROJECT_WARNING_TYPES, entity_id__in=[str(i) for i in project_ids]) |
+            Q(type__in=HISTORY_WARNING_TYPES, entity_id__in=history_ids)
+        )
+        run.evaluated = len(history_ids)
+
+    # Warnings that no longer hold for the evaluated entities
+    fingerprints = {warning['fingerprint'] for warning in warnings}
+    run.removed = stale.exclude(fingerprint__in=fingerprints).delete()[0]
+    run.removed += _remove_orphan_warnings()
+
+    EarlyWarning.objects.bulk_create(
+        [EarlyWarning(**warning) for warning in warnings],
+        update_conflicts=True,
+        unique_fields=['fingerprint'],
+        update_fields=['level', 'entity_name', 'project', 'reference_at', 'details', 'updated_at'],
+        batch_size=1000
+    )
+    run.upserted = len(warnings)
+
+    run.finished_at = timezone.now()
+    run.save()
+    return run
+
+def serialize_early_warning(warning, now=None):
+    """
+    Build the API representation of a warning
+
+    Day counts are computed from reference_at at read time so stored
+    warnings do not go stale between refreshes.
+
+    Args:
+        warning (EarlyWarning): Stored warning (with project selected)
+        now (datetime, optional): Reference time
+
+    Returns:
+        dict: Warning in the format of generate_early_warnings
+    """
+    now = now or timezone.now()
+    data = {
+        "id": warning.id,
+        "type": warning.type,
+        "level": warning.level,
+        "entity_type": warning.entity_type,
+        "entity_id": int(warning.entity_id) if warning.entity_id.isdigit() else warning.entity_id,
+        "project_id": warning.project_id,
+        "project_name": warning.project.name if warning.project else "Unknown Project",
+    }
+    if warning.type != 'inactive_project':
+        data["entity_name"] = warning.entity_name
+
+    if warning.type == 'approaching_deadline':
+        data["days_to_deadline"] = (warning.reference_at - now).days
+    elif warning.type in ['stalled_activity', 'inactive_project']:
+        data["days_inactive"] = (now - warning.reference_at).days
+    elif warning.type == 'overdue_deadline':
+        data["days_overdue"] = (now - warning.reference_at).days
+        data["deadline"] = warning.reference_at.isoformat()
+
+    data.update(warning.details)
+    return data
+
+def get_early_warnings(level=None, warning_type=None, entity_type=None, project_id=None):
+    """
+    Get stored early warnings, high level first
+
+    Args:
+        level (str, optional): Filter by level
+        warning_type (str, optional): Filter by type
+        entity_type (str, optional): Filter by entity type
+        project_id (int, optional): Filter by project
+
+    Returns:
+        QuerySet: Matching EarlyWarning rows
+    """
+    warnings = EarlyWarning.objects.select_related('project')
+    if level:
+        warnings = warnings.filter(level=level)
+    if warning_type:
+        warnings = warnings.filter(type=warning_type)
+    if entity_type:
+        warnings = warnings.filter(entity_type=entity_type)
+    if project_id:
+        warnings = warnings.filter(project_id=project_id)
+
+    return warnings.annotate(
+        level_rank=Case(When(level='high', then=Value(0)), default=Value(1), output_field=IntegerField())
+    ).order_by('level_rank', 'reference_at', 'id')
+
+def generate_early_warnings():
+    """
+    Generate early warnings about potential issues across all projects
+
+    Computed on the fly with set-based queries; the early_warning table
+    maintained by refresh_early_warnings() is the cheaper source for
+    repeated reads.
+
+    Returns:
+        list: List of early warning items with details
+    """
+    try:
+        now = timezone.now()
+        project_names = dict(Project.objects.values_list('id', 'name'))
+
+        warnings = []
+        for stored in evaluate_warnings(now):
+            warning = EarlyWarning(**{key: value for key, value in stored.items() if key != 'fingerprint'})
+            if warning.project_id:
+                # Unsaved Project carrying the name, avoiding one query per warning
+                warning.project = Project(
+                    id=warning.project_id,
+                    name=project_names.get(warning.project_id, "Unknown Project")
+                )
+            data = serialize_early_warning(warning, now)
+            del data["id"]
+            warnings.append(data)
+
+        # Sort warnings by level (high first) and days to deadline
+        return sorted(warnings, key=lambda w: (0 if w["level"] == "high" else 1, w.get("days_to_deadline", 0)))
+    except Exception as e:
+        return [{"error": str(e)}]
@@ -0,0 +1,30 @@
+# SQL expressions shared by the analysis services
+from django.db.models import Func, IntegerField
+
+class DaysBetween(Func):
+    """
+    Whole days from `start` to `end`, computed by the database
+
+    Matches Python's (end - start).days, i.e. the number of elapsed days
+    rounded down.
+    """
+    output_field = IntegerField()
+
+    def __init__(self, end, start, **extra):
+        super().__init__(end, start, **extra)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            template='CAST(FLOOR(EXTRACT(EPOCH FROM (%(expressions)s)) / 86400) AS integer)',
+            arg_joiner=' - ',
+            **extra_context
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            template='CAST(FLOOR(julianday(%(expressions)s)) AS integer)',
+            arg_joiner=') - julianday(',
+            **extra_context
+        )
@@ -0,0 +1,245 @@
+# Historical delay patterns, computed column-wise with NumPy
+import numpy as np
+from django.db.models import Max, DateTimeField, OuterRef, Subquery
+from core.models import Project, PPAP, Phase, Output, History
+
+SECONDS_PER_DAY = 86400
+
+# Problem outputs listed per bottleneck phase
+TOP_PROBLEM_OUTPUTS = 5
+
+def _history_field(field):
+    return Subquery(
+        History.objects.filter(id=OuterRef('history_id')).values(field)[:1],
+        output_field=DateTimeField()
+    )
+
+def _timestamps(values):
+    """Datetimes to epoch seconds, NaN for missing values"""
+    return np.fromiter(
+        (value.timestamp() if value is not None else np.nan for value in values),
+        dtype=float, count=len(values)
+    )
+
+def _whole_days(seconds):
+    """Elapsed whole days, rounded down like timedelta.days"""
+    return np.floor(seconds / SECONDS_PER_DAY)
+
+def grouped_percentiles(groups, values, fractions):
+    """
+    Percentiles of values within each group, interpolating linearly
+
+    Args:
+        groups (ndarray): Group index (0..n_groups-1) of every value
+        values (ndarray): Values
+        fractions (list): Percentiles as fractions (0.9 for p90)
+
+    Returns:
+        ndarray: One row per group, one column per fraction
+    """
+    order = np.lexsort((values, groups))
+    sorted_values = values[order]
+    counts = np.bincount(groups, minlength=groups.max() + 1 if len(groups) else 0)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1])) if len(counts) else counts
+
+    result = np.empty((len(counts), len(fractions)))
+    for column, fraction in enumerate(fractions):
+        position = starts + (counts - 1) * fraction
+        lower = np.floor(position).astype(int)
+        upper = np.minimum(lower + 1, starts + counts - 1)
+        weight = position - lower
+        result[:, column] = sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+    return result
+
+def _load_projects(team_id=None):
+    """Completed projects with a started and finished history, as columns"""
+    projects = Project.objects.filter(status='Completed')
+    if team_id:
+        projects = projects.filter(team_id=team_id)
+
+    rows = list(projects.annotate(
+        history_started_at=_history_field('started_at'),
+        history_finished_at=_history_field('finished_at'),
+        history_deadline=_history_field('deadline')
+    ).filter(
+        history_started_at__isnull=False,
+        history_finished_at__isnull=False
+    ).values_list('id', 'name', 'history_started_at', 'history_finished_at', 'history_deadline'))
+
+    ids, names, started_at, finished_at, deadlines = zip(*rows) if rows else ((), (), (), (), ())
+    return {
+        'id': np.array(ids, dtype=int),
+        'name': list(names),
+        'finished_at': list(finished_at),
+        'started': _timestamps(started_at),
+        'finished': _timestamps(finished_at),
+        'deadline': _timestamps(deadlines),
+    }
+
+def _load_delayed_phases(project_ids):
+    """Phases of the latest PPAP of each project that finished after their deadline"""
+    ppap_ids = PPAP.objects.filter(project_id__in=project_ids).order_by().values('project_id').annotate(
+        latest=Max('id')
+    ).values('latest')
+
+    rows = list(Phase.objects.filter(ppap_id__in=ppap_ids).annotate(
+        history_finished_at=_history_field('finished_at'),
+        history_deadline=_history_field('deadline')
+    ).filter(
+        history_finished_at__isnull=False,
+        history_deadline__isnull=False
+    ).order_by('ppap__project_id', 'id').values_list(
+        'id', 'template__name', 'history_finished_at', 'history_deadline'
+    ))
+
+    ids, names, finished_at, deadlines = zip(*rows) if rows else ((), (), (), ())
+    phase_ids = np.array(ids, dtype=int)
+    finished = _timestamps(finished_at)
+    deadline = _timestamps(deadlines)
+    delayed = finished > deadline
+
+    return {
+        'id': phase_ids[delayed],
+        'name': np.array([name or "Unknown Phase" for name in names], dtype=object)[delayed],
+        'delay_days': _whole_days(finished - deadline)[delayed],
+    }
+
+def _load_delayed_outputs(phase_ids):
+    """Outputs of the given phases that finished after their deadline"""
+    rows = list(Output.objects.filter(phase_id__in=phase_ids.tolist()).annotate(
+        history_finished_at=_history_field('finished_at'),
+        history_deadline=_history_field('deadline')
+    ).filter(
+        history_finished_at__isnull=False,
+        history_deadline__isnull=False
+    ).order_by('id').values_list('phase_id', 'template__name', 'history_finished_at', 'history_deadline'))
+
+    phase_of, names, finished_at, deadlines = zip(*rows) if rows else ((), (), (), ())
+    delayed = _timestamps(finished_at) > _timestamps(deadlines)
+
+    return {
+        'phase_id': np.array(phase_of, dtype=int)[delayed],
+        'name': np.array([name or "Unknown Output" for name in names], dtype=object)[delayed],
+    }
+
+def _bottleneck_phases(phases, outputs):
+    """Delay frequency per phase template name, with the most delayed outputs"""
+    if not len(phases['id']):
+        return []
+
+    names, phase_groups = np.unique(phases['name'], return_inverse=True)
+    frequency = np.bincount(phase_groups, minlength=len(names))
+    total_delay = np.bincount(phase_groups, weights=phases['delay_days'], minlength=len(names))
+    delay_percentiles = grouped_percentiles(phase_groups, phases['delay_days'], [0.5, 0.9])
+
+    # Delayed outputs counted per (phase name, output name)
+    problem_outputs = [[] for _ in names]
+    if len(outputs['phase_id']):
+        group_of_phase = dict(zip(phases['id'].tolist(), phase_groups.tolist()))
+        output_groups = np.array([group_of_phase[phase_id] for phase_id in outputs['phase_id'].tolist()])
+        output_names, output_name_index = np.unique(outputs['name'], return_inverse=True)
+        pairs, pair_counts = np.unique(
+            output_groups * len(output_names) + output_name_index, return_counts=True
+        )
+        for pair, pair_count in zip(pairs.tolist(), pair_counts.tolist()):
+            group, name_index = divmod(pair, len(output_names))
+            problem_outputs[group].append({"name": output_names[name_index], "frequency": pair_count})
+
+    bottlenecks = [
+        {
+            "phase_name": names[group],
+            "frequency": int(frequency[group]),
+            "avg_delay_days": float(total_delay[group] / frequency[group]),
+            "p50_delay_days": float(delay_percentiles[group, 0]),
+            "p90_delay_days": float(delay_percentiles[group, 1]),
+            "problem_outputs": sorted(
+                problem_outputs[group], key=lambda output: (-output["frequency"], output["name"])
+            )[:TOP_PROBLEM_OUTPUTS]
+        }
+        for group in range(len(names))
+    ]
+    return sorted(bottlenecks, key=lambda phase: (-phase["frequency"], phase["phase_name"]))
+
+def _timeline_trends(projects):
+    """Per-project adherence and monthly on-time rate and durations"""
+    duration_days = _whole_days(projects['finished'] - projects['started'])
+    has_deadline = ~np.isnan(projects['deadline'])
+    on_time = ~has_deadline | (projects['finished'] <= projects['deadline'])
+
+    by_project = [
+        {
+            "project_id": project_id,
+            "project_name": name,
+            "completion_date": finished_at.isoformat(),
+            "on_time": project_on_time,
+            "duration_days": int(duration)
+        }
+        for project_id, name, finished_at, project_on_time, duration in zip(
+            projects['id'].tolist(), projects['name'], projects['finished_at'],
+            on_time.tolist(), duration_days.tolist()
+        )
+    ]
+
+    if not by_project:
+        return {"by_project": [], "by_month": []}
+
+    months = projects['finished'].astype('datetime64[s]').astype('datetime64[M]')
+    unique_months, month_groups = np.unique(months, return_inverse=True)
+    totals = np.bincount(month_groups)
+    on_time_counts = np.bincount(month_groups, weights=on_time.astype(float))
+    duration_sums = np.bincount(month_groups, weights=duration_days)
+    duration_percentiles = grouped_percentiles(month_groups, duration_days, [0.5, 0.9])
+
+    by_month = [
+        {
+            "month": str(month),
+            "total_projects": int(totals[group]),
+            "on_time_percentage": float(on_time_counts[group] / totals[group] * 100),
+            "avg_duration_days": float(duration_sums[group] / totals[group]),
+            "p50_duration_days": float(duration_percentiles[group, 0]),
+            "p90_duration_days": float(duration_percentiles[group, 1])
+        }
+        for group, month in enumerate(unique_months)
+    ]
+
+    return {"by_project": by_project, "by_month": by_month}
+
+def analyze_historical_patterns(team_id=None):
+    """
+    Analyze historical patterns in project delays and bottlenecks
+
+    History is loaded for the whole scope in three queries and aggregated
+    with NumPy group-bys rather than per-entity lookups.
+
+    Args:
+        team_id (int, optional): ID of the team to analyze
+
+    Returns:
+        dict: Historical patterns analysis including:
+            - bottleneck_phases: Phases that are frequently late, with
+              delay percentiles and their most delayed outputs
+            - timeline_trends: Adherence per project and per month
+    """
+    try:
+        projects = _load_projects(team_id)
+
+        if not len(projects['id']):
+            return {
+                "delay_patterns": [],
+                "bottleneck_phases": [],
+                "timeline_trends": [],
+                "message": "No completed projects available for analysis"
+            }
+
+        phases = _load_delayed_phases(projects['id'].tolist())
+        outputs = _load_delayed_outputs(phases['id'])
+
+        return {
+            "bottleneck_phases": _bottleneck_phases(phases, outputs),
+            "timeline_trends": _timeline_trends(projects)
+        }
+
+    except Exception as e:
+        return {
+            "error": str(e)
+        }
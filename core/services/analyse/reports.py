@@ -0,0 +1,492 @@
+# Custom report metrics, jobs and cached results
+import hashlib
+import json
+from datetime import datetime, timedelta
+from django.db import transaction
+from django.db.models import Count, DateTimeField, OuterRef, Subquery
+from django.utils import timezone
+
+from core.models import Project, Phase, Output, History, HistoryEvent, Team, User, Todo, Document, ReportJob
+
+COMPLETED_STATUSES = ['Completed', 'Approved']
+
+# Completed reports are served again for identical parameters for this long
+REPORT_RESULT_TTL = timedelta(hours=1)
+
+def _history_field(field):
+    return Subquery(
+        History.objects.filter(id=OuterRef('history_id')).values(field)[:1],
+        output_field=DateTimeField()
+    )
+
+def _events_by_history(history_ids, start_date, end_date):
+    """History events of some records (IDs or a values() subquery) in a date range, by history ID"""
+    events = {}
+    for history_id, event_type, details, timestamp in HistoryEvent.objects.filter(
+        history_id__in=history_ids,
+        timestamp__gte=start_date,
+        timestamp__lte=end_date
+    ).order_by('timestamp', 'id').values_list('history_id', 'type', 'details', 'timestamp'):
+        events.setdefault(history_id, []).append({
+            'event': event_type,
+            'details': details,
+            'created_at': timestamp.isoformat()
+        })
+    return events
+
+def _projects(project_ids):
+    projects = Project.objects.filter(id__in=project_ids) if project_ids else Project.objects.all()
+    return projects.order_by('id')
+
+def get_project_progress(parameters):
+    """
+    Get project progress data for the specified projects and date range
+
+    Args:
+        parameters (dict): Normalized report parameters
+
+    Returns:
+        list: Progress and history events per project
+    """
+    projects = list(_projects(parameters['project_ids']).values('id', 'name', 'history_id'))
+    project_ids = _projects(parameters['project_ids']).values('id')
+
+    phase_counts = {}
+    for project_id, status, count in Phase.objects.filter(ppap__project_id__in=project_ids).order_by().values_list(
+        'ppap__project_id', 'status'
+    ).annotate(count=Count('id')):
+        total, completed = phase_counts.get(project_id, (0, 0))
+        phase_counts[project_id] = (total + count, completed + (count if status in COMPLETED_STATUSES else 0))
+
+    events = _events_by_history(
+        _projects(parameters['project_ids']).values('history_id'), parameters['start_date'], parameters['end_date']
+    )
+
+    progress_data = []
+    for project in projects:
+        total_phases, completed_phases = phase_counts.get(project['id'], (0, 0))
+        progress_data.append({
+            'project_id': project['id'],
+            'project_name': project['name'],
+            'progress_percentage': completed_phases / total_phases * 100 if total_phases > 0 else 0,
+            'total_phases': total_phases,
+            'completed_phases': completed_phases,
+            'history_events': events.get(project['history_id'], [])
+        })
+
+    return progress_data
+
+def get_team_performance(parameters):
+    """
+    Get team performance data for the specified teams and date range
+
+    Args:
+        parameters (dict): Normalized report parameters
+
+    Returns:
+        list: Completion and on-time rates and project events per team
+    """
+    team_ids = parameters['team_ids']
+    teams = Team.objects.filter(id__in=team_ids) if team_ids else Team.objects.all()
+    teams = list(teams.order_by('id').values('id', 'name'))
+
+    team_projects = Project.objects.filter(team_id__in=[team['id'] for team in teams])
+    projects = list(team_projects.annotate(
+        history_finished_at=_history_field('finished_at'),
+        history_deadline=_history_field('deadline')
+    ).values('team_id', 'status', 'history_id', 'history_finished_at', 'history_deadline'))
+
+    events = _events_by_history(
+        team_projects.values('history_id'), parameters['start_date'], parameters['end_date']
+    )
+
+    by_team = {}
+    for project in projects:
+        by_team.setdefault(project['team_id'], []).append(project)
+
+    performance_data = []
+    for team in teams:
+        team_projects = by_team.get(team['id'], [])
+        total_projects = len(team_projects)
+        completed_projects = sum(1 for p in team_projects if p['status'] in ['Completed', 'Archived'])
+        on_time_projects = sum(
+            1 for p in team_projects
+            if p['history_deadline'] and p['history_finished_at'] and p['history_finished_at'] <= p['history_deadline']
+        )
+
+        team_events = sorted(
+            (event for p in team_projects for event in events.get(p['history_id'], [])),
+            key=lambda event: event['created_at']
+        )
+
+        performance_data.append({
+            'team_id': team['id'],
+            'team_name': team['name'],
+            'performance_metrics': {
+                'completion_rate': completed_projects / total_projects * 100 if total_projects > 0 else 0,
+                'on_time_delivery_rate': on_time_projects / completed_projects * 100 if completed_projects > 0 else 0,
+                'total_projects': total_projects,
+                'completed_projects': completed_projects,
+                'on_time_projects': on_time_projects
+            },
+            'history_events': team_events
+        })
+
+    return performance_data
+
+def get_user_productivity(parameters):
+    """
+    Get user productivity data for the specified users and date range
+
+    Args:
+        parameters (dict): Normalized report parameters
+
+    Returns:
+        list: Output completion and history events per user
+    """
+    user_ids = parameters['user_ids']
+    users = User.objects.filter(id__in=user_ids) if user_ids else User.objects.all()
+    events = _events_by_history(
+        users.values('history_id'), parameters['start_date'], parameters['end_date']
+    )
+    users = list(users.order_by('id').values('id', 'username', 'history_id'))
+
+    outputs_by_user = {}
+    for user_id, output_id, status in Todo.objects.filter(
+        user_id__in=[user['id'] for user in users]
+    ).order_by().values_list('user_id', 'output_id', 'output__status').distinct():
+        outputs_by_user.setdefault(user_id, {})[output_id] = status
+
+    productivity_data = []
+    for user in users:
+        statuses = outputs_by_user.get(user['id'], {}).values()
+        total_outputs = len(statuses)
+        completed_outputs = sum(1 for status in statuses if status in COMPLETED_STATUSES)
+        productivity_data.append({
+            'user_id': user['id'],
+            'username': user['username'],
+            'total_outputs': total_outputs,
+            'completed_outputs': completed_outputs,
+            'completion_rate': completed_outputs / total_outputs * 100 if total_outputs else 0,
+            'history_events': events.get(user['history_id'], [])
+        })
+
+    return productivity_data
+
+def get_quality_metrics(parameters):
+    """
+    Get quality metrics for the specified projects
+
+    Args:
+        parameters (dict): Normalized report parameters
+
+    Returns:
+        list: Rejection and approval rates and revisions per project
+    """
+    projects = list(_projects(parameters['project_ids']).values('id', 'name'))
+    project_ids = _projects(parameters['project_ids']).values('id')
+
+    status_counts = {}
+    for project_id, status, count in Output.objects.filter(
+        phase__ppap__project_id__in=project_ids
+    ).order_by().values_list('phase__ppap__project_id', 'status').annotate(count=Count('id')):
+        status_counts.setdefault(project_id, {})[status] = count
+
+    # Document versions count as revisions
+    revision_counts = {}
+    for project_id, output_id, output_name, revisions in Document.objects.filter(
+        output__phase__ppap__project_id__in=project_ids
+    ).order_by().values_list(
+        'output__phase__ppap__project_id', 'output_id', 'output__template__name'
+    ).annotate(revisions=Count('id')):
+        revision_counts.setdefault(project_id, {})[output_id] = {
+            'output_name': output_name or "Unknown",
+            'revisions': revisions
+        }
+
+    quality_data = []
+    for project in projects:
+        counts = status_counts.get(project['id'], {})
+        total_outputs = sum(counts.values())
+        quality_data.append({
+            'project_id': project['id'],
+            'project_name': project['name'],
+            'quality_metrics': {
+                'rejection_rate': counts.get('Rejected', 0) / total_outputs * 100 if total_outputs > 0 else 0,
+                'approval_rate': counts.get('Approved', 0) / total_outputs * 100 if total_outputs > 0 else 0,
+                'revision_counts': revision_counts.get(project['id'], {})
+            }
+        })
+
+    return quality_data
+
+def get_timeline_adherence(parameters):
+    """
+    Get timeline adherence data for the specified projects
+
+    Args:
+        parameters (dict): Normalized report parameters
+
+    Returns:
+        list: Phases with deadlines and finished on time per project
+    """
+    projects = list(_projects(parameters['project_ids']).values('id', 'name'))
+
+    adherence = {}
+    for project_id, finished_at, deadline in Phase.objects.filter(
+        ppap__project_id__in=_projects(parameters['project_ids']).values('id')
+    ).annotate(
+        history_finished_at=_history_field('finished_at'),
+        history_deadline=_history_field('deadline')
+    ).filter(history_deadline__isnull=False).values_list(
+        'ppap__project_id', 'history_finished_at', 'history_deadline'
+    ):
+        with_deadline, on_time = adherence.get(project_id, (0, 0))
+        adherence[project_id] = (with_deadline + 1, on_time + int(bool(finished_at and finished_at <= deadline)))
+
+    timeline_data = []
+    for project in projects:
+        phases_with_deadlines, phases_completed_on_time = adherence.get(project['id'], (0, 0))
+        timeline_data.append({
+            'project_id': project['id'],
+            'project_name': project['name'],
+            'phases_with_deadlines': phases_with_deadlines,
+            'phases_completed_on_time': phases_completed_on_time,
+            'adherence_rate': (
+                phases_completed_on_time / phases_with_deadlines * 100 if phases_with_deadlines > 0 else 0
+            )
+        })
+
+    return timeline_data
+
+# Metric families a report can contain
+REPORT_METRICS = {
+    'project_progress': get_project_progress,
+    'team_performance': get_team_performance,
+    'user_productivity': get_user_productivity,
+    'quality_metrics': get_quality_metrics,
+    'timeline_adherence': get_timeline_adherence,
+}
+
+def _parse_date(value):
+    parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+
+def _parse_ids(values, name):
+    if values in (None, ''):
+        return []
+    if not isinstance(values, (list, tuple)):
+        values = [values]
+    try:
+        return sorted({int(value) for value in values})
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a list of integers")
+
+def normalize_report_parameters(data):
+    """
+    Validate report parameters and put them in canonical form
+
+    Dates become UTC ISO strings and ID and metric lists are deduplicated
+    and sorted, so equivalent requests share a cache key.
+
+    Args:
+        data (dict): start_date, end_date, project_ids, team_ids, user_ids
+            and metrics as sent by the client
+
+    Returns:
+        dict: Normalized parameters
+
+    Raises:
+        ValueError: If a parameter is missing or invalid
+    """
+    if not data.get('start_date') or not data.get('end_date'):
+        raise ValueError("start_date and end_date are required")
+
+    try:
+        start_date = _parse_date(data['start_date'])
+        end_date = _parse_date(data['end_date'])
+    except ValueError:
+        raise ValueError("Invalid date format. Use ISO format (YYYY-MM-DDTHH:MM:SS)")
+
+    metrics = data.get('metrics') or []
+    if not isinstance(metrics, (list, tuple)):
+        metrics = [metrics]
+    unknown = set(metrics) - set(REPORT_METRICS)
+    if unknown:
+        raise ValueError(f"Unknown metrics: {', '.join(sorted(map(str, unknown)))}")
+
+    return {
+        'start_date': start_date.astimezone(timezone.utc).isoformat(),
+        'end_date': end_date.astimezone(timezone.utc).isoformat(),
+        'project_ids': _parse_ids(data.get('project_ids'), 'project_ids'),
+        'team_ids': _parse_ids(data.get('team_ids'), 'team_ids'),
+        'user_ids': _parse_ids(data.get('user_ids'), 'user_ids'),
+        'metrics': sorted(set(metrics)),
+    }
+
+def report_cache_key(parameters):
+    """
+    Digest of normalized report parameters
+
+    Args:
+        parameters (dict): Normalized parameters
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    return hashlib.sha256(json.dumps(parameters, sort_keys=True).encode()).hexdigest()
+
+def compute_report_metric(metric, parameters):
+    """
+    Compute one metric family of a report
+
+    Module-level so report workers can run it in child processes.
+
+    Args:
+        metric (str): Metric family name
+        parameters (dict): Normalized parameters
+
+    Returns:
+        list: Metric data
+    """
+    return REPORT_METRICS[metric](parameters)
+
+def build_report(parameters):
+    """
+    Compute a report synchronously
+
+    Args:
+        parameters (dict): Normalized parameters
+
+    Returns:
+        dict: parameters and data per requested metric
+    """
+    return {
+        'parameters': parameters,
+        'data': {metric: compute_report_metric(metric, parameters) for metric in parameters['metrics']}
+    }
+
+def get_cached_report(parameters):
+    """
+    Get the latest completed job for these parameters, if still fresh
+
+    Args:
+        parameters (dict): Normalized parameters
+
+    Returns:
+        ReportJob: Completed job, or None
+    """
+    return ReportJob.objects.filter(
+        cache_key=report_cache_key(parameters),
+        status='completed',
+        finished_at__gte=timezone.now() - REPORT_RESULT_TTL
+    ).order_by('-finished_at').first()
+
+def submit_report_job(data, user=None):
+    """
+    Submit a report to be computed in the background
+
+    A fresh completed job with the same parameters is returned as is, and
+    a pending or running one is shared instead of queueing a duplicate.
+
+    Args:
+        data (dict): Report parameters as sent by the client
+        user (User, optional): Requesting user
+
+    Returns:
+        ReportJob: Completed, running or newly pending job
+
+    Raises:
+        ValueError: If the parameters are invalid
+    """
+    parameters = normalize_report_parameters(data)
+    cache_key = report_cache_key(parameters)
+
+    job = get_cached_report(parameters) or ReportJob.objects.filter(
+        cache_key=cache_key, status__in=['pending', 'running']
+    ).order_by('id').first()
+
+    return job or ReportJob.objects.create(
+        cache_key=cache_key,
+        parameters=parameters,
+        requested_by=user if user and user.is_authenticated else None
+    )
+
+def claim_report_jobs(limit):
+    """
+    Mark the oldest pending jobs as running and return them
+
+    Rows are locked with SKIP LOCKED where supported, so several workers
+    never claim the same job.
+
+    Args:
+        limit (int): Maximum number of jobs
+
+    Returns:
+        list: Claimed ReportJob objects
+    """
+    with transaction.atomic():
+        jobs = list(ReportJob.objects.select_for_update(skip_locked=True).filter(
+            status='pending'
+        ).order_by('id')[:limit])
+
+        now = timezone.now()
+        ReportJob.objects.filter(id__in=[job.id for job in jobs]).update(status='running', started_at=now)
+        for job in jobs:
+            job.status = 'running'
+            job.started_at = now
+
+    return jobs
+
+def requeue_stale_report_jobs(older_than):
+    """
+    Put back running jobs whose worker presumably died
+
+    Args:
+        older_than (timedelta): Running time after which a job is stale
+
+    Returns:
+        int: Number of jobs requeued
+    """
+    return ReportJob.objects.filter(
+        status='running',
+        started_at__lt=timezone.now() - older_than
+    ).update(status='pending', started_at=None)
+
+def complete_report_job(job, data=None, error=None):
+    """
+    Store the outcome of a report job
+
+    Args:
+        job (ReportJob): Running job
+        data (dict, optional): Metric data, when it succeeded
+        error (str, optional): Error message, when it failed
+    """
+    job.finished_at = timezone.now()
+    if error is None:
+        job.status = 'completed'
+        job.result = {'parameters': job.parameters, 'data': data}
+    else:
+        job.status = 'failed'
+        job.error = error
+    job.save(update_fields=['status', 'result', 'error', 'finished_at'])
+
+def serialize_report_job(job):
+    """
+    Build the API representation of a report job, without its result
+
+    Args:
+        job (ReportJob): Report job
+
+    Returns:
+        dict: Job status
+    """
+    return {
+        'id': job.id,
+        'status': job.status,
+        'parameters': job.parameters,
+        'error': job.error or None,
+        'created_at': job.created_at.isoformat(),
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+    }
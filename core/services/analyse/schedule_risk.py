@@ -0,0 +1,184 @@
+# Monte Carlo simulation of project completion
+import math
+from datetime import timedelta
+import numpy as np
+from django.utils import timezone
+
+from core.models import Project, PPAP, History
+from core.services.analyse.critical_path import (
+    CLOSED_OUTPUT_STATUSES, DEFAULT_OUTPUT_DURATION, build_project_network, topological_order
+)
+from core.services.analyse.durations import get_output_template_durations
+
+DEFAULT_ITERATIONS = 10000
+MAX_ITERATIONS = 100000
+
+# Iterations simulated at once, bounding memory to nodes x batch floats
+BATCH_SIZE = 10000
+
+# Spread (sigma of the log) used when a template has too little history
+DEFAULT_LOG_SIGMA = 0.5
+
+# Shortest sampled median, in days
+MIN_MEDIAN_DURATION = 0.1
+
+# z-score of the 90th percentile of a standard normal distribution
+Z_90 = 1.2815515655446004
+
+COMPLETION_PERCENTILES = [50, 80, 95]
+
+def lognormal_parameters(statistics):
+    """
+    Fit a log-normal distribution to a cached duration distribution
+
+    The median is matched to p50 and the spread to p90.
+
+    Args:
+        statistics (dict): Cached distribution (count, p50, p90), or None
+
+    Returns:
+        tuple: (mu, sigma) of the logarithm of the duration in days
+    """
+    if not statistics:
+        return math.log(DEFAULT_OUTPUT_DURATION), DEFAULT_LOG_SIGMA
+
+    median = max(statistics["p50"], MIN_MEDIAN_DURATION)
+    if statistics["count"] > 1 and statistics["p90"] > median:
+        sigma = math.log(statistics["p90"] / median) / Z_90
+    else:
+        sigma = DEFAULT_LOG_SIGMA
+    return math.log(median), sigma
+
+def _simulate_batch(rng, size, order, predecessor_rows, open_rows, mu, sigma, elapsed):
+    """Sample remaining durations and run the forward pass for one batch of iterations"""
+    durations = np.zeros((len(order), size))
+    if len(open_rows):
+        samples = rng.lognormal(mu[:, None], sigma[:, None], size=(len(open_rows), size))
+        durations[open_rows] = np.maximum(samples - elapsed[:, None], 0.0)
+
+    finish = np.empty_like(durations)
+    for row, predecessors in enumerate(predecessor_rows):
+        if len(predecessors):
+            finish[row] = finish[predecessors].max(axis=0) + durations[row]
+        else:
+            finish[row] = durations[row]
+
+    return finish.max(axis=0) if len(order) else np.zeros(size)
+
+def simulate_ppap_completion(ppap, iterations=DEFAULT_ITERATIONS, seed=None, now=None):
+    """
+    Simulate the remaining days of work of a PPAP
+
+    Remaining outputs get log-normal durations fitted to the cached
+    distribution of their template (time already spent on started outputs
+    is subtracted); each iteration is then scheduled over the same network
+    as the critical path analysis. Iterations are processed as arrays, one
+    row per node.
+
+    Args:
+        ppap (PPAP): PPAP to simulate
+        iterations (int): Number of simulations
+        seed (int, optional): Random seed, for reproducible results
+        now (datetime, optional): Reference time
+
+    Returns:
+        ndarray: Remaining days until completion, one per iteration
+    """
+    now = now or timezone.now()
+    network = build_project_network(ppap, now)
+
+    order, _ = topological_order(network['durations'], network['predecessors'])
+    row_of = {node: row for row, node in enumerate(order)}
+    predecessor_rows = [
+        np.array([row_of[p] for p in network['predecessors'].get(node, ())], dtype=int)
+        for node in order
+    ]
+
+    open_outputs = [output for output in network['outputs'] if output['status'] not in CLOSED_OUTPUT_STATUSES]
+    statistics = get_output_template_durations({output['template_id'] for output in open_outputs})
+
+    parameters = [lognormal_parameters(statistics.get(output['template_id'])) for output in open_outputs]
+    mu = np.array([parameter[0] for parameter in parameters])
+    sigma = np.array([parameter[1] for parameter in parameters])
+    elapsed = np.array([
+        (now - output['started_at']).total_seconds() / 86400
+        if output['started_at'] and output['status'] != 'Not Started' else 0.0
+        for output in open_outputs
+    ])
+    open_rows = np.array([row_of[('output', output['id'])] for output in open_outputs], dtype=int)
+
+    rng = np.random.default_rng(seed)
+    return np.concatenate([
+        _simulate_batch(rng, min(BATCH_SIZE, iterations - start), order, predecessor_rows,
+                        open_rows, mu, sigma, elapsed)
+        for start in range(0, iterations, BATCH_SIZE)
+    ])
+
+def analyze_schedule_risk(project_id, iterations=DEFAULT_ITERATIONS, seed=None):
+    """
+    Estimate the probability of finishing a project by its deadline
+
+    Args:
+        project_id (int): ID of the project to analyze
+        iterations (int): Number of Monte Carlo simulations
+        seed (int, optional): Random seed, for reproducible results
+
+    Returns:
+        dict: Schedule risk including:
+            - deadline: Project deadline
+            - probability_on_time: Share of simulations finishing by the
+              deadline (None without deadline)
+            - completion_dates: P50/P80/P95 completion dates
+            - remaining_days: Mean and P50/P80/P95 remaining days
+    """
+    try:
+        if not 1 <= iterations <= MAX_ITERATIONS:
+            return {"error": f"iterations must be between 1 and {MAX_ITERATIONS}"}
+
+        project = Project.objects.get(id=project_id)
+        ppap = PPAP.objects.filter(project=project).first()
+        deadline = History.objects.filter(id=project.history_id).values_list('deadline', flat=True).first()
+
+        if not ppap:
+            return {
+                "project_id": project.id,
+                "project_name": project.name,
+                "message": "No PPAP associated with this project"
+            }
+
+        now = timezone.now()
+        remaining_days = simulate_ppap_completion(ppap, iterations, seed, now)
+        percentiles = np.percentile(remaining_days, COMPLETION_PERCENTILES)
+
+        probability_on_time = None
+        if deadline:
+            days_to_deadline = (deadline - now).total_seconds() / 86400
+            probability_on_time = float(np.mean(remaining_days <= days_to_deadline))
+
+        return {
+            "project_id": project.id,
+            "project_name": project.name,
+            "iterations": iterations,
+            "deadline": deadline.isoformat() if deadline else None,
+            "probability_on_time": probability_on_time,
+            "completion_dates": {
+                f"p{percentile}": (now + timedelta(days=float(days))).isoformat()
+                for percentile, days in zip(COMPLETION_PERCENTILES, percentiles)
+            },
+            "remaining_days": {
+                "mean": round(float(remaining_days.mean()), 2),
+                **{
+                    f"p{percentile}": round(float(days), 2)
+                    for percentile, days in zip(COMPLETION_PERCENTILES, percentiles)
+                }
+            }
+        }
+
+    except Project.DoesNotExist:
+        return {
+            "error": f"Project with ID {project_id} not found"
+        }
+    except Exception as e:
+        return {
+            "error": str(e)
+        }
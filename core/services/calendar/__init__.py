@@ -0,0 +1 @@
+# Calendar feed services
@@ -0,0 +1,17 @@
+# Define all API here
+from core.services.calendar.ical import (
+    ical_text,
+    ical_line,
+    ical_event,
+    iter_ical
+)
+from core.services.calendar.feeds import (
+    CALENDAR_FEED_FORMAT,
+    user_feed_project_ids,
+    team_feed_project_ids,
+    feed_etag,
+    user_feed_etag,
+    team_feed_etag,
+    iter_user_feed,
+    iter_team_feed
+)
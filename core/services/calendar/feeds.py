@@ -0,0 +1,223 @@
+# Deadline feeds of users and teams
+import hashlib
+from django.db.models import Count, DateTimeField, F, Max, OuterRef, Q, Subquery
+from core.models import Project, Phase, Output, Todo, User, Team, History
+from core.services.calendar.ical import ical_event, iter_ical
+from core.services.statistics.snapshots import project_versions
+
+# Bump when the rendering changes so clients do not keep stale feeds
+CALENDAR_FEED_FORMAT = 1
+
+# Rows fetched from the database per round trip while streaming
+CALENDAR_CHUNK_SIZE = 500
+
+ICAL_UID_DOMAIN = 'apqp-ppap'
+
+def _history_field(field):
+    return Subquery(
+        History.objects.filter(id=OuterRef('history_id')).values(field)[:1],
+        output_field=DateTimeField()
+    )
+
+def _user_outputs(user_id):
+    """Outputs assigned to a user, directly or through a todo"""
+    return Output.objects.filter(
+        Q(user_id=user_id) | Q(id__in=Todo.objects.filter(user_id=user_id).values('output_id'))
+    )
+
+def user_feed_project_ids(user_id):
+    """
+    Get the projects a user's feed is built from, in one query
+
+    Args:
+        user_id (int): User ID
+
+    Returns:
+        set: IDs of the projects where the user is responsible for a phase,
+            is assigned an output or has a todo
+    """
+    phases = Phase.objects.filter(responsible_id=user_id).values_list('ppap__project_id', flat=True)
+    outputs = _user_outputs(user_id).values_list('phase__ppap__project_id', flat=True)
+    return set(phases.order_by().union(outputs.order_by())) - {None}
+
+def team_feed_project_ids(team_id):
+    """
+    Get the projects a team's feed is built from
+
+    Args:
+        team_id (int): Team ID
+
+    Returns:
+        set: IDs of the team's projects
+    """
+    return set(Project.objects.filter(team_id=team_id).values_list('id', flat=True))
+
+def _feed_histories(kind, owner_id):
+    """History records of the entities shown in a feed"""
+    if kind == 'user':
+        phases = Phase.objects.filter(responsible_id=owner_id)
+        outputs = _user_outputs(owner_id)
+        projects = Project.objects.none()
+    else:
+        phases = Phase.objects.filter(ppap__project__team_id=owner_id)
+        outputs = Output.objects.filter(phase__ppap__project__team_id=owner_id)
+        projects = Project.objects.filter(team_id=owner_id)
+    return History.objects.filter(
+        Q(id__in=projects.values('history_id')) |
+        Q(id__in=phases.values('history_id')) |
+        Q(id__in=outputs.values('history_id'))
+    )
+
+def feed_etag(kind, owner_id, project_ids):
+    """
+    Get the version of a feed without building it
+
+    The version combines the statistics versions of the feed's projects
+    (bumped on every change to a project, its phases, outputs, todos or
+    history) with a fingerprint read from the database in one aggregate:
+    the number of History records of the feed, their last event and last
+    update. Every deadline writer records an event, so a write that did
+    not bump the cached versions still changes the ETag.
+
+    Args:
+        kind (str): 'user' or 'team'
+        owner_id (int): User or team ID
+        project_ids (iterable): Projects of the feed
+
+    Returns:
+        str: ETag value (unquoted)
+    """
+    versions = project_versions(project_ids)
+    fingerprint = _feed_histories(kind, owner_id).aggregate(
+        records=Count('id', distinct=True),
+        last_event=Max('history_events__id'),
+        last_update=Max('updated_at')
+    )
+    key = ','.join(f'{project_id}={versions[project_id]}' for project_id in sorted(versions))
+    key += f":{fingerprint['records']}:{fingerprint['last_event']}:{fingerprint['last_update']}"
+    return hashlib.sha1(f'{CALENDAR_FEED_FORMAT}:{kind}:{owner_id}:{key}'.encode()).hexdigest()
+
+def user_feed_etag(user_id):
+    """
+    Get the ETag of a user's feed
+
+    Args:
+        user_id (int): User ID
+
+    Returns:
+        str: ETag value (unquoted)
+
+    Raises:
+        User.DoesNotExist: If the user does not exist
+    """
+    project_ids = user_feed_project_ids(user_id)
+    if not project_ids and not User.objects.filter(id=user_id).exists():
+        raise User.DoesNotExist(f"User {user_id} not found")
+    return feed_etag('user', user_id, project_ids)
+
+def team_feed_etag(team_id):
+    """
+    Get the ETag of a team's feed
+
+    Args:
+        team_id (int): Team ID
+
+    Returns:
+        str: ETag value (unquoted)
+
+    Raises:
+        Team.DoesNotExist: If the team does not exist
+    """
+    project_ids = team_feed_project_ids(team_id)
+    if not project_ids and not Team.objects.filter(id=team_id).exists():
+        raise Team.DoesNotExist(f"Team {team_id} not found")
+    return feed_etag('team', team_id, project_ids)
+
+def _uid(history_id):
+    return f'{history_id}@{ICAL_UID_DOMAIN}'
+
+def _project_events(projects):
+    rows = projects.annotate(
+        deadline=_history_field('deadline'),
+        updated_at=_history_field('updated_at')
+    ).filter(deadline__isnull=False).order_by('id').values_list('history_id', 'name', 'status', 'deadline', 'updated_at')
+
+    for history_id, name, status, deadline, updated_at in rows.iterator(chunk_size=CALENDAR_CHUNK_SIZE):
+        yield ical_event(
+            _uid(history_id), f'{name} deadline', deadline,
+            description=f'Project: {name}\nStatus: {status}', stamp=updated_at
+        )
+
+def _phase_events(phases):
+    rows = phases.annotate(
+        deadline=_history_field('deadline'),
+        updated_at=_history_field('updated_at'),
+        name=F('template__name'),
+        project_name=F('ppap__project__name')
+    ).filter(deadline__isnull=False).order_by('id').values_list(
+        'history_id', 'name', 'project_name', 'status', 'deadline', 'updated_at'
+    )
+
+    for history_id, name, project_name, status, deadline, updated_at in rows.iterator(chunk_size=CALENDAR_CHUNK_SIZE):
+        yield ical_event(
+            _uid(history_id), f'{name} - {project_name}', deadline,
+            description=f'Project: {project_name}\nPhase: {name}\nStatus: {status}', stamp=updated_at
+        )
+
+def _output_events(outputs):
+    rows = outputs.annotate(
+        deadline=_history_field('deadline'),
+        updated_at=_history_field('updated_at'),
+        name=F('template__name'),
+        phase_name=F('phase__template__name'),
+        project_name=F('phase__ppap__project__name')
+    ).filter(deadline__isnull=False).order_by('id').values_list(
+        'history_id', 'name', 'phase_name', 'project_name', 'status', 'deadline', 'updated_at'
+    )
+
+    for history_id, name, phase_name, project_name, status, deadline, updated_at in rows.iterator(
+        chunk_size=CALENDAR_CHUNK_SIZE
+    ):
+        yield ical_event(
+            _uid(history_id), f'{name} - {project_name}', deadline,
+            description=f'Project: {project_name}\nPhase: {phase_name}\nStatus: {status}', stamp=updated_at
+        )
+
+def iter_user_feed(user):
+    """
+    Stream the deadline feed of a user
+
+    The feed holds the deadlines of the phases the user is responsible
+    for and of the outputs assigned to them or on their todo list.
+
+    Args:
+        user (User): The user
+
+    Yields:
+        str: iCalendar chunks
+    """
+    def events():
+        yield from _phase_events(Phase.objects.filter(responsible_id=user.id))
+        yield from _output_events(_user_outputs(user.id))
+
+    return iter_ical(f'APQP deadlines - {user.username}', events())
+
+def iter_team_feed(team):
+    """
+    Stream the deadline feed of a team
+
+    The feed holds the deadlines of the team's projects and of all their
+    phases and outputs.
+
+    Args:
+        team (Team): The team
+
+    Yields:
+        str: iCalendar chunks
+    """
+    def events():
+        yield from _project_events(Project.objects.filter(team_id=team.id))
+        yield from _phase_events(Phase.objects.filter(ppap__project__team_id=team.id))
+        yield from _output_events(Output.objects.filter(phase__ppap__project__team_id=team.id))
+
+    return iter_ical(f'APQP deadlines - {team.name}', events())
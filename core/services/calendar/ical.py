@@ -0,0 +1,91 @@
+# Streaming iCalendar (RFC 5545) writer for deadline feeds
+from datetime import timedelta, timezone as dt_timezone
+from django.utils import timezone
+
+ICAL_PRODUCT_ID = '-//APQP PPAP Manager//Deadline feed//EN'
+
+# Longest content line in octets, longer lines are folded
+ICAL_LINE_LENGTH = 75
+
+def ical_text(value):
+    """Escape a value for a TEXT property"""
+    return (
+        str(value).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n').replace('\r', '\\n')
+    )
+
+def ical_line(line):
+    """Fold a content line to ICAL_LINE_LENGTH octets and terminate it with CRLF"""
+    parts = []
+    current = ''
+    size = 0
+    for char in line:
+        length = len(char.encode('utf-8'))
+        # Continuation lines start with a space, which counts in their length
+        if size + length > ICAL_LINE_LENGTH:
+            parts.append(current)
+            current = ' '
+            size = 1
+        current += char
+        size += length
+    parts.append(current)
+    return '\r\n'.join(parts) + '\r\n'
+
+def _utc(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+def ical_event(uid, summary, deadline, description='', stamp=None):
+    """
+    Render one deadline as an all-day VEVENT
+
+    The event covers the local date of the deadline (TIME_ZONE), the exact
+    time being given in the description.
+
+    Args:
+        uid (str): Globally unique, stable event ID
+        summary (str): Event title
+        deadline (datetime): Deadline (aware)
+        description (str, optional): Event details
+        stamp (datetime, optional): Last change of the event, defaults to now
+
+    Returns:
+        str: The VEVENT lines
+    """
+    day = timezone.localtime(deadline).date()
+    details = f"Due {timezone.localtime(deadline).strftime('%Y-%m-%d %H:%M %Z')}"
+    if description:
+        details += '\n' + description
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:{ical_text(uid)}',
+        f'DTSTAMP:{_utc(stamp or timezone.now())}',
+        f"DTSTART;VALUE=DATE:{day.strftime('%Y%m%d')}",
+        f"DTEND;VALUE=DATE:{(day + timedelta(days=1)).strftime('%Y%m%d')}",
+        f'SUMMARY:{ical_text(summary)}',
+        f'DESCRIPTION:{ical_text(details)}',
+        'TRANSP:TRANSPARENT',
+        'END:VEVENT',
+    ]
+    return ''.join(ical_line(line) for line in lines)
+
+def iter_ical(name, events):
+    """
+    Stream a VCALENDAR
+
+    Args:
+        name (str): Calendar name shown by clients
+        events (iterable): VEVENT strings, see ical_event
+
+    Yields:
+        str: The calendar, one chunk per event
+    """
+    yield ''.join(ical_line(line) for line in (
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:{ICAL_PRODUCT_ID}',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{ical_text(name)}',
+    ))
+    yield from events
+    yield ical_line('END:VCALENDAR')
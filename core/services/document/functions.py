@@ -9,6 +9,7 @@ from core.services.history.document import (
 import os
 import shutil
 from django.utils import timezone
+from core.services.project.rollup import rollup_document_change
 
 def get_document_by_id(document_id):
     """
@@ -119,7 +120,9 @@ def delete_document(document, delete_file=True):
         else:
             shutil.rmtree(document.file_path)
     
+    output_id = document.output_id
     document.delete()
+    rollup_document_change(output_id, -1)
 
 def change_document_output(document, output):
     """
@@ -137,6 +140,10 @@ def change_document_output(document, output):
     document.output = output
     document.save()
     
+    if old_output_id != output.id:
+        rollup_document_change(old_output_id, -1)
+        rollup_document_change(output.id, 1)
+    
     History.objects.create(
         id=document.history_id,
         title=document.name,
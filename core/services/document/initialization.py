@@ -10,6 +10,7 @@ from core.services.history.document import (
 import os
 import shutil
 from django.utils import timezone
+from core.services.project.rollup import rollup_document_change
 
 def initialize_document(name, file_path, output, uploader, status='draft', version=1, file_size=None, file_type=None):
     """
@@ -56,6 +57,7 @@ def initialize_document(name, file_path, output, uploader, status='draft', versi
     
     # Record creation in history
     record_document_creation(document)
+    rollup_document_change(document.output_id, 1)
     
     return document
 
@@ -174,7 +176,9 @@ def delete_document(document, delete_file=True):
         else:
             shutil.rmtree(document.file_path)
     
+    output_id = document.output_id
     document.delete()
+    rollup_document_change(output_id, -1)
 
 def change_document_output(document, output):
     """
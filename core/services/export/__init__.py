@@ -0,0 +1 @@
+# Export services
@@ -0,0 +1,16 @@
+# Define all API here
+from core.services.export.datasets import (
+    EXPORT_DATASETS,
+    projects_dataset,
+    phases_dataset,
+    outputs_dataset,
+    documents_dataset,
+    history_events_dataset
+)
+from core.services.export.writers import (
+    EXPORT_CHUNK_SIZE,
+    PARQUET_AVAILABLE,
+    iter_csv,
+    iter_parquet,
+    parquet_schema
+)
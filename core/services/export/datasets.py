@@ -0,0 +1,136 @@
+# Flat datasets for tabular exports
+from django.db.models import Count, DateTimeField, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from core.models import Project, Phase, Output, Document, History, HistoryEvent
+
+COMPLETED_STATUSES = ['Completed', 'Approved']
+
+def _history_field(field):
+    return Subquery(
+        History.objects.filter(id=OuterRef('history_id')).values(field)[:1],
+        output_field=DateTimeField()
+    )
+
+def _related_count(queryset, field):
+    """Number of rows of queryset whose field points to the outer row"""
+    return Coalesce(Subquery(
+        queryset.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(
+            count=Count('id')
+        ).values('count'),
+        output_field=IntegerField()
+    ), 0)
+
+# Dates taken from the History record of exported entities
+HISTORY_COLUMNS = [
+    ('created_at', 'datetime'), ('started_at', 'datetime'),
+    ('deadline', 'datetime'), ('finished_at', 'datetime'),
+]
+
+def _history_columns():
+    return {name: _history_field(name) for name, _ in HISTORY_COLUMNS}
+
+def projects_dataset(project_id=None, **filters):
+    """Projects with their dates and rollup counters"""
+    projects = Project.objects.all()
+    if project_id:
+        projects = projects.filter(id=project_id)
+
+    return projects.annotate(**_history_columns()).order_by('id').values_list(
+        'id', 'name', 'status', 'team_id', 'client__name', 'ppap__level',
+        'created_at', 'started_at', 'deadline', 'finished_at',
+        'rollup__phases_total', 'rollup__phases_completed',
+        'rollup__outputs_total', 'rollup__overdue_outputs', 'rollup__documents',
+        'rollup__last_activity_at'
+    ), [
+        ('project_id', 'int'), ('name', 'str'), ('status', 'str'), ('team_id', 'int'),
+        ('client_name', 'str'), ('ppap_level', 'int'),
+        *HISTORY_COLUMNS,
+        ('phases_total', 'int'), ('phases_completed', 'int'),
+        ('outputs_total', 'int'), ('overdue_outputs', 'int'), ('documents', 'int'),
+        ('last_activity_at', 'datetime')
+    ]
+
+def phases_dataset(project_id=None, **filters):
+    """Phases with their dates and output completion counts"""
+    phases = Phase.objects.all()
+    if project_id:
+        phases = phases.filter(ppap__project_id=project_id)
+
+    return phases.annotate(
+        **_history_columns(),
+        outputs_total=_related_count(Output.objects.all(), 'phase'),
+        outputs_completed=_related_count(Output.objects.filter(status__in=COMPLETED_STATUSES), 'phase')
+    ).order_by('id').values_list(
+        'id', 'ppap__project_id', 'ppap_id', 'template_id', 'template__name', 'template__order',
+        'status', 'responsible__username',
+        'created_at', 'started_at', 'deadline', 'finished_at',
+        'outputs_total', 'outputs_completed'
+    ), [
+        ('phase_id', 'int'), ('project_id', 'int'), ('ppap_id', 'int'), ('template_id', 'int'),
+        ('template_name', 'str'), ('template_order', 'int'), ('status', 'str'), ('responsible', 'str'),
+        *HISTORY_COLUMNS,
+        ('outputs_total', 'int'), ('outputs_completed', 'int')
+    ]
+
+def outputs_dataset(project_id=None, **filters):
+    """Outputs with their dates and document counts"""
+    outputs = Output.objects.all()
+    if project_id:
+        outputs = outputs.filter(phase__ppap__project_id=project_id)
+
+    return outputs.annotate(
+        **_history_columns(),
+        documents_total=_related_count(Document.objects.all(), 'output')
+    ).order_by('id').values_list(
+        'id', 'phase__ppap__project_id', 'phase_id', 'template_id', 'template__name',
+        'status', 'user__username',
+        'created_at', 'started_at', 'deadline', 'finished_at',
+        'documents_total'
+    ), [
+        ('output_id', 'int'), ('project_id', 'int'), ('phase_id', 'int'), ('template_id', 'int'),
+        ('template_name', 'str'), ('status', 'str'), ('responsible', 'str'),
+        *HISTORY_COLUMNS,
+        ('documents', 'int')
+    ]
+
+def documents_dataset(project_id=None, **filters):
+    """Documents with their output, project and uploader"""
+    documents = Document.objects.all()
+    if project_id:
+        documents = documents.filter(output__phase__ppap__project_id=project_id)
+
+    return documents.annotate(
+        created_at=_history_field('created_at')
+    ).order_by('id').values_list(
+        'id', 'name', 'output__phase__ppap__project_id', 'output_id', 'output__template__name',
+        'file_type', 'file_size', 'version', 'status', 'uploader__username', 'created_at'
+    ), [
+        ('document_id', 'int'), ('name', 'str'), ('project_id', 'int'), ('output_id', 'int'),
+        ('output_name', 'str'), ('file_type', 'str'), ('file_size', 'int'), ('version', 'str'),
+        ('status', 'str'), ('uploader', 'str'), ('created_at', 'datetime')
+    ]
+
+def history_events_dataset(since=None, until=None, **filters):
+    """History events, optionally within a time range"""
+    events = HistoryEvent.objects.all()
+    if since:
+        events = events.filter(timestamp__gte=since)
+    if until:
+        events = events.filter(timestamp__lt=until)
+
+    return events.order_by('id').values_list(
+        'id', 'history_id', 'history__table_name', 'type', 'details', 'timestamp'
+    ), [
+        ('event_id', 'int'), ('history_id', 'str'), ('table_name', 'str'), ('type', 'str'),
+        ('details', 'str'), ('timestamp', 'datetime')
+    ]
+
+# Exportable datasets: name -> function(**filters) returning a values_list
+# queryset and its columns as (name, type) with type in int, str, datetime
+EXPORT_DATASETS = {
+    'projects': projects_dataset,
+    'phases': phases_dataset,
+    'outputs': outputs_dataset,
+    'documents': documents_dataset,
+    'history-events': history_events_dataset,
+}
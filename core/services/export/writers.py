@@ -0,0 +1,109 @@
+# Streaming CSV and Parquet writers for export datasets
+import csv
+import io
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Rows fetched from the database per round trip, and per Parquet row group
+EXPORT_CHUNK_SIZE = 2000
+
+PARQUET_AVAILABLE = pyarrow is not None
+
+def _chunks(queryset, chunk_size):
+    """Rows of a queryset in lists of chunk_size, without caching the queryset"""
+    chunk = []
+    for row in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _csv_value(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+def iter_csv(queryset, columns, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Stream a dataset as CSV
+
+    Args:
+        queryset (QuerySet): values_list queryset of the dataset
+        columns (list): (name, type) of every column
+        chunk_size (int): Rows fetched and written at a time
+
+    Yields:
+        str: The header, then one block of lines per chunk
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in columns])
+    yield buffer.getvalue()
+
+    for chunk in _chunks(queryset, chunk_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_value(value) for value in row] for row in chunk)
+        yield buffer.getvalue()
+
+def parquet_schema(columns):
+    """Arrow schema of dataset columns"""
+    types = {
+        'int': pyarrow.int64(),
+        'str': pyarrow.string(),
+        'datetime': pyarrow.timestamp('us', tz='UTC'),
+    }
+    return pyarrow.schema([(name, types[kind]) for name, kind in columns])
+
+class _ByteSink(io.RawIOBase):
+    """Write-only file collecting bytes until they are taken by the stream"""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.data.extend(data)
+        return len(data)
+
+    def take(self):
+        data = bytes(self.data)
+        self.data.clear()
+        return data
+
+def iter_parquet(queryset, columns, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Stream a dataset as a Parquet file, one row group per chunk
+
+    Requires pyarrow (see PARQUET_AVAILABLE).
+
+    Args:
+        queryset (QuerySet): values_list queryset of the dataset
+        columns (list): (name, type) of every column
+        chunk_size (int): Rows fetched and written at a time
+
+    Yields:
+        bytes: Parts of the file, as they are written
+    """
+    if pyarrow is None:
+        raise RuntimeError("Parquet export requires pyarrow")
+
+    schema = parquet_schema(columns)
+    sink = _ByteSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema)
+    try:
+        for chunk in _chunks(queryset, chunk_size):
+            writer.write_table(pyarrow.Table.from_arrays(
+                [pyarrow.array(values, type=field.type) for values, field in zip(zip(*chunk), schema)],
+                schema=schema
+            ))
+            yield sink.take()
+    finally:
+        writer.close()
+    yield sink.take()
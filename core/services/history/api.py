@@ -1,5 +1,11 @@
 # Define all API here
-from core.services.history.initialization import initialize_history, generate_history_id
+from core.services.history.initialization import (
+    initialize_history,
+    initialize_histories,
+    generate_history_id,
+    get_history_events
+)
+from core.services.history.buffer import buffered_history
 from core.services.history.project import (
     record_project_creation, 
     record_project_update, 
@@ -8,7 +14,8 @@ from core.services.history.project import (
 from core.services.history.ppap import (
     record_ppap_creation, 
     record_ppap_update, 
-    record_ppap_level_change
+    record_ppap_level_change,
+    record_ppap_status_change
 )
 from core.services.history.phase import (
     record_phase_creation, 
@@ -77,7 +84,8 @@ from core.services.history.editor import (
     update_history_dates,
     set_entity_deadline,
     get_entity_deadline,
-    bulk_update_entity_deadlines
+    bulk_update_entity_deadlines,
+    set_history_deadlines
 )
 
 
@@ -85,7 +93,10 @@ from core.services.history.editor import (
 __all__ = [
     # Initialization
     'initialize_history',
+    'initialize_histories',
     'generate_history_id',
+    'get_history_events',
+    'buffered_history',
     
     # Project
     'record_project_creation',
@@ -96,6 +107,7 @@ __all__ = [
     'record_ppap_creation',
     'record_ppap_update',
     'record_ppap_level_change',
+    'record_ppap_status_change',
     
     # Phase
     'record_phase_creation',
@@ -164,5 +176,6 @@ __all__ = [
     'update_history_dates',
     'set_entity_deadline',
     'get_entity_deadline',
-    'bulk_update_entity_deadlines'
+    'bulk_update_entity_deadlines',
+    'set_history_deadlines'
 ]
@@ -0,0 +1,173 @@
+# Transaction-scoped history buffer
+import threading
+from contextlib import contextmanager
+from django.db import transaction
+from core.models import History, HistoryEvent
+from core.services.statistics.snapshots import project_ids_for_histories, bump_statistics_version_on_commit
+
+_local = threading.local()
+
+class HistoryBuffer:
+    """
+    Collects history writes made during a transaction and flushes them in bulk
+
+    New History rows, field updates on existing rows and appended events are
+    kept in memory. Several writes to the same history_id are coalesced into
+    one row, and everything is written with bulk_create/bulk_update when the
+    buffered block exits.
+
+    Every write is tagged with the savepoint it was made in, so writes made
+    inside a nested buffered_history block or a transaction.atomic savepoint
+    that rolled back are discarded at flush, like the rows they describe.
+    """
+
+    def __init__(self, using=None):
+        self.using = using
+        self.new_histories = {}
+        self.loaded_histories = {}
+        self.dirty_fields = {}
+        self.events = []
+        self.segment = None
+
+    def _segment(self):
+        """
+        Get the marker of the savepoint writes are currently made in
+
+        The marker is registered with transaction.on_commit, and Django
+        drops the callbacks of a savepoint when it rolls back, so a marker
+        missing from the pending callbacks means its writes were undone.
+        """
+        savepoint_ids = tuple(transaction.get_connection(self.using).savepoint_ids)
+        if self.segment is None or self.segment[0] != savepoint_ids:
+            marker = lambda: None
+            transaction.on_commit(marker, using=self.using)
+            self.segment = (savepoint_ids, marker)
+        return self.segment[1]
+
+    def _live_segments(self):
+        """Markers of the savepoints that did not roll back"""
+        connection = transaction.get_connection(self.using)
+        return {id(func) for _, func, *_ in connection.run_on_commit}
+
+    def get(self, history_id):
+        """Return the buffered History for an ID, or None if not buffered"""
+        if history_id in self.new_histories:
+            history, marker = self.new_histories[history_id]
+            if id(marker) in self._live_segments():
+                return history
+            del self.new_histories[history_id]
+            return None
+        return self.loaded_histories.get(history_id)
+
+    def track(self, history):
+        """Keep a History loaded from the database so later writes reuse it"""
+        self.loaded_histories.setdefault(history.id, history)
+        return self.loaded_histories[history.id]
+
+    def add_history(self, history):
+        """Buffer a new History row"""
+        self.new_histories[history.id] = (history, self._segment())
+        return history
+
+    def add_event(self, history, event_type, event_details, timestamp):
+        """Buffer an event appended to a history record"""
+        self.events.append((history, self._segment(), HistoryEvent(
+            history_id=history.id,
+            type=event_type,
+            details=event_details,
+            timestamp=timestamp
+        )))
+
+    def mark_dirty(self, history, fields):
+        """Record that fields of an existing History row must be written"""
+        if history.id in self.new_histories:
+            return
+        self.track(history)
+        marker = self._segment()
+        self.dirty_fields.setdefault(history.id, {}).update((field, marker) for field in fields)
+
+    def flush(self):
+        """Write all buffered history with a handful of bulk statements"""
+        live = self._live_segments()
+        new_histories = {
+            history_id: history for history_id, (history, marker) in self.new_histories.items()
+            if id(marker) in live
+        }
+        dirty_fields = {}
+        for history_id, fields in self.dirty_fields.items():
+            fields = {field for field, marker in fields.items() if id(marker) in live}
+            if fields:
+                dirty_fields[history_id] = fields
+        # Events of a History row created in a rolled back savepoint go with it
+        events = [
+            (history, event) for history, marker, event in self.events
+            if id(marker) in live and (history.id not in self.new_histories or history.id in new_histories)
+        ]
+
+        with transaction.atomic(using=self.using):
+            if new_histories:
+                History.objects.using(self.using).bulk_create(new_histories.values())
+
+            # Group dirty rows by their set of changed fields so each row only
+            # overwrites the columns that were actually modified
+            rows_by_fields = {}
+            for history_id, fields in dirty_fields.items():
+                rows_by_fields.setdefault(frozenset(fields), []).append(self.loaded_histories[history_id])
+            for fields, rows in rows_by_fields.items():
+                History.objects.using(self.using).bulk_update(rows, sorted(fields))
+
+            if events:
+                HistoryEvent.objects.using(self.using).bulk_create([event for _, event in events])
+
+            # Bulk writes send no signals
+            changed = {history.id: history for history, _ in events}
+            changed.update(new_histories)
+            changed.update((history_id, self.loaded_histories[history_id]) for history_id in dirty_fields)
+            for project_id in project_ids_for_histories(changed.values()):
+                bump_statistics_version_on_commit(project_id)
+
+        self.new_histories = {}
+        self.loaded_histories = {}
+        self.dirty_fields = {}
+        self.events = []
+        self.segment = None
+
+def get_active_buffer():
+    """
+    Get the history buffer of the current thread
+
+    Returns:
+        HistoryBuffer or None: The active buffer, if any
+    """
+    return getattr(_local, 'buffer', None)
+
+@contextmanager
+def buffered_history(using=None):
+    """
+    Buffer every history write made inside the block
+
+    Opens a transaction and flushes the buffered history in bulk just
+    before the block exits normally, inside that transaction, so history
+    commits or rolls back with the rows it describes. Nested blocks join
+    the outermost buffer in a savepoint; if a nested block (or any
+    transaction.atomic savepoint inside the block) rolls back, the writes
+    buffered inside it are discarded. Can also be used as a decorator.
+
+    Note that rows written through the buffer are only visible to direct
+    History queries once the outermost block has exited; get_history
+    serves them from memory until then.
+    """
+    if get_active_buffer() is not None:
+        with transaction.atomic(using=using):
+            yield get_active_buffer()
+        return
+
+    buffer = HistoryBuffer(using=using)
+    _local.buffer = buffer
+    try:
+        with transaction.atomic(using=using):
+            yield buffer
+            # Only reached when the block did not raise
+            buffer.flush()
+    finally:
+        _local.buffer = None
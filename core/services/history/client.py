@@ -3,7 +3,8 @@ from django.utils import timezone
 import uuid
 import json
 from core.services.history.initialization import (
-    get_history, initialize_history, add_history_event, ensure_history_id
+    get_history, initialize_history, add_history_event, ensure_history_id,
+    save_history_fields
 )
 
 def record_client_creation(client):
@@ -75,7 +76,7 @@ def record_client_name_change(client, old_name, new_name):
     
     # Update the history title to reflect the new name
     history.title = new_name
-    history.save(update_fields=['title'])
+    save_history_fields(history, ['title'])
     
     return add_history_event(history, "name_change", event_details)
 
@@ -1,7 +1,8 @@
 from core.models import Contact
 from django.utils import timezone
 from core.services.history.initialization import (
-    get_history, initialize_history, add_history_event, ensure_history_id
+    get_history, initialize_history, add_history_event, ensure_history_id,
+    save_history_fields
 )
 
 def record_contact_creation(contact):
@@ -53,7 +54,7 @@ def record_contact_update(contact, updated_fields=None):
     
     # Make sure title stays updated with current email
     history.title = f"Contact {contact.email}"
-    history.save(update_fields=['title'])
+    save_history_fields(history, ['title'])
     
     return add_history_event(history, "update", event_details)
 
@@ -77,7 +78,7 @@ def record_contact_email_change(contact, old_email, new_email):
     
     # Update the title to reflect the new email
     history.title = f"Contact {new_email}"
-    history.save(update_fields=['title'])
+    save_history_fields(history, ['title'])
     
     # Add email change event
     event_details = f"Email changed from '{old_email}' to '{new_email}'"
@@ -1,7 +1,8 @@
 from core.models import Department
 from django.utils import timezone
 from core.services.history.initialization import (
-    get_history, initialize_history, add_history_event, ensure_history_id
+    get_history, initialize_history, add_history_event, ensure_history_id,
+    save_history_fields
 )
 
 def record_department_creation(department):
@@ -53,7 +54,7 @@ def record_department_update(department, updated_fields=None):
     
     # Make sure title stays updated with current name
     history.title = f"Department {department.name}"
-    history.save(update_fields=['title'])
+    save_history_fields(history, ['title'])
     
     return add_history_event(history, "update", event_details)
 
@@ -77,7 +78,7 @@ def record_department_name_change(department, old_name, new_name):
     
     # Update the title to reflect the new name
     history.title = f"Department {new_name}"
-    history.save(update_fields=['title'])
+    save_history_fields(history, ['title'])
     
     # Add name change event
     event_details = f"Department name changed from '{old_name}' to '{new_name}'"
@@ -2,7 +2,8 @@
 from core.models import Document
 from django.utils import timezone
 from core.services.history.initialization import (
-    get_history, initialize_history, add_history_event, ensure_history_id
+    get_history, initialize_history, add_history_event, ensure_history_id,
+    save_history_fields
 )
 
 def record_document_creation(document):
@@ -48,7 +49,7 @@ def record_document_update(document, updated_fields):
     
     # Make sure title stays updated with current name
     history.title = document.name
-    history.save(update_fields=['title'])
+    save_history_fields(history, ['title'])
     
     # Add update event
     event_details = f"Document updated: {', '.join(updated_fields)}"
@@ -75,7 +76,7 @@ def record_document_name_change(document, old_name, new_name):
     
     # Update the title to reflect the new name
     history.title = new_name
-    history.save(update_fields=['title'])
+    save_history_fields(history, ['title'])
     
     # Add name change event
     event_details = f"Document name changed from '{old_name}' to '{new_name}'"
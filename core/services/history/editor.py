@@ -1,6 +1,10 @@
-from core.models import History
+from core.models import History, HistoryEvent
+from core.services.statistics.snapshots import (
+    project_ids_for, project_ids_for_histories, bump_statistics_version_on_commit
+)
 from django.utils import timezone
 from django.db import transaction
+from django.core.exceptions import ValidationError
 import uuid
 
 def update_history_dates(history_id, deadline=None, started_at=None, completed_at=None):
@@ -20,7 +24,7 @@ def update_history_dates(history_id, deadline=None, started_at=None, completed_a
         History.DoesNotExist: If history record not found
     """
     # Get most recent history record with this ID
-    history = History.objects.filter(history_id=history_id).order_by('-created_at').first()
+    history = History.objects.filter(id=history_id).first()
     
     if not history:
         raise History.DoesNotExist(f"History with ID {history_id} not found")
@@ -77,7 +81,7 @@ def set_entity_deadline(entity, deadline, table_name=None):
     
     # Get current history record
     from core.services.history.initialization import get_history
-    history = get_history(entity, table_name)
+    history = get_history(entity)
     
     # Get current deadline for event recording
     old_deadline = history.deadline if history else None
@@ -126,15 +130,37 @@ def get_entity_deadline(entity, table_name=None):
     
     # Get current history record
     from core.services.history.initialization import get_history
-    history = get_history(entity, table_name)
+    history = get_history(entity)
     
     return history.deadline if history else None
 
+def _normalize_entity_ids(entity_ids, entity_class):
+    """
+    Convert entity IDs to the model's primary key type, dropping duplicates
+    
+    Returns:
+        tuple: (valid IDs in request order, IDs that are not valid keys)
+    """
+    pk_field = entity_class._meta.pk
+    valid_ids = []
+    invalid_ids = []
+    for entity_id in entity_ids:
+        try:
+            valid_ids.append(pk_field.to_python(entity_id))
+        except ValidationError:
+            invalid_ids.append(entity_id)
+    return list(dict.fromkeys(valid_ids)), invalid_ids
+
 @transaction.atomic
 def bulk_update_entity_deadlines(entity_ids, deadline, entity_class, table_name=None):
     """
     Update deadlines for multiple entities at once
     
+    Runs a constant number of queries whatever the number of entities: one
+    to resolve history IDs, one to read the previous deadlines, a single
+    UPDATE ... WHERE id IN (...) and one bulk INSERT of deadline_change
+    events.
+    
     Args:
         entity_ids (list): List of entity IDs
         deadline (datetime): Deadline to set
@@ -142,27 +168,123 @@ def bulk_update_entity_deadlines(entity_ids, deadline, entity_class, table_name=
         table_name (str, optional): Table name
         
     Returns:
-        dict: Results with count and updated entities
+        dict: Results with counts, updated entities and a per-entity result
     """
     if not table_name:
         table_name = entity_class.__name__.lower()
     
-    entities = entity_class.objects.filter(id__in=entity_ids)
-    updated = 0
-    failed = 0
-    updated_entities = []
+    valid_ids, invalid_ids = _normalize_entity_ids(entity_ids, entity_class)
     
-    for entity in entities:
-        try:
-            result = set_entity_deadline(entity, deadline, table_name)
-            updated += 1
-            updated_entities.append(result['entity'].id)
-        except Exception:
-            failed += 1
+    # Resolve every entity's history_id in one query
+    history_id_by_entity = dict(
+        entity_class.objects.filter(pk__in=valid_ids).values_list('pk', 'history_id')
+    )
+    
+    # Read previous deadlines for the event details
+    old_deadlines = dict(
+        History.objects.filter(id__in=[
+            history_id for history_id in history_id_by_entity.values() if history_id
+        ]).values_list('id', 'deadline')
+    )
+    
+    # One set-based UPDATE for all history rows
+    if old_deadlines:
+        History.objects.filter(id__in=list(old_deadlines)).update(deadline=deadline)
+    
+    # One bulk INSERT of deadline_change events
+    now = timezone.now()
+    new_date = deadline.strftime("%Y-%m-%d") if deadline else "None"
+    events = []
+    results = [
+        {'entity_id': entity_id, 'success': False, 'error': "Invalid ID"} for entity_id in invalid_ids
+    ]
+    
+    for entity_id in valid_ids:
+        history_id = history_id_by_entity.get(entity_id)
+        
+        if entity_id not in history_id_by_entity:
+            results.append({'entity_id': entity_id, 'success': False, 'error': f"{table_name.capitalize()} not found"})
+            continue
+        if history_id not in old_deadlines:
+            results.append({'entity_id': entity_id, 'success': False, 'error': "History record not found"})
+            continue
+        
+        old_deadline = old_deadlines[history_id]
+        old_date = old_deadline.strftime("%Y-%m-%d") if old_deadline else "None"
+        events.append(HistoryEvent(
+            history_id=history_id,
+            type="deadline_change",
+            details=f"{table_name.capitalize()} deadline changed from {old_date} to {new_date}",
+            timestamp=now
+        ))
+        results.append({
+            'entity_id': entity_id,
+            'success': True,
+            'history_id': history_id,
+            'old_deadline': old_deadline.isoformat() if old_deadline else None
+        })
+    
+    if events:
+        HistoryEvent.objects.bulk_create(events)
+    
+    # The UPDATE sends no signals
+    for project_id in project_ids_for(table_name, history_id_by_entity):
+        bump_statistics_version_on_commit(project_id)
+    
+    updated_entities = [result['entity_id'] for result in results if result['success']]
     
     return {
-        'updated_count': updated,
-        'failed_count': failed,
+        'updated_count': len(updated_entities),
+        'failed_count': len(results) - len(updated_entities),
         'total': len(entity_ids),
-        'updated_entities': updated_entities
-    }
\ No newline at end of file
+        'updated_entities': updated_entities,
+        'results': results
+    }
+
+def set_history_deadlines(deadlines_by_history_id, batch_size=500):
+    """
+    Write deadlines to many history records and record their changes
+    
+    Runs a constant number of statements per batch: one query to read the
+    records, a bulk UPDATE of the changed deadlines and a bulk INSERT of
+    one deadline_change event per changed record, so incremental readers
+    of history events see every move.
+    
+    Args:
+        deadlines_by_history_id (dict): {history ID: new deadline}
+        batch_size (int, optional): Rows per UPDATE/INSERT statement
+        
+    Returns:
+        dict: {history ID: previous deadline} of the records that changed
+    """
+    histories = list(History.objects.filter(id__in=list(deadlines_by_history_id)))
+    now = timezone.now()
+    changed = []
+    events = []
+    old_deadlines = {}
+    
+    for history in histories:
+        deadline = deadlines_by_history_id[history.id]
+        if history.deadline == deadline:
+            continue
+        
+        old_date = history.deadline.strftime("%Y-%m-%d") if history.deadline else "None"
+        new_date = deadline.strftime("%Y-%m-%d") if deadline else "None"
+        events.append(HistoryEvent(
+            history_id=history.id,
+            type="deadline_change",
+            details=f"{(history.table_name or 'entity').capitalize()} deadline changed from {old_date} to {new_date}",
+            timestamp=now
+        ))
+        old_deadlines[history.id] = history.deadline
+        history.deadline = deadline
+        changed.append(history)
+    
+    History.objects.bulk_update(changed, ['deadline'], batch_size=batch_size)
+    HistoryEvent.objects.bulk_create(events, batch_size=batch_size)
+    
+    # Bulk writes send no signals
+    for project_id in project_ids_for_histories(changed):
+        bump_statistics_version_on_commit(project_id)
+    
+    return old_deadlines
@@ -1,7 +1,8 @@
 import uuid
 import json
-from core.models import History
+from core.models import History, HistoryEvent
 from django.utils import timezone
+from core.services.history.buffer import get_active_buffer
 
 def generate_history_id(table_name):
     """
@@ -11,7 +12,7 @@ def generate_history_id(table_name):
 
 def initialize_history(title, event_type, event_details, table_name, history_id=None):
     """
-    Initialize a history record with events stored as JSON
+    Initialize a history record and its first event
     
     Args:
         title (str): History title
@@ -26,28 +27,90 @@ def initialize_history(title, event_type, event_details, table_name, history_id=
     if not history_id:
         history_id = generate_history_id(table_name)
     
-    # Create initial event as a list with one item
-    now = timezone.now().isoformat()
-    initial_event = [{
-        "type": event_type,
-        "details": event_details,
-        "timestamp": now
-    }]
+    now = timezone.now()
     
-    # Store events as JSON string
-    history = History.objects.create(
+    # Events live in the append-only history_event table; the legacy
+    # event column is kept as an empty JSON list
+    history = History(
         id=history_id,
         title=title,
-        event=json.dumps(initial_event),
+        event='[]',
         table_name=table_name,
-        started_at=timezone.now() if event_type == 'create' else None
+        started_at=now if event_type == 'create' else None
+    )
+    
+    buffer = get_active_buffer()
+    if buffer is not None:
+        buffer.add_history(history)
+        buffer.add_event(history, event_type, event_details, now)
+        return history
+    
+    history.save(force_insert=True)
+    HistoryEvent.objects.create(
+        history_id=history.id,
+        type=event_type,
+        details=event_details,
+        timestamp=now
     )
     
     return history
 
+def initialize_histories(entries):
+    """
+    Initialize several history records and their first events at once
+
+    Inside buffered_history() the records join the buffer; otherwise they
+    are written with one bulk insert for the records and one for the events.
+
+    Args:
+        entries (list): Dicts with the arguments of initialize_history
+            (title, event_type, event_details, table_name, history_id)
+
+    Returns:
+        list: Created history records
+    """
+    now = timezone.now()
+    histories = []
+    events = []
+
+    for entry in entries:
+        event_type = entry['event_type']
+        history = History(
+            id=entry.get('history_id') or generate_history_id(entry['table_name']),
+            title=entry['title'],
+            event='[]',
+            table_name=entry['table_name'],
+            started_at=now if event_type == 'create' else None
+        )
+        histories.append(history)
+        events.append((history, event_type, entry['event_details']))
+
+    buffer = get_active_buffer()
+    if buffer is not None:
+        for history, event_type, event_details in events:
+            buffer.add_history(history)
+            buffer.add_event(history, event_type, event_details, now)
+        return histories
+
+    History.objects.bulk_create(histories)
+    HistoryEvent.objects.bulk_create([
+        HistoryEvent(
+            history_id=history.id,
+            type=event_type,
+            details=event_details,
+            timestamp=now
+        )
+        for history, event_type, event_details in events
+    ])
+
+    return histories
+
 def add_history_event(history, event_type, event_details):
     """
-    Add a new event to an existing history record
+    Append a new event to an existing history record
+    
+    The event is a single INSERT into history_event; only the date columns
+    affected by the event type are updated on the history row.
     
     Args:
         history (History): Existing history record
@@ -57,54 +120,137 @@ def add_history_event(history, event_type, event_details):
     Returns:
         History: Updated history record
     """
-    # Parse existing events
-    try:
-        existing_events = json.loads(history.event)
-    except (json.JSONDecodeError, TypeError):
-        # If existing event isn't valid JSON, start a new event list
-        existing_events = []
-    
-    # Ensure existing_events is a list
-    if not isinstance(existing_events, list):
-        existing_events = []
-    
-    # Create new event
     now = timezone.now()
-    new_event = {
-        "type": event_type,
-        "details": event_details,
-        "timestamp": now.isoformat()
-    }
+    buffer = get_active_buffer()
     
-    # Add new event to the list
-    existing_events.append(new_event)
-    
-    # Update history record
-    history.event = json.dumps(existing_events)
+    if buffer is not None:
+        buffer.add_event(history, event_type, event_details, now)
+    else:
+        HistoryEvent.objects.create(
+            history_id=history.id,
+            type=event_type,
+            details=event_details,
+            timestamp=now
+        )
     
     # Update appropriate timestamp fields based on event type
+    update_fields = []
     if event_type == 'create' and not history.started_at:
         history.started_at = now
+        update_fields.append('started_at')
     elif event_type == 'update':
         history.updated_at = now
-    elif event_type in ['complete', 'approve', 'finalize']:
-        history.finished_at = now
-    elif event_type == 'delete':
-        history.finished_at = now
-    
-    # Save history with updated fields
-    update_fields = ['event']
-    if event_type == 'create' and not history.started_at:
-        update_fields.append('started_at')
-    if history.updated_at:
         update_fields.append('updated_at')
-    if history.finished_at:
+    elif event_type in ['complete', 'approve', 'finalize', 'delete']:
+        history.finished_at = now
         update_fields.append('finished_at')
     
-    history.save(update_fields=update_fields)
+    if update_fields:
+        save_history_fields(history, update_fields)
     
     return history
 
+def save_history_fields(history, fields):
+    """
+    Persist some fields of an existing history record
+    
+    Inside buffered_history() the change is queued and coalesced with other
+    writes to the same record; otherwise it is written immediately.
+    
+    Args:
+        history (History): History record
+        fields (list): Names of the fields to persist
+    """
+    buffer = get_active_buffer()
+    if buffer is not None:
+        buffer.mark_dirty(history, fields)
+        return
+    
+    history.save(update_fields=fields)
+
+def parse_legacy_events(event_blob, table_name=None, created_at=None):
+    """
+    Parse a legacy History.event JSON blob into a list of events
+    
+    Args:
+        event_blob (str): Content of the legacy event column
+        table_name (str, optional): Table name used as fallback event type
+        created_at (datetime, optional): Timestamp used for non-list blobs
+        
+    Returns:
+        list: Event dicts (empty if the blob holds no events)
+    """
+    if not event_blob:
+        return []
+    
+    try:
+        event_data = json.loads(event_blob)
+    except (json.JSONDecodeError, TypeError):
+        event_data = None
+    
+    if isinstance(event_data, list):
+        return event_data
+    
+    return [{
+        "type": table_name or 'action',
+        "details": str(event_blob),
+        "timestamp": created_at.isoformat() if hasattr(created_at, 'isoformat') else created_at
+    }]
+
+def get_events_for_histories(history_ids):
+    """
+    Load the events of several history records in one query
+    
+    Args:
+        history_ids (iterable): History IDs
+        
+    Returns:
+        dict: Mapping of history ID to its ordered list of event dicts
+    """
+    events_by_history = {}
+    history_ids = list(history_ids)
+    if not history_ids:
+        return events_by_history
+    
+    rows = HistoryEvent.objects.filter(history_id__in=history_ids).order_by(
+        'history_id', 'id'
+    ).values_list('history_id', 'type', 'details', 'timestamp')
+    
+    for history_id, event_type, details, timestamp in rows:
+        events_by_history.setdefault(history_id, []).append({
+            "type": event_type,
+            "details": details,
+            "timestamp": timestamp.isoformat()
+        })
+    
+    return events_by_history
+
+def get_history_events(history):
+    """
+    Get all events of a history record, legacy blob events first
+    
+    Events prefetched with prefetch_related('history_events') are used
+    as they are, without another query.
+    
+    Args:
+        history (History): History record
+        
+    Returns:
+        list: Ordered list of event dicts
+    """
+    legacy_events = parse_legacy_events(history.event, history.table_name, history.created_at)
+    prefetched = getattr(history, '_prefetched_objects_cache', {}).get('history_events')
+    if prefetched is None:
+        return legacy_events + get_events_for_histories([history.id]).get(history.id, [])
+    
+    return legacy_events + [
+        {
+            "type": event.type,
+            "details": event.details,
+            "timestamp": event.timestamp.isoformat()
+        } for event in sorted(prefetched, key=lambda event: event.id)
+    ]
+
 def get_history(model_instance):
     """
     Get existing history record for a model instance
@@ -119,11 +265,18 @@ def get_history(model_instance):
     if not hasattr(model_instance, 'history_id') or not model_instance.history_id:
         return None
     
+    # Serve records written or loaded earlier in a buffered transaction
+    buffer = get_active_buffer()
+    if buffer is not None and buffer.get(model_instance.history_id):
+        return buffer.get(model_instance.history_id)
+    
     # Try to get existing history
     try:
-        return History.objects.get(id=model_instance.history_id)
+        history = History.objects.get(id=model_instance.history_id)
     except History.DoesNotExist:
         return None
+    
+    return buffer.track(history) if buffer is not None else history
 
 def ensure_history_id(model_instance):
     """
@@ -1,53 +1,203 @@
 from core.models import History, Project, PPAP, Phase, Output, Document, Team, Person, User
-import json
+from core.services.history.initialization import get_events_for_histories, parse_legacy_events
 
 def process_history_records(history_records):
-    """Helper function to process history records and parse event JSON"""
+    """
+    Helper function to attach parsed events to history records
+    
+    Events are read from both the legacy JSON blob (rows not yet migrated)
+    and the history_event table, which is loaded with a single query.
+    """
     processed_records = []
+    events_by_history = get_events_for_histories(
+        record['id'] for record in history_records if record.get('id')
+    )
     
     for record in history_records:
         # Create a mutable copy of the record
         processed_record = dict(record)
         
-        # Try to parse the event field as JSON
-        if 'event' in processed_record and processed_record['event']:
-            try:
-                # Parse the JSON string into a Python object
-                event_data = json.loads(processed_record['event'])
-                
-                # If it's already a list of events, use it
-                if isinstance(event_data, list):
-                    processed_record['events'] = event_data
-                else:
-                    # If it's not a list, create a single event entry
-                    processed_record['events'] = [{
-                        "type": processed_record.get('table_name', 'action'),
-                        "details": str(processed_record['event']),
-                        "timestamp": processed_record.get('created_at')
-                    }]
-            except (json.JSONDecodeError, TypeError):
-                # If not valid JSON, create a single event entry
-                processed_record['events'] = [{
-                    "type": processed_record.get('table_name', 'action'),
-                    "details": str(processed_record['event']),
-                    "timestamp": processed_record.get('created_at')
-                }]
-        else:
-            # If no event field, create a placeholder event
-            processed_record['events'] = [{
+        events = parse_legacy_events(
+            processed_record.pop('event', None),
+            processed_record.get('table_name', 'action'),
+            processed_record.get('created_at')
+        )
+        events.extend(events_by_history.get(processed_record.get('id'), []))
+        
+        if not events:
+            # If no events were recorded, create a placeholder event
+            events = [{
                 "type": processed_record.get('table_name', 'action'),
                 "details": "No details available",
                 "timestamp": processed_record.get('created_at')
             }]
         
-        # Remove the original event field to avoid confusion
-        if 'event' in processed_record:
-            del processed_record['event']
-        
+        processed_record['events'] = events
         processed_records.append(processed_record)
     
     return processed_records
 
+def load_nested_projects_history(projects):
+    """
+    Build the nested history of several projects with a fixed number of queries
+    
+    The project tree (phases, outputs, documents, team members and users) is
+    loaded with one query per level, every referenced History row is fetched
+    with a single id__in query and the nested dicts are assembled in memory.
+    The query count does not depend on the number of projects, phases,
+    outputs or documents.
+    
+    Args:
+        projects (iterable): Project instances, ideally fetched with
+            select_related('ppap', 'team')
+        
+    Returns:
+        dict: Mapping of project ID to its nested history
+    """
+    projects = list(projects)
+    if not projects:
+        return {}
+    
+    ppap_ids = [project.ppap.id for project in projects if project.ppap]
+    team_ids = {project.team_id for project in projects}
+    
+    # Load the whole project tree, one query per level
+    phases = list(Phase.objects.filter(ppap_id__in=ppap_ids).select_related('template'))
+    outputs = list(Output.objects.filter(phase__ppap_id__in=ppap_ids).select_related('template'))
+    documents = list(Document.objects.filter(output__phase__ppap_id__in=ppap_ids))
+    memberships = list(
+        Person.teams.through.objects.filter(team_id__in=team_ids)
+        .select_related('person')
+        .order_by('person__last_name', 'person__first_name')
+    )
+    users = list(
+        User.objects.filter(person_id__in={membership.person_id for membership in memberships})
+        .select_related('person')
+    )
+    
+    # Fetch every History row of the tree at once
+    history_ids = set()
+    for project in projects:
+        history_ids.add(project.history_id)
+        history_ids.add(project.team.history_id)
+        if project.ppap:
+            history_ids.add(project.ppap.history_id)
+    history_ids.update(item.history_id for item in phases + outputs + documents)
+    history_ids.update(membership.person.history_id for membership in memberships)
+    history_ids.discard(None)
+    history_ids.discard('')
+    
+    history_by_id = {}
+    for record in process_history_records(list(History.objects.filter(id__in=history_ids).values())):
+        history_by_id.setdefault(record['id'], []).append(record)
+    
+    def history_for(history_id):
+        return history_by_id.get(history_id, []) if history_id else []
+    
+    # Group children by parent in memory, keeping each queryset's ordering
+    phases_by_ppap = {}
+    for phase in phases:
+        phases_by_ppap.setdefault(phase.ppap_id, []).append(phase)
+    outputs_by_phase = {}
+    for output in outputs:
+        outputs_by_phase.setdefault(output.phase_id, []).append(output)
+    documents_by_output = {}
+    for doc in documents:
+        documents_by_output.setdefault(doc.output_id, []).append(doc)
+    members_by_team = {}
+    for membership in memberships:
+        members_by_team.setdefault(membership.team_id, []).append(membership.person)
+    users_by_person = {}
+    for user in users:
+        users_by_person.setdefault(user.person_id, []).append(user)
+    
+    results = {}
+    for project in projects:
+        nested_history = {
+            "project": history_for(project.history_id),
+            "ppap": {"history": [], "phases": {}},
+            "team": {"history": history_for(project.team.history_id), "persons": {}},
+            "users": []
+        }
+        
+        if project.ppap:
+            nested_history["ppap"]["history"] = history_for(project.ppap.history_id)
+            
+            for phase in phases_by_ppap.get(project.ppap.id, []):
+                phase_outputs = {}
+                
+                for output in outputs_by_phase.get(phase.id, []):
+                    phase_outputs[output.id] = {
+                        "name": output.template.name,
+                        "history": history_for(output.history_id),
+                        "documents": {
+                            doc.id: {
+                                "name": doc.name or f"Document {doc.id}",
+                                "history": history_for(doc.history_id)
+                            } for doc in documents_by_output.get(output.id, [])
+                        }
+                    }
+                
+                nested_history["ppap"]["phases"][phase.id] = {
+                    "name": phase.template.name,
+                    "history": history_for(phase.history_id),
+                    "outputs": phase_outputs
+                }
+        
+        team_members = members_by_team.get(project.team_id, [])
+        for member in team_members:
+            nested_history["team"]["persons"][member.id] = {
+                "name": f"{member.first_name} {member.last_name}",
+                "history": history_for(member.history_id)
+            }
+        
+        # Get user history for team members who are users
+        team_users = [user for member in team_members for user in users_by_person.get(member.id, [])]
+        for user in sorted(team_users, key=lambda user: user.username):
+            nested_history["users"].append({
+                "id": user.id,
+                "username": user.username,
+                "history": history_for(user.person.history_id)
+            })
+        
+        results[project.id] = nested_history
+    
+    return results
+
+def iter_nested_projects_history(projects=None, batch_size=50, after_id=None):
+    """
+    Lazily yield the nested history of many projects
+    
+    Projects are walked in descending ID order with keyset pagination, so
+    only one batch of projects and their history trees is held in memory
+    at a time regardless of how many projects are exported.
+    
+    Args:
+        projects (QuerySet, optional): Projects to export, defaults to all
+        batch_size (int): Number of projects loaded per batch
+        after_id (int, optional): Only yield projects with an ID below this
+            value, used to resume an interrupted export
+        
+    Yields:
+        tuple: (Project, nested history dict)
+    """
+    if projects is None:
+        projects = Project.objects.all()
+    projects = projects.select_related('ppap', 'team').order_by('-id')
+    
+    last_id = after_id
+    while True:
+        batch_query = projects if last_id is None else projects.filter(id__lt=last_id)
+        batch = list(batch_query[:batch_size].iterator(chunk_size=batch_size))
+        if not batch:
+            return
+        
+        nested_histories = load_nested_projects_history(batch)
+        for project in batch:
+            yield project, nested_histories[project.id]
+        
+        last_id = batch[-1].id
+
 def get_nested_project_history(project_id):
     """
     Safely retrieves hierarchical history for a project
@@ -61,116 +211,15 @@ def get_nested_project_history(project_id):
     try:
         # Try to get the project
         try:
-            project = Project.objects.get(id=project_id)
+            project = Project.objects.select_related('ppap', 'team').get(id=project_id)
         except Project.DoesNotExist:
             return {"error": f"Project with ID {project_id} not found"}
         except Exception as e:
             return {"error": f"Error retrieving project {project_id}: {str(e)}"}
         
-        # Initialize nested structure first
-        nested_history = {
-            "project": [],
-            "ppap": {"history": [], "phases": {}},
-            "team": {"history": [], "persons": {}},
-            "users": []
-        }
-        
-        # Get direct project history
-        try:
-            if project.history_id:
-                raw_project_history = list(History.objects.filter(id__startswith=project.history_id).values())
-                project_history = process_history_records(raw_project_history)
-                nested_history["project"] = project_history
-        except Exception as e:
-            print(f"Error getting project history for {project_id}: {str(e)}")
-        
-        # Get PPAP history if exists
-        try:
-            if hasattr(project, 'ppap') and project.ppap:
-                raw_ppap_history = list(History.objects.filter(id__startswith=project.ppap.history_id).values())
-                ppap_history = process_history_records(raw_ppap_history)
-                nested_history["ppap"]["history"] = ppap_history
-                
-                # Get related phases
-                phases = Phase.objects.filter(ppap_id=project.ppap.id).select_related('template')
-                for phase in phases:
-                    raw_phase_history = list(History.objects.filter(id__startswith=phase.history_id).values())
-                    phase_history = process_history_records(raw_phase_history)
-                    
-                    nested_history["ppap"]["phases"][phase.id] = {
-                        "name": phase.template.name,  # Use phase.template.name
-                        "history": phase_history,
-                        "outputs": {}
-                    }
-                    
-                    # Get related outputs
-                    outputs = Output.objects.filter(phase_id=phase.id).select_related('template')
-                    for output in outputs:
-                        raw_output_history = list(History.objects.filter(id__startswith=output.history_id).values())
-                        output_history = process_history_records(raw_output_history)
-                        
-                        nested_history["ppap"]["phases"][phase.id]["outputs"][output.id] = {
-                            "name": output.template.name,  # Use output.template.name 
-                            "history": output_history,
-                            "documents": {}
-                        }
-                        
-                        # Get related documents
-                        documents = Document.objects.filter(output_id=output.id)
-                        for doc in documents:
-                            raw_doc_history = list(History.objects.filter(id__startswith=doc.history_id).values())
-                            doc_history = process_history_records(raw_doc_history)
-                            
-                            # Make sure to use the appropriate field for document name
-                            doc_name = doc.name if hasattr(doc, 'name') else (
-                                doc.filename if hasattr(doc, 'filename') else f"Document {doc.id}"
-                            )
-                            
-                            nested_history["ppap"]["phases"][phase.id]["outputs"][output.id]["documents"][doc.id] = {
-                                "name": doc_name,
-                                "history": doc_history
-                            }
-        except Exception as e:
-            print(f"Error getting PPAP history for {project_id}: {str(e)}")
-        
-        # Get team history
-        try:
-            team = project.team
-            raw_team_history = list(History.objects.filter(id__startswith=team.history_id).values())
-            team_history = process_history_records(raw_team_history)
-            nested_history["team"]["history"] = team_history
-            
-            # Get person history for team members
-            team_members = Person.objects.filter(teams=team) if team else []
-            for member in team_members:
-                raw_person_history = list(History.objects.filter(id__startswith=member.history_id).values())
-                person_history = process_history_records(raw_person_history)
-                
-                nested_history["team"]["persons"][member.id] = {
-                    "name": f"{member.first_name} {member.last_name}",
-                    "history": person_history
-                }
-        except Exception as e:
-            print(f"Error getting team history for {project_id}: {str(e)}")
-        
-        # Get user history for team members who are users
-        try:
-            users = User.objects.filter(person__in=team_members)
-            for user in users:
-                raw_user_history = list(History.objects.filter(id__startswith=user.person.history_id).values())
-                user_history = process_history_records(raw_user_history)
-                
-                nested_history["users"].append({
-                    "id": user.id,
-                    "username": user.username,
-                    "history": user_history
-                })
-        except Exception as e:
-            print(f"Error getting user history for {project_id}: {str(e)}")
-        
-        return nested_history
+        return load_nested_projects_history([project])[project.id]
         
     except Exception as e:
         import traceback
         traceback.print_exc()
-        return {"error": f"Unexpected error processing project {project_id}: {str(e)}"}
\ No newline at end of file
+        return {"error": f"Unexpected error processing project {project_id}: {str(e)}"}
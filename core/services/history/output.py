@@ -2,7 +2,8 @@
 from core.models import Output
 from django.utils import timezone
 from core.services.history.initialization import (
-    get_history, initialize_history, add_history_event, ensure_history_id
+    get_history, initialize_history, add_history_event, ensure_history_id,
+    save_history_fields
 )
 
 def record_output_creation(output):
@@ -48,7 +49,7 @@ def record_output_update(output, updated_fields):
         
     # Make sure title stays updated
     history.title = f"{output.template.name} for Phase {output.phase_id}"
-    history.save(update_fields=['title'])
+    save_history_fields(history, ['title'])
     
     # Add update event
     event_details = f"Output updated: {', '.join(updated_fields)}"
@@ -75,7 +76,7 @@ def record_output_status_change(output, old_status, new_status):
         
     # Make sure title stays updated
     history.title = f"{output.template.name} for Phase {output.phase_id}"
-    history.save(update_fields=['title'])
+    save_history_fields(history, ['title'])
     
     # Add status change event
     event_details = f"Output status changed from {old_status} to {new_status}"
@@ -110,7 +111,7 @@ def record_output_document_upload(output, document):
         
     # Make sure title stays updated
     history.title = f"{output.template.name} for Phase {output.phase_id}"
-    history.save(update_fields=['title'])
+    save_history_fields(history, ['title'])
     
     # Add document upload event
     event_details = f"Document '{document.name}' (version {document.version}) uploaded"
@@ -137,7 +138,7 @@ def record_output_responsibility_change(output, old_user_id, new_user_id):
         
     # Make sure title stays updated
     history.title = f"{output.template.name} for Phase {output.phase_id}"
-    history.save(update_fields=['title'])
+    save_history_fields(history, ['title'])
     
     # Format user IDs for display
     old_username = "None" if not old_user_id else f"User {old_user_id}"
@@ -174,7 +175,7 @@ def record_output_deletion(output):
         
     # Make sure title stays updated
     history.title = f"{output.template.name} for Phase {output.phase_id}"
-    history.save(update_fields=['title'])
+    save_history_fields(history, ['title'])
     
     # Add deletion event
     event_details = f"Output deleted with ID {output.id}"
@@ -202,7 +203,7 @@ def record_output_review(output, review_status, reviewer_id=None, comments=None)
         
     # Make sure title stays updated
     history.title = f"{output.template.name} for Phase {output.phase_id}"
-    history.save(update_fields=['title'])
+    save_history_fields(history, ['title'])
     
     # Create event details
     reviewer_info = f" by User {reviewer_id}" if reviewer_id else ""
@@ -244,7 +245,7 @@ def record_output_deadline_change(output, old_deadline, new_deadline):
     
     # Update history deadline field
     history.deadline = new_deadline
-    history.save(update_fields=['title', 'deadline'])
+    save_history_fields(history, ['title', 'deadline'])
     
     # Format deadlines for display
     old_date = old_deadline.strftime("%Y-%m-%d") if old_deadline else "None"
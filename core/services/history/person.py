@@ -1,7 +1,8 @@
 from core.models import Person
 from django.utils import timezone
 from core.services.history.initialization import (
-    get_history, initialize_history, add_history_event, ensure_history_id
+    get_history, initialize_history, add_history_event, ensure_history_id,
+    save_history_fields
 )
 
 def record_person_creation(person):
@@ -47,7 +48,7 @@ def record_person_update(person, updated_fields):
     
     # Make sure title stays updated with current name
     history.title = f"{person.first_name} {person.last_name}"
-    history.save(update_fields=['title'])
+    save_history_fields(history, ['title'])
     
     # Add update event
     event_details = f"Person updated. Fields changed: {', '.join(updated_fields)}"
@@ -76,7 +77,7 @@ def record_person_name_change(person, old_first_name, old_last_name, new_first_n
     
     # Update the title to reflect the new name
     history.title = f"{new_first_name} {new_last_name}"
-    history.save(update_fields=['title'])
+    save_history_fields(history, ['title'])
     
     # Add name change event
     old_full_name = f"{old_first_name} {old_last_name}"
@@ -4,7 +4,8 @@ from django.utils import timezone
 import uuid
 import json
 from core.services.history.initialization import (
-    get_history, initialize_history, add_history_event, ensure_history_id
+    get_history, initialize_history, add_history_event, ensure_history_id,
+    save_history_fields
 )
 
 def record_phase_creation(phase):
@@ -48,7 +49,7 @@ def record_phase_update(phase, updated_fields=None):
     
     # Make sure title stays updated
     history.title = f"{phase.template.name} for PPAP {phase.ppap_id}"
-    history.save(update_fields=['title'])
+    save_history_fields(history, ['title'])
     
     # Add update event
     if updated_fields:
@@ -200,7 +201,7 @@ def record_phase_deadline_change(phase, old_deadline, new_deadline):
     event_details = f"Phase deadline changed from {old_date} to {new_date}"
     
     # Save the history with the deadline update
-    history.save(update_fields=['deadline'])
+    save_history_fields(history, ['deadline'])
     
     return add_history_event(history, "deadline_change", event_details)
 
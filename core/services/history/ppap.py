@@ -2,7 +2,8 @@
 from core.models import PPAP
 from django.utils import timezone
 from core.services.history.initialization import (
-    get_history, initialize_history, add_history_event, ensure_history_id
+    get_history, initialize_history, add_history_event, ensure_history_id,
+    save_history_fields
 )
 
 def record_ppap_creation(ppap):
@@ -48,7 +49,7 @@ def record_ppap_update(ppap, updated_fields):
     
     # Make sure title stays updated
     history.title = f"PPAP for Project {ppap.project_id}"
-    history.save(update_fields=['title'])
+    save_history_fields(history, ['title'])
     
     # Add update event
     event_details = f"PPAP updated: {', '.join(updated_fields)}"
@@ -224,7 +225,7 @@ def record_ppap_deadline_change(ppap, old_deadline, new_deadline):
     event_details = f"PPAP deadline changed from {old_date} to {new_date}"
     
     # Save the history with the deadline update
-    history.save(update_fields=['deadline'])
+    save_history_fields(history, ['deadline'])
     
     return add_history_event(history, "deadline_change", event_details)
 
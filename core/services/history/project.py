@@ -2,7 +2,8 @@
 from core.models import Project
 from django.utils import timezone
 from core.services.history.initialization import (
-    get_history, initialize_history, add_history_event, ensure_history_id
+    get_history, initialize_history, add_history_event, ensure_history_id,
+    save_history_fields
 )
 
 def record_project_creation(project):
@@ -48,7 +49,7 @@ def record_project_update(project, updated_fields):
     
     # Make sure title stays updated
     history.title = project.name
-    history.save(update_fields=['title'])
+    save_history_fields(history, ['title'])
     
     # Add update event
     event_details = f"Project updated: {', '.join(updated_fields)}"
@@ -75,7 +76,7 @@ def record_project_name_change(project, old_name, new_name):
     
     # Update the title to reflect the new name
     history.title = new_name
-    history.save(update_fields=['title'])
+    save_history_fields(history, ['title'])
     
     # Add name change event
     event_details = f"Project name changed from '{old_name}' to '{new_name}'"
@@ -236,7 +237,7 @@ def record_project_deadline_change(project, old_deadline, new_deadline):
     event_details = f"Project deadline changed from {old_date} to {new_date}"
     
     # Save the history with the deadline update
-    history.save(update_fields=['deadline'])
+    save_history_fields(history, ['deadline'])
     
     return add_history_event(history, "deadline_change", event_details)
 
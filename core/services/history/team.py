@@ -1,7 +1,8 @@
 from core.models import Team
 from django.utils import timezone
 from core.services.history.initialization import (
-    get_history, initialize_history, add_history_event, ensure_history_id
+    get_history, initialize_history, add_history_event, ensure_history_id,
+    save_history_fields
 )
 
 def record_team_creation(team):
@@ -47,7 +48,7 @@ def record_team_update(team, updated_fields):
     
     # Make sure title stays updated
     history.title = team.name
-    history.save(update_fields=['title'])
+    save_history_fields(history, ['title'])
     
     # Add update event
     event_details = f"Team updated. Fields changed: {', '.join(updated_fields)}"
@@ -74,7 +75,7 @@ def record_team_name_change(team, old_name, new_name):
     
     # Update the title to reflect the new name
     history.title = new_name
-    history.save(update_fields=['title'])
+    save_history_fields(history, ['title'])
     
     # Add name change event
     event_details = f"Team name changed from '{old_name}' to '{new_name}'"
@@ -2,7 +2,8 @@
 from core.models import User
 from django.utils import timezone
 from core.services.history.initialization import (
-    get_history, initialize_history, add_history_event, ensure_history_id
+    get_history, initialize_history, add_history_event, ensure_history_id,
+    save_history_fields
 )
 
 def record_user_creation(user):
@@ -48,7 +49,7 @@ def record_user_update(user, updated_fields):
     
     # Make sure title stays updated
     history.title = user.username
-    history.save(update_fields=['title'])
+    save_history_fields(history, ['title'])
     
     # Add update event
     event_details = f"User updated: {', '.join(updated_fields)}"
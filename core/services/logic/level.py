@@ -1,20 +1,15 @@
 # Define level logic to only display to the user what he needs base on the level
 from core.models import PPAP, Phase, Output, PPAPElement
+from core.services.template.plan import get_template_plan
 
 def filter_outputs_by_level(ppap_level):
     """
     Filter outputs based on PPAP level
-    """
-    # Get PPAP elements for this level
-    elements = PPAPElement.objects.filter(level__contains=str(ppap_level))
-    
-    # Get output templates for these elements
-    output_templates = []
-    for element in elements:
-        templates = element.output_templates.all()
-        output_templates.extend(templates)
     
-    return output_templates
+    Returns the output templates required at the level, in phase order,
+    as listed by the cached template plan.
+    """
+    return get_template_plan(ppap_level).output_templates
 
 def get_visible_outputs_for_user(user, ppap_id):
     """
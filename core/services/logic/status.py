@@ -1,4 +1,5 @@
 # Status changes logic (workflow to change status (we will stup the logic later)
+from django.db import transaction
 from core.models import Project, PPAP, Phase, Output
 from core.services.history.api import (
     record_project_update,
@@ -6,7 +7,15 @@ from core.services.history.api import (
     record_phase_status_change,
     record_output_status_change
 )
+from core.services.project.rollup import (
+    COMPLETED_STATUSES,
+    rollup_project_activity,
+    rollup_phase_status_change,
+    rollup_output_status_change
+)
+from core.services.analyse.durations import refresh_durations_on_commit
 
+@transaction.atomic
 def change_project_status(project_id, new_status, user_id):
     """
     Change project status with workflow validation
@@ -33,9 +42,11 @@ def change_project_status(project_id, new_status, user_id):
     
     # Record status change
     record_project_update(project, ['status'])
+    rollup_project_activity(project.id)
     
     return project
 
+@transaction.atomic
 def change_ppap_status(ppap_id, new_status, user_id):
     """
     Change PPAP status with workflow validation
@@ -63,9 +74,11 @@ def change_ppap_status(ppap_id, new_status, user_id):
     
     # Record status change
     record_ppap_update(ppap, ['status'])
+    rollup_project_activity(ppap.project_id)
     
     return ppap
 
+@transaction.atomic
 def change_phase_status(phase_id, new_status, user_id):
     """
     Change phase status with workflow validation
@@ -93,6 +106,9 @@ def change_phase_status(phase_id, new_status, user_id):
     
     # Record status change
     record_phase_status_change(phase, old_status, new_status)
+    rollup_phase_status_change(phase, old_status, new_status)
+    if old_status in COMPLETED_STATUSES or new_status in COMPLETED_STATUSES:
+        refresh_durations_on_commit(phase_template_id=phase.template_id)
     
     # Update PPAP status if needed
     if new_status == 'Completed':
@@ -101,6 +117,7 @@ def change_phase_status(phase_id, new_status, user_id):
     
     return phase
 
+@transaction.atomic
 def change_output_status(output_id, new_status, user_id):
     """
     Change output status with workflow validation
@@ -129,6 +146,9 @@ def change_output_status(output_id, new_status, user_id):
     
     # Record status change
     record_output_status_change(output, old_status, new_status)
+    rollup_output_status_change(output, old_status, new_status)
+    if old_status in COMPLETED_STATUSES or new_status in COMPLETED_STATUSES:
+        refresh_durations_on_commit(output_template_id=output.template_id)
     
     # Update phase status if needed
     if new_status == 'Completed':
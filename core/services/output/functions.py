@@ -3,7 +3,14 @@ from django.db import transaction
 from core.models import Output, Document
 from core.services.history.api import (
     record_output_update,
-    record_output_status_change
+    record_output_status_change,
+    record_phase_status_change,
+    record_document_creation
+)
+from core.services.project.rollup import (
+    rollup_output_status_change,
+    rollup_phase_status_change,
+    rollup_document_change
 )
 
 @transaction.atomic
@@ -31,6 +38,7 @@ def update_output(output_id, data):
     # Handle status change
     if 'status' in updated_fields and old_status != new_status:
         record_output_status_change(output, old_status, new_status)
+        rollup_output_status_change(output, old_status, new_status)
         
         # Update phase status if needed
         update_phase_status_from_output(output)
@@ -50,17 +58,13 @@ def update_phase_status_from_output(output):
     all_completed = all(o.status == 'Completed' for o in outputs)
     
     if all_completed and phase.status != 'Completed':
+        old_status = phase.status
         phase.status = 'Completed'
         phase.save()
         
         # Record phase completion in history
-        from core.services.history.initialization import initialize_history
-        initialize_history(
-            title=f"{phase.template.name}",
-            event=f"Phase marked as Completed as all outputs are completed",
-            table_name='phase',
-            history_id=phase.history_id
-        )
+        record_phase_status_change(phase, old_status, 'Completed')
+        rollup_phase_status_change(phase, old_status, 'Completed')
         
         # Update PPAP status
         from core.services.phase.functions import update_ppap_status_from_phase
@@ -74,13 +78,8 @@ def update_phase_status_from_output(output):
         phase.save()
         
         # Record phase status change in history
-        from core.services.history.initialization import initialize_history
-        initialize_history(
-            title=f"{phase.template.name}",
-            event=f"Phase marked as In Progress as at least one output is in progress",
-            table_name='phase',
-            history_id=phase.history_id
-        )
+        record_phase_status_change(phase, 'Not Started', 'In Progress')
+        rollup_phase_status_change(phase, 'Not Started', 'In Progress')
 
 @transaction.atomic
 def add_document_to_output(output_id, document_data, uploader_id):
@@ -103,13 +102,8 @@ def add_document_to_output(output_id, document_data, uploader_id):
     )
     
     # Record document creation in history
-    from core.services.history.initialization import initialize_history
-    initialize_history(
-        title=document.name,
-        event=f"Document uploaded for Output {output_id}",
-        table_name='document',
-        history_id=document.history_id
-    )
+    record_document_creation(document)
+    rollup_document_change(output.id, 1)
     
     return document
 
@@ -2,6 +2,7 @@ import uuid
 from django.db import transaction
 from core.models import Output, OutputTemplate, PPAPElement
 from core.services.history.initialization import initialize_history
+from core.services.template.plan import get_template_plan
 
 @transaction.atomic
 def initialize_outputs(phase_id, ppap_level, preserve_existing=False):
@@ -10,19 +11,10 @@ def initialize_outputs(phase_id, ppap_level, preserve_existing=False):
     """
     from core.models import Phase
     
-    phase = Phase.objects.get(id=phase_id)
-    phase_template = phase.template
+    phase = Phase.objects.select_related('template').get(id=phase_id)
     
-    # Get output templates for this phase template
-    output_templates = OutputTemplate.objects.filter(phase=phase_template)
-    
-    # Filter templates based on PPAP level
-    filtered_templates = []
-    for template in output_templates:
-        ppap_element = template.ppap_element
-        levels = ppap_element.level.split(',')
-        if 'custom' in levels or str(ppap_level) in levels:
-            filtered_templates.append(template)
+    # Output templates of this phase that apply to the PPAP level
+    filtered_templates = get_template_plan(ppap_level).outputs_for_phase(phase.template_id)
     
     outputs = []
     
@@ -3,8 +3,10 @@ from django.db import transaction
 from core.models import Phase, Output
 from core.services.history.api import (
     record_phase_update,
-    record_phase_status_change
+    record_phase_status_change,
+    record_ppap_status_change
 )
+from core.services.project.rollup import rollup_phase_status_change
 
 @transaction.atomic
 def update_phase(phase_id, data):
@@ -31,6 +33,7 @@ def update_phase(phase_id, data):
     # Handle status change
     if 'status' in updated_fields and old_status != new_status:
         record_phase_status_change(phase, old_status, new_status)
+        rollup_phase_status_change(phase, old_status, new_status)
         
         # Update PPAP status if needed
         update_ppap_status_from_phase(phase)
@@ -50,17 +53,12 @@ def update_ppap_status_from_phase(phase):
     all_completed = all(p.status == 'Completed' for p in phases)
     
     if all_completed and ppap.status != 'Completed':
+        old_status = ppap.status
         ppap.status = 'Completed'
         ppap.save()
         
         # Record PPAP completion in history
-        from core.services.history.initialization import initialize_history
-        initialize_history(
-            title=f"PPAP for Project {ppap.project_id}",
-            event=f"PPAP marked as Completed as all phases are completed",
-            table_name='ppap',
-            history_id=ppap.history_id
-        )
+        record_ppap_status_change(ppap, old_status, 'Completed')
     
     # Check if any phase is in progress
     any_in_progress = any(p.status == 'In Progress' for p in phases)
@@ -70,13 +68,7 @@ def update_ppap_status_from_phase(phase):
         ppap.save()
         
         # Record PPAP status change in history
-        from core.services.history.initialization import initialize_history
-        initialize_history(
-            title=f"PPAP for Project {ppap.project_id}",
-            event=f"PPAP marked as In Progress as at least one phase is in progress",
-            table_name='ppap',
-            history_id=ppap.history_id
-        )
+        record_ppap_status_change(ppap, 'Not Started', 'In Progress')
 
 def get_phase_details(phase_id):
     """
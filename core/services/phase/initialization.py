@@ -1,34 +1,91 @@
 import uuid
 from django.db import transaction
-from core.models import Phase, PhaseTemplate
-from core.services.history.initialization import initialize_history
+from core.models import Phase, PhaseTemplate, Output
+from core.services.history.initialization import initialize_history, initialize_histories
 from core.services.output.initialization import initialize_outputs
+from core.services.template.plan import get_template_plan
 from core.services.history.phase import record_phase_creation, record_phase_update
 
 @transaction.atomic
-def initialize_phases(ppap_id, ppap_level):
+def initialize_phases(ppap_id, ppap_level, bulk=True):
     """
     Initialize phases for a PPAP based on templates
+
+    Args:
+        ppap_id: PPAP ID
+        ppap_level: PPAP level used to select output templates
+        bulk (bool): Create the whole phase/output tree with bulk inserts.
+            When False every record is created individually.
+
+    Returns:
+        list: Created phases
     """
-    # Get phase templates appropriate for this PPAP level
-    phase_templates = PhaseTemplate.objects.all().order_by('order')
-    
+    if bulk:
+        return bulk_initialize_phases(ppap_id, ppap_level)
+
     phases = []
-    
-    for template in phase_templates:        
+
+    for template, _ in get_template_plan(ppap_level):
         # Create phase record
         phase = Phase.objects.create(
             template=template,
             ppap_id=ppap_id,
             status='Not Started',
         )
-        
+
         # Record creation in history
         record_phase_creation(phase)
-        
+
         # Initialize outputs
         initialize_outputs(phase.id, ppap_level)
-        
+
         phases.append(phase)
-    
+
+    return phases
+
+def bulk_initialize_phases(ppap_id, ppap_level):
+    """
+    Initialize the phases and outputs of a PPAP with bulk inserts
+
+    Produces the same records and history as the per-record path, but the
+    phases, the outputs and their history rows are each written with a
+    single bulk insert and their history IDs are known before the insert.
+    Templates come from the cached template plan of the level.
+
+    Args:
+        ppap_id: PPAP ID
+        ppap_level: PPAP level used to select output templates
+
+    Returns:
+        list: Created phases
+    """
+    plan = get_template_plan(ppap_level)
+
+    phases = Phase.bulk_create_with_history_ids([
+        Phase(template=phase_template, ppap_id=ppap_id, status='Not Started')
+        for phase_template, _ in plan
+    ])
+
+    outputs = Output.bulk_create_with_history_ids([
+        Output(template=template, phase=phase, status='Not Started')
+        for phase in phases
+        for template in plan.outputs_for_phase(phase.template_id)
+    ])
+
+    histories = [{
+        'title': phase.template.name,
+        'event_type': 'create',
+        'event_details': f"Phase created for PPAP {ppap_id}",
+        'table_name': 'phase',
+        'history_id': phase.history_id
+    } for phase in phases]
+    histories += [{
+        'title': f"{output.template.name} for Phase {output.phase.template.name}",
+        'event_type': 'create',
+        'event_details': f"Output created based on template {output.template_id}",
+        'table_name': 'output',
+        'history_id': output.history_id
+    } for output in outputs]
+    initialize_histories(histories)
+
     return phases
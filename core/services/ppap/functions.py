@@ -1,11 +1,15 @@
 # Define project possible action and services
 from django.db import transaction
-from core.models import PPAP, Phase, Output
+from django.utils import timezone
+from core.models import PPAP, Phase, Output, History, HistoryEvent
 from core.services.history.api import (
     record_ppap_update,
     record_ppap_level_change
 )
 from core.services.output.initialization import initialize_outputs
+from core.services.template.plan import get_template_plan
+from core.services.project.rollup import rebuild_project_rollup
+from core.services.statistics.snapshots import bump_statistics_version_on_commit
 
 @transaction.atomic
 def update_ppap(ppap_id, data):
@@ -42,25 +46,43 @@ def update_ppap(ppap_id, data):
 def update_outputs_for_level_change(ppap, new_level):
     """
     Update outputs when PPAP level changes
+    
+    Outputs the new level no longer requires are deprecated with one UPDATE
+    and one bulk INSERT of status_change events; as the UPDATE sends no
+    signals, the statistics of the project are invalidated here.
     """
+    plan = get_template_plan(new_level)
+    
     # Get all phases for this PPAP
     phases = ppap.phases.all()
     
     for phase in phases:
-        # Get existing outputs
-        existing_outputs = phase.outputs.all()
-        
         # Initialize new outputs based on new level
         initialize_outputs(phase.id, new_level, preserve_existing=True)
-        
-        # Mark outputs that are no longer required as 'Deprecated'
-        for output in existing_outputs:
-            ppap_element = output.template.ppap_element
-            levels = ppap_element.level.split(',')
-            
-            if 'custom' not in levels and str(new_level) not in levels:
-                output.status = 'Deprecated'
-                output.save()
+    
+    # Mark outputs that are no longer required as 'Deprecated'
+    deprecated = Output.objects.filter(phase__ppap=ppap).exclude(
+        template_id__in=plan.output_template_ids
+    ).exclude(status='Deprecated')
+    old_statuses = dict(deprecated.values_list('history_id', 'status'))
+    deprecated.update(status='Deprecated')
+    
+    # One bulk INSERT of status_change events for the outputs with a history
+    now = timezone.now()
+    HistoryEvent.objects.bulk_create([
+        HistoryEvent(
+            history_id=history_id,
+            type="status_change",
+            details=f"Output status changed from {old_statuses[history_id]} to Deprecated",
+            timestamp=now
+        ) for history_id in History.objects.filter(id__in=list(old_statuses)).values_list('id', flat=True)
+    ])
+    
+    # The UPDATE sends no signals
+    if old_statuses:
+        bump_statistics_version_on_commit(ppap.project_id)
+    
+    rebuild_project_rollup(ppap.project_id)
 
 def get_ppap_details(ppap_id):
     """
@@ -6,9 +6,14 @@ from core.services.phase.initialization import initialize_phases
 from core.services.history.ppap import record_ppap_creation
 
 @transaction.atomic
-def initialize_ppap(project_id, level):
+def initialize_ppap(project_id, level, bulk=True):
     """
     Initialize a new PPAP record with phases and outputs
+    
+    Args:
+        project_id: Project ID
+        level: PPAP level
+        bulk (bool): Create phases and outputs with bulk inserts
     """
     # Get the Project instance first
     from core.models import Project
@@ -25,6 +30,6 @@ def initialize_ppap(project_id, level):
     record_ppap_creation(ppap)
     
     # Initialize phases based on PPAP level
-    initialize_phases(ppap.id, level)
+    initialize_phases(ppap.id, level, bulk=bulk)
     
     return ppap
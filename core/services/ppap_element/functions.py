@@ -1,5 +1,5 @@
 from django.db import transaction
-from core.models import PPAPElement
+from core.models import PPAPElement, PPAPElementLevel
 
 def get_ppap_element_by_id(element_id):
     """
@@ -26,14 +26,10 @@ def get_ppap_elements_by_level(level):
     Returns:
         QuerySet: PPAP elements for the given level
     """
-    # Convert level to string for comparison
-    level_str = str(level)
-    
-    # Find elements where the level string contains the requested level
-    elements = PPAPElement.objects.all()
-    
-    # Filter in Python since we need to check if level is in a comma-separated list
-    return [e for e in elements if level_str in e.level.split(',') or 'custom' in e.level.split(',')]
+    # Elements listing the level or 'custom', resolved on the level index
+    return PPAPElement.objects.filter(
+        id__in=PPAPElementLevel.element_ids_for_level(level)
+    )
 
 def create_ppap_element(name, level):
     """
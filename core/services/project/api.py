@@ -6,6 +6,10 @@ from core.services.project.functions import (
     archive_project,
     get_project_details
 )
+from core.services.project.rollup import (
+    get_project_rollup,
+    rebuild_project_rollup
+)
 
 # Export all functions for use in views
 __all__ = [
@@ -14,5 +18,7 @@ __all__ = [
     'update_project',
     'delete_project',
     'archive_project',
-    'get_project_details'
+    'get_project_details',
+    'get_project_rollup',
+    'rebuild_project_rollup'
 ]
@@ -5,6 +5,7 @@ from core.services.history.api import (
     record_project_update,
     record_project_deletion
 )
+from core.services.history.initialization import get_history_events
 
 @transaction.atomic
 def update_project(project_id, data):
@@ -102,7 +103,7 @@ def get_project_details(project_id):
         })
     
     # Get history records
-    history_records = History.objects.filter(id=project.history_id)
+    history_records = History.objects.filter(id=project.history_id).prefetch_related('history_events')
     
     # Compile project details
     project_details = {
@@ -127,7 +128,7 @@ def get_project_details(project_id):
         'phases': phase_details,
         'history': [
             {
-                'event': record.event,
+                'events': get_history_events(record),
                 'created_at': record.created_at
             } for record in history_records
         ]
@@ -1,18 +1,21 @@
-import uuid
 from django.db import transaction
-from core.models import Project, PPAP, FastQuery
+from core.models import Project, PPAP, Output, FastQuery
 from core.services.history.initialization import initialize_history
 from core.services.ppap.initialization import initialize_ppap
 from core.services.history.project import record_project_creation
+from core.services.history.buffer import buffered_history
+from core.services.project.rollup import rebuild_project_rollup
 
-@transaction.atomic
-def initialize_project(name, description, client_id, team_id, ppap_level=3):
+@buffered_history()
+def initialize_project(name, description, client_id, team_id, ppap_level=3, bulk=True):
     """
     Initialize a new project with all related records
-    """
-    # Generate history ID
-    history_id = f"{uuid.uuid4().hex}project"
     
+    History writes of the whole tree are buffered and flushed in bulk
+    when the function returns, inside its transaction, so they are only
+    visible to direct History queries afterwards. With bulk=True (the
+    default) phases and outputs are also created with bulk inserts.
+    """
     # Create project record
     project = Project.objects.create(
         name=name,
@@ -25,7 +28,7 @@ def initialize_project(name, description, client_id, team_id, ppap_level=3):
     record_project_creation(project)
     
     # Initialize PPAP
-    ppap = initialize_ppap(project.id, ppap_level)
+    ppap = initialize_ppap(project.id, ppap_level, bulk=bulk)
     
     # Update project with PPAP ID
     project.ppap = ppap
@@ -34,6 +37,9 @@ def initialize_project(name, description, client_id, team_id, ppap_level=3):
     # Initialize FastQuery
     initialize_fastquery(project.id)
     
+    # Build the rollup once the buffered history has been flushed
+    transaction.on_commit(lambda: rebuild_project_rollup(project.id))
+    
     return project
 
 def initialize_fastquery(project_id):
@@ -48,14 +54,11 @@ def initialize_fastquery(project_id):
         'project_id': project.id,
         'ppap_id': ppap.id,
         'phase_ids': list(ppap.phases.values_list('id', flat=True)),
-        'output_ids': []
+        'output_ids': list(Output.objects.filter(phase__ppap=ppap).order_by(
+            'phase__template__order', 'phase_id', 'id'
+        ).values_list('id', flat=True))
     }
     
-    # Add output IDs
-    for phase in ppap.phases.all():
-        output_ids = list(phase.outputs.values_list('id', flat=True))
-        index['output_ids'].extend(output_ids)
-    
     # Create FastQuery record
     fastquery = FastQuery.objects.create(
         project=project,
@@ -0,0 +1,188 @@
+# Materialized per-project counters
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+from core.models import Project, PPAP, Phase, Output, Document, HistoryEvent, History, ProjectRollup
+
+# Statuses counted as done for phases and outputs
+COMPLETED_STATUSES = ('Completed', 'Approved')
+
+# Output statuses that can no longer be overdue
+CLOSED_OUTPUT_STATUSES = COMPLETED_STATUSES + ('Cancelled', 'Deprecated')
+
+def count_overdue_outputs(project_id, now=None):
+    """
+    Count the open outputs of a project whose deadline has passed
+
+    Args:
+        project_id: Project ID
+        now (datetime, optional): Reference time, defaults to now
+
+    Returns:
+        int: Number of overdue outputs
+    """
+    now = now or timezone.now()
+    return Output.objects.filter(
+        phase__ppap__project_id=project_id,
+        history_id__in=History.objects.filter(deadline__lt=now).values('id')
+    ).exclude(status__in=CLOSED_OUTPUT_STATUSES).count()
+
+def rebuild_project_rollup(project_id):
+    """
+    Recompute the rollup of a project from scratch
+
+    Args:
+        project_id: Project ID
+
+    Returns:
+        ProjectRollup: The rebuilt rollup
+    """
+    now = timezone.now()
+
+    outputs = Output.objects.filter(phase__ppap__project_id=project_id)
+    phases = Phase.objects.filter(ppap__project_id=project_id)
+    documents = Document.objects.filter(output__phase__ppap__project_id=project_id)
+
+    outputs_by_status = dict(
+        outputs.order_by().values_list('status').annotate(count=Count('id'))
+    )
+    phase_counts = phases.aggregate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(status__in=COMPLETED_STATUSES))
+    )
+
+    # Latest event on the project, its PPAPs, phases, outputs and documents
+    last_activity_at = HistoryEvent.objects.filter(
+        Q(history_id__in=Project.objects.filter(id=project_id).values('history_id')) |
+        Q(history_id__in=PPAP.objects.filter(project_id=project_id).values('history_id')) |
+        Q(history_id__in=phases.values('history_id')) |
+        Q(history_id__in=outputs.values('history_id')) |
+        Q(history_id__in=documents.values('history_id'))
+    ).aggregate(last=Max('timestamp'))['last']
+
+    rollup, _ = ProjectRollup.objects.update_or_create(
+        project_id=project_id,
+        defaults={
+            'outputs_total': sum(outputs_by_status.values()),
+            'outputs_by_status': outputs_by_status,
+            'phases_total': phase_counts['total'],
+            'phases_completed': phase_counts['completed'],
+            'overdue_outputs': count_overdue_outputs(project_id, now),
+            'overdue_as_of': now,
+            'documents': documents.count(),
+            'last_activity_at': last_activity_at,
+        }
+    )
+
+    return rollup
+
+def get_project_rollup(project_id):
+    """
+    Get the rollup of a project, building it if it does not exist yet
+
+    Args:
+        project_id: Project ID
+
+    Returns:
+        ProjectRollup: The project rollup
+    """
+    rollup = ProjectRollup.objects.filter(project_id=project_id).first()
+    return rollup or rebuild_project_rollup(project_id)
+
+def _update_rollup(project_id, apply_change=None):
+    """
+    Apply an incremental change to a project rollup under a row lock
+
+    A missing rollup is rebuilt instead, which already reflects the change.
+    The overdue count and the last activity are refreshed on every update.
+    """
+    if project_id is None:
+        return None
+
+    now = timezone.now()
+    with transaction.atomic():
+        rollup = ProjectRollup.objects.select_for_update().filter(project_id=project_id).first()
+        if rollup is None:
+            return rebuild_project_rollup(project_id)
+
+        if apply_change:
+            apply_change(rollup)
+        rollup.overdue_outputs = count_overdue_outputs(project_id, now)
+        rollup.overdue_as_of = now
+        rollup.last_activity_at = now
+        rollup.save()
+
+    return rollup
+
+def rollup_output_status_change(output, old_status, new_status):
+    """
+    Move an output from one status counter to another
+
+    Args:
+        output (Output): Output whose status changed
+        old_status (str): Previous status
+        new_status (str): New status
+
+    Returns:
+        ProjectRollup: Updated rollup
+    """
+    project_id = PPAP.objects.filter(phases__id=output.phase_id).values_list('project_id', flat=True).first()
+
+    def apply_change(rollup):
+        counts = rollup.outputs_by_status
+        counts[old_status] = counts.get(old_status, 0) - 1
+        if counts[old_status] <= 0:
+            del counts[old_status]
+        counts[new_status] = counts.get(new_status, 0) + 1
+
+    return _update_rollup(project_id, apply_change)
+
+def rollup_phase_status_change(phase, old_status, new_status):
+    """
+    Update the completed phase counter after a phase status change
+
+    Args:
+        phase (Phase): Phase whose status changed
+        old_status (str): Previous status
+        new_status (str): New status
+
+    Returns:
+        ProjectRollup: Updated rollup
+    """
+    project_id = PPAP.objects.filter(id=phase.ppap_id).values_list('project_id', flat=True).first()
+    delta = int(new_status in COMPLETED_STATUSES) - int(old_status in COMPLETED_STATUSES)
+
+    def apply_change(rollup):
+        rollup.phases_completed += delta
+
+    return _update_rollup(project_id, apply_change)
+
+def rollup_document_change(output_id, delta):
+    """
+    Update the document counter after documents were added or removed
+
+    Args:
+        output_id: ID of the output the documents belong to
+        delta (int): Number of documents added (negative if removed)
+
+    Returns:
+        ProjectRollup: Updated rollup
+    """
+    project_id = PPAP.objects.filter(phases__outputs__id=output_id).values_list('project_id', flat=True).first()
+
+    def apply_change(rollup):
+        rollup.documents += delta
+
+    return _update_rollup(project_id, apply_change)
+
+def rollup_project_activity(project_id):
+    """
+    Record activity on a project without changing its counters
+
+    Args:
+        project_id: Project ID
+
+    Returns:
+        ProjectRollup: Updated rollup
+    """
+    return _update_rollup(project_id)
@@ -0,0 +1 @@
+# Statistics services
@@ -0,0 +1,15 @@
+# Define all API here
+from core.services.statistics.functions import (
+    get_project_statistics,
+    get_phase_statistics
+)
+from core.services.statistics.portfolio import get_portfolio_statistics
+from core.services.statistics.snapshots import (
+    STATISTICS_SNAPSHOT_TTL,
+    project_id_for,
+    project_id_for_history,
+    project_versions,
+    bump_statistics_version,
+    bump_statistics_version_on_commit,
+    get_statistics_snapshot
+)
@@ -0,0 +1,127 @@
+# Project and phase statistics
+from django.db.models import Count, F, Q
+from core.models import Project, Phase, Output, Document, History
+from core.services.project.rollup import get_project_rollup
+
+def _output_timeliness(outputs):
+    """Count outputs finished on time and late in one aggregate over History subqueries"""
+    return outputs.aggregate(
+        total=Count('id'),
+        on_time=Count('id', filter=Q(history_id__in=History.objects.filter(
+            finished_at__lte=F('deadline')
+        ).values('id'))),
+        delayed=Count('id', filter=Q(history_id__in=History.objects.filter(
+            finished_at__gt=F('deadline')
+        ).values('id')))
+    )
+
+def get_project_statistics(project_id):
+    """
+    Get statistics for a project
+
+    Counters come from the project rollup (see core.services.project.rollup);
+    timeliness, document types and outputs per user take one grouped
+    query each, whatever the number of outputs.
+
+    Args:
+        project_id (int): Project ID
+
+    Returns:
+        dict: Phase, output and document counters, output timeliness,
+            documents by type and outputs per assigned user
+
+    Raises:
+        Project.DoesNotExist: If the project does not exist
+    """
+    project = Project.objects.select_related('ppap').get(id=project_id)
+    rollup = get_project_rollup(project.id)
+
+    total_phases = rollup.phases_total
+    completed_phases = rollup.phases_completed
+    total_outputs = rollup.outputs_total
+
+    outputs = Output.objects.filter(phase__ppap__project_id=project.id)
+    timeliness = _output_timeliness(outputs)
+    documents_by_type = list(
+        Document.objects.filter(output__phase__ppap__project_id=project.id)
+        .order_by('file_type').values('file_type').annotate(count=Count('id'))
+    )
+    user_activity = list(
+        outputs.order_by('user').values('user').annotate(count=Count('id'))
+    )
+
+    return {
+        'project_id': project.id,
+        'project_name': project.name,
+        'ppap_level': project.ppap.level if project.ppap else None,
+        'phases': {
+            'total': total_phases,
+            'completed': completed_phases,
+            'completion_rate': (completed_phases / total_phases * 100) if total_phases > 0 else 0
+        },
+        'outputs': {
+            'total': total_outputs,
+            'by_status': [
+                {'status': output_status, 'count': count}
+                for output_status, count in sorted(rollup.outputs_by_status.items())
+            ],
+            'on_time': timeliness['on_time'],
+            'delayed': timeliness['delayed'],
+            'on_time_rate': (timeliness['on_time'] / total_outputs * 100) if total_outputs > 0 else 0,
+            'overdue': rollup.overdue_outputs,
+            'overdue_as_of': rollup.overdue_as_of
+        },
+        'documents': {
+            'total': rollup.documents,
+            'by_type': documents_by_type
+        },
+        'user_activity': user_activity,
+        'last_activity': rollup.last_activity_at
+    }
+
+def get_phase_statistics(phase_id):
+    """
+    Get statistics for a phase
+
+    Output deadlines are compared in History subqueries, so the number of
+    queries does not depend on the number of outputs.
+
+    Args:
+        phase_id (int): Phase ID
+
+    Returns:
+        dict: Output counts by status and timeliness, document count and
+            outputs per assigned user
+
+    Raises:
+        Phase.DoesNotExist: If the phase does not exist
+    """
+    phase = Phase.objects.select_related('template').get(id=phase_id)
+    outputs = Output.objects.filter(phase=phase)
+
+    timeliness = _output_timeliness(outputs)
+    total_outputs = timeliness['total']
+
+    outputs_by_status = list(
+        outputs.order_by('status').values('status').annotate(count=Count('id'))
+    )
+    user_activity = list(
+        outputs.order_by('user').values('user').annotate(count=Count('id'))
+    )
+
+    return {
+        'phase_id': phase.id,
+        'phase_name': phase.template.name if phase.template else "Unknown",
+        'status': phase.status,
+        'outputs': {
+            'total': total_outputs,
+            'by_status': outputs_by_status,
+            'on_time': timeliness['on_time'],
+            'delayed': timeliness['delayed'],
+            'on_time_rate': (timeliness['on_time'] / total_outputs * 100) if total_outputs > 0 else 0
+        },
+        'documents': {
+            'total': Document.objects.filter(output__phase=phase).count()
+        },
+        'user_activity': user_activity
+    }
@@ -0,0 +1,164 @@
+# Cross-project statistics, computed in SQL with window functions
+from django.db.models import (
+    Count, DateTimeField, F, FloatField, IntegerField, OuterRef, Q, Subquery, Sum, Window
+)
+from django.db.models.functions import Cast, Coalesce, NullIf, Rank
+from django.utils import timezone
+from core.models import Project, Phase, Output, Document, History
+from core.services.project.rollup import COMPLETED_STATUSES, CLOSED_OUTPUT_STATUSES
+
+# Counters summed per team by window functions
+TEAM_COUNTERS = [
+    'outputs_total', 'outputs_completed', 'outputs_finished', 'outputs_on_time',
+    'overdue_outputs', 'documents',
+]
+
+def _history_field(field):
+    return Subquery(
+        History.objects.filter(id=OuterRef('history_id')).values(field)[:1],
+        output_field=DateTimeField()
+    )
+
+def _project_count(queryset, project_field):
+    """Number of rows of queryset belonging to the outer project"""
+    return Coalesce(Subquery(
+        queryset.filter(**{project_field: OuterRef('pk')}).order_by().values(project_field).annotate(
+            count=Count('id')
+        ).values('count'),
+        output_field=IntegerField()
+    ), 0)
+
+def _rate(part, whole):
+    return round(part / whole * 100, 2) if whole else 0
+
+def _portfolio_queryset(projects, now):
+    """Projects annotated with their counters, team totals and ranks"""
+    outputs = Output.objects.all()
+    finished = History.objects.filter(finished_at__isnull=False, deadline__isnull=False)
+
+    projects = projects.annotate(
+        deadline=_history_field('deadline'),
+        finished_at=_history_field('finished_at'),
+        phases_total=_project_count(Phase.objects.all(), 'ppap__project_id'),
+        phases_completed=_project_count(
+            Phase.objects.filter(status__in=COMPLETED_STATUSES), 'ppap__project_id'
+        ),
+        outputs_total=_project_count(outputs, 'phase__ppap__project_id'),
+        outputs_completed=_project_count(
+            outputs.filter(status__in=COMPLETED_STATUSES), 'phase__ppap__project_id'
+        ),
+        outputs_finished=_project_count(
+            outputs.filter(history_id__in=finished.values('id')), 'phase__ppap__project_id'
+        ),
+        outputs_on_time=_project_count(
+            outputs.filter(history_id__in=finished.filter(finished_at__lte=F('deadline')).values('id')),
+            'phase__ppap__project_id'
+        ),
+        overdue_outputs=_project_count(
+            outputs.exclude(status__in=CLOSED_OUTPUT_STATUSES).filter(
+                history_id__in=History.objects.filter(deadline__lt=now).values('id')
+            ),
+            'phase__ppap__project_id'
+        ),
+        documents=_project_count(Document.objects.all(), 'output__phase__ppap__project_id'),
+    ).annotate(
+        completion_ratio=Cast('outputs_completed', FloatField()) / NullIf(F('outputs_total'), 0),
+    )
+
+    team = {'partition_by': [F('team_id')]}
+    return projects.annotate(
+        team_projects=Window(Count('id'), **team),
+        **{f'team_{counter}': Window(Sum(counter), **team) for counter in TEAM_COUNTERS},
+        completion_rank=Window(Rank(), order_by=F('completion_ratio').desc(nulls_last=True)),
+        team_completion_rank=Window(Rank(), order_by=F('completion_ratio').desc(nulls_last=True), **team),
+    ).order_by('team__name', 'team_id', 'completion_rank', 'id')
+
+def get_portfolio_statistics(team_id=None, client_id=None, status=None):
+    """
+    Get completion, timeliness, overdue and document statistics of every project
+
+    Project counters come from correlated count subqueries and team totals
+    and rankings from window functions over them, so the whole portfolio
+    is computed in a single query. Team totals and ranks cover the
+    filtered projects only.
+
+    Args:
+        team_id (int, optional): Only projects of this team
+        client_id (int, optional): Only projects of this client
+        status (str, optional): Only projects with this status
+
+    Returns:
+        dict: Portfolio statistics including:
+            - projects: Per-project counters, rates and completion ranks
+            - teams: Per-team counters and rates
+            - totals: Counters and rates of all the listed projects
+    """
+    now = timezone.now()
+
+    projects = Project.objects.all()
+    if team_id:
+        projects = projects.filter(team_id=team_id)
+    if client_id:
+        projects = projects.filter(client_id=client_id)
+    if status:
+        projects = projects.filter(status=status)
+
+    rows = list(_portfolio_queryset(projects, now).values(
+        'id', 'name', 'status', 'team_id', 'team__name', 'client_id', 'client__name',
+        'deadline', 'finished_at', 'phases_total', 'phases_completed', *TEAM_COUNTERS,
+        'team_projects', *[f'team_{counter}' for counter in TEAM_COUNTERS],
+        'completion_rank', 'team_completion_rank'
+    ))
+
+    project_stats = []
+    teams = {}
+    for row in rows:
+        project_stats.append({
+            'project_id': row['id'],
+            'project_name': row['name'],
+            'status': row['status'],
+            'team_id': row['team_id'],
+            'client_id': row['client_id'],
+            'client_name': row['client__name'],
+            'deadline': row['deadline'],
+            'finished_at': row['finished_at'],
+            'phases': {
+                'total': row['phases_total'],
+                'completed': row['phases_completed'],
+                'completion_rate': _rate(row['phases_completed'], row['phases_total'])
+            },
+            'outputs': {
+                'total': row['outputs_total'],
+                'completed': row['outputs_completed'],
+                'completion_rate': _rate(row['outputs_completed'], row['outputs_total']),
+                'on_time': row['outputs_on_time'],
+                'on_time_rate': _rate(row['outputs_on_time'], row['outputs_finished']),
+                'overdue': row['overdue_outputs']
+            },
+            'documents': row['documents'],
+            'completion_rank': row['completion_rank'],
+            'team_completion_rank': row['team_completion_rank']
+        })
+
+        if row['team_id'] not in teams:
+            teams[row['team_id']] = {
+                'team_id': row['team_id'],
+                'team_name': row['team__name'],
+                'projects': row['team_projects'],
+                **{counter: row[f'team_{counter}'] or 0 for counter in TEAM_COUNTERS}
+            }
+
+    totals = {
+        'projects': len(rows),
+        **{counter: sum(team[counter] for team in teams.values()) for counter in TEAM_COUNTERS}
+    }
+    for counters in [*teams.values(), totals]:
+        counters['completion_rate'] = _rate(counters['outputs_completed'], counters['outputs_total'])
+        counters['on_time_rate'] = _rate(counters['outputs_on_time'], counters['outputs_finished'])
+
+    return {
+        'generated_at': now,
+        'projects': project_stats,
+        'teams': list(teams.values()),
+        'totals': totals
+    }
@@ -0,0 +1,216 @@
+# Cached statistics snapshots, invalidated per project
+import uuid
+from django.core.cache import cache
+from django.db import transaction
+from core.models import PPAP, Phase, Output, Document
+
+STATISTICS_VERSION_CACHE_KEY = 'core:statistics:version:{project_id}'
+STATISTICS_SNAPSHOT_CACHE_KEY = 'core:statistics:snapshot:{entity}:{entity_id}:{version}'
+
+# Snapshots expire after this many seconds even without invalidation, which
+# bounds staleness after bulk changes that send no signals
+STATISTICS_SNAPSHOT_TTL = 300
+
+# How to reach the project from the ID of an entity: (model, project field)
+PROJECT_LOOKUPS = {
+    'ppap': (PPAP, 'project_id'),
+    'phase': (Phase, 'ppap__project_id'),
+    'output': (Output, 'phase__ppap__project_id'),
+    'document': (Document, 'output__phase__ppap__project_id'),
+}
+
+def project_id_for(table_name, entity_id):
+    """
+    Get the project an entity belongs to
+
+    Args:
+        table_name (str): Entity type ('project', 'ppap', 'phase', 'output'
+            or 'document', as in History.table_name)
+        entity_id (int): Entity ID
+
+    Returns:
+        int or None: Project ID, None for other entity types or missing rows
+    """
+    if entity_id is None:
+        return None
+    if table_name == 'project':
+        return entity_id
+    if table_name not in PROJECT_LOOKUPS:
+        return None
+
+    model, field = PROJECT_LOOKUPS[table_name]
+    return model.objects.filter(id=entity_id).values_list(field, flat=True).first()
+
+def _history_entity(history):
+    """(table name, entity ID) of a History record, entity ID None if not derived from it"""
+    table_name = history.table_name or ''
+    entity_id = str(history.id)[:-len(table_name)] if table_name else ''
+    if not str(history.id).endswith(table_name) or not entity_id.isdigit():
+        return table_name, None
+    return table_name, int(entity_id)
+
+def project_id_for_history(history):
+    """
+    Get the project a History record belongs to
+
+    History IDs are the entity ID followed by its table name (e.g. "12output").
+    The result is kept on the record, so saving the same record again does
+    not repeat the lookup.
+
+    Args:
+        history (History): History record
+
+    Returns:
+        int or None: Project ID
+    """
+    if '_statistics_project_id' not in history.__dict__:
+        history._statistics_project_id = project_id_for(*_history_entity(history))
+    return history._statistics_project_id
+
+def project_ids_for(table_name, entity_ids):
+    """
+    Get the projects several entities of one type belong to, in one query
+
+    Args:
+        table_name (str): Entity type, see project_id_for
+        entity_ids (iterable): Entity IDs
+
+    Returns:
+        set: Project IDs
+    """
+    entity_ids = list(entity_ids)
+    if table_name == 'project':
+        return set(entity_ids)
+    if table_name not in PROJECT_LOOKUPS or not entity_ids:
+        return set()
+
+    model, field = PROJECT_LOOKUPS[table_name]
+    return set(model.objects.filter(id__in=entity_ids).values_list(field, flat=True).distinct()) - {None}
+
+def project_ids_for_histories(histories):
+    """
+    Get the projects History records belong to, in one query per entity type
+
+    Args:
+        histories (iterable): History records
+
+    Returns:
+        set: Project IDs
+    """
+    entity_ids_by_table = {}
+    for history in histories:
+        table_name, entity_id = _history_entity(history)
+        if entity_id is not None:
+            entity_ids_by_table.setdefault(table_name, set()).add(entity_id)
+
+    project_ids = set()
+    for table_name, entity_ids in entity_ids_by_table.items():
+        project_ids |= project_ids_for(table_name, entity_ids)
+    return project_ids
+
+def _project_version(project_id):
+    """Get the snapshot version of a project, creating one if the cache has none"""
+    key = STATISTICS_VERSION_CACHE_KEY.format(project_id=project_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+def project_versions(project_ids):
+    """
+    Get the snapshot versions of several projects in one cache round trip
+
+    Args:
+        project_ids (iterable): Project IDs
+
+    Returns:
+        dict: {project_id: version}
+    """
+    keys = {STATISTICS_VERSION_CACHE_KEY.format(project_id=project_id): project_id for project_id in project_ids}
+    found = cache.get_many(list(keys))
+    return {
+        project_id: found[key] if key in found else _project_version(project_id)
+        for key, project_id in keys.items()
+    }
+
+def bump_statistics_version(project_id):
+    """
+    Discard the cached statistics snapshots of a project
+
+    Called by signals when projects, outputs, phases, documents, todos or
+    history records change, and by the bulk history writers that send no
+    signals (the history buffer flush, bulk deadline updates and timeline
+    planning); call it directly after other bulk changes (bulk_create,
+    queryset update/delete).
+
+    Args:
+        project_id (int): Project ID
+    """
+    cache.set(STATISTICS_VERSION_CACHE_KEY.format(project_id=project_id), uuid.uuid4().hex, timeout=None)
+
+class _BumpOnCommit:
+    """on_commit callback bumping the version of one project"""
+
+    def __init__(self, project_id):
+        self.project_id = project_id
+
+    def __call__(self):
+        bump_statistics_version(self.project_id)
+
+def bump_statistics_version_on_commit(project_id):
+    """
+    Bump the snapshot version of a project once the transaction commits
+
+    Bumping at commit keeps a concurrent request from caching data read
+    before the change under the new version. A project is bumped once per
+    transaction however many changes it gets: the bump is not registered
+    again while one registered in the current savepoint or an enclosing
+    one is pending (Django drops the callbacks of a savepoint that rolls
+    back, so those of sibling savepoints do not count).
+
+    Args:
+        project_id (int): Project ID
+    """
+    if project_id is None:
+        return
+
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        savepoint_ids = set(connection.savepoint_ids)
+        for callback_savepoint_ids, callback, *_ in connection.run_on_commit:
+            if (
+                isinstance(callback, _BumpOnCommit) and callback.project_id == project_id
+                and callback_savepoint_ids <= savepoint_ids
+            ):
+                return
+    transaction.on_commit(_BumpOnCommit(project_id))
+
+def get_statistics_snapshot(entity, entity_id, project_id, compute, timeout=STATISTICS_SNAPSHOT_TTL):
+    """
+    Get cached statistics of an entity, computing them on a miss
+
+    Snapshots are keyed by the current version of the project, so any
+    change to the project makes them unreachable; they also expire after
+    timeout seconds.
+
+    Args:
+        entity (str): Entity type, e.g. 'project' or 'phase'
+        entity_id (int): Entity ID
+        project_id (int): Project whose changes invalidate the snapshot
+        compute (callable): Builds the statistics, called without arguments
+        timeout (int, optional): Lifetime of the snapshot in seconds
+
+    Returns:
+        dict: Statistics of the entity
+    """
+    key = STATISTICS_SNAPSHOT_CACHE_KEY.format(
+        entity=entity, entity_id=entity_id, version=_project_version(project_id)
+    )
+    snapshot = cache.get(key)
+    if snapshot is not None:
+        return snapshot
+
+    snapshot = compute()
+    cache.set(key, snapshot, timeout)
+    return snapshot
@@ -21,11 +21,17 @@ from core.services.template.functions import (
     delete_phase_template,
     delete_output_template
 )
+from core.services.template.plan import (
+    get_template_plan,
+    invalidate_template_plans
+)
 
 __all__ = [
     'initialize_phase_template',
     'initialize_output_template',
     'get_phase_template_by_id',
+    'get_template_plan',
+    'invalidate_template_plans',
     # ... other functions ...
 ]
 
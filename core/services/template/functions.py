@@ -1,4 +1,4 @@
-from core.models import PhaseTemplate, OutputTemplate
+from core.models import PhaseTemplate, OutputTemplate, PPAPElementLevel
 
 
 
@@ -41,9 +41,13 @@ def get_phase_templates_by_level(level):
         level (int): PPAP level
         
     Returns:
-        QuerySet: Templates for the given level
+        QuerySet: Templates having output templates required at the level
     """
-    return PhaseTemplate.objects.filter(ppap_levels__contains=[level]).order_by('order')
+    return PhaseTemplate.objects.filter(
+        id__in=OutputTemplate.objects.filter(
+            ppap_element_id__in=PPAPElementLevel.element_ids_for_level(level)
+        ).values('phase_id')
+    ).order_by('order')
 
 def get_output_templates_by_phase(phase_id):
     """
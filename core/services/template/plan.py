@@ -0,0 +1,119 @@
+# Cached PPAP template plans
+import threading
+import uuid
+from django.core.cache import cache
+from core.models import PhaseTemplate, OutputTemplate, PPAPElementLevel
+
+PLAN_VERSION_CACHE_KEY = 'core:template_plan:version'
+
+_lock = threading.Lock()
+_state = {'version': None, 'plans': {}}
+
+class TemplatePlan:
+    """
+    Ordered phase/output templates that apply to one PPAP level
+
+    Iterating a plan yields (PhaseTemplate, [OutputTemplate]) pairs in
+    phase order; every phase template is listed, even without outputs.
+    Plans are shared between callers and must not be modified.
+    """
+
+    def __init__(self, level, phases):
+        self.level = level
+        self.phases = phases
+        self.output_templates_by_phase = {
+            phase_template.id: output_templates
+            for phase_template, output_templates in phases
+        }
+        self.output_template_ids = frozenset(
+            template.id for _, output_templates in phases for template in output_templates
+        )
+
+    def __iter__(self):
+        return iter(self.phases)
+
+    def outputs_for_phase(self, phase_template_id):
+        """
+        Get the output templates of a phase template
+
+        Args:
+            phase_template_id: PhaseTemplate ID
+
+        Returns:
+            list: OutputTemplate objects, ordered by name
+        """
+        return self.output_templates_by_phase.get(phase_template_id, [])
+
+    @property
+    def output_templates(self):
+        """All output templates of the plan, in phase order"""
+        return [template for _, output_templates in self.phases for template in output_templates]
+
+def _build_plan(ppap_level):
+    """Build the plan of a level from the phase templates and one indexed output template query"""
+    phase_templates = list(PhaseTemplate.objects.order_by('order'))
+
+    output_templates = OutputTemplate.objects.filter(
+        ppap_element_id__in=PPAPElementLevel.element_ids_for_level(ppap_level)
+    ).select_related('ppap_element').order_by('name')
+
+    output_templates_by_phase = {}
+    for template in output_templates:
+        output_templates_by_phase.setdefault(template.phase_id, []).append(template)
+
+    return TemplatePlan(ppap_level, [
+        (phase_template, output_templates_by_phase.get(phase_template.id, []))
+        for phase_template in phase_templates
+    ])
+
+def _current_version():
+    """Get the shared plan version, creating one if the cache has none"""
+    version = cache.get(PLAN_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(PLAN_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(PLAN_VERSION_CACHE_KEY)
+    return version
+
+def get_template_plan(ppap_level):
+    """
+    Get the template plan of a PPAP level
+
+    Plans are compiled once per process and reused until the plan version
+    changes, which happens whenever a PhaseTemplate, OutputTemplate or
+    PPAPElement is saved or deleted. The version lives in the shared cache
+    (see CACHES), so a change made by one worker reaches all of them.
+
+    Args:
+        ppap_level: PPAP level
+
+    Returns:
+        TemplatePlan: Plan of the level
+    """
+    version = _current_version()
+    key = str(ppap_level)
+
+    with _lock:
+        if _state['version'] == version and key in _state['plans']:
+            return _state['plans'][key]
+
+    plan = _build_plan(ppap_level)
+
+    with _lock:
+        if _state['version'] != version:
+            _state['version'] = version
+            _state['plans'] = {}
+        _state['plans'][key] = plan
+
+    return plan
+
+def invalidate_template_plans():
+    """
+    Discard the compiled template plans of every process
+
+    Called by signals on template changes; call it directly after bulk
+    changes (queryset update/delete) that do not send signals.
+    """
+    cache.set(PLAN_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+    with _lock:
+        _state['version'] = None
+        _state['plans'] = {}
@@ -3,7 +3,25 @@ from core.services.timeline.functions import (
     set_project_timeline,
     set_phase_timeline,
     update_timeline_progress,
-    get_timeline_overview
+    get_timeline_overview,
+    output_weights,
+    plan_timeline,
+    load_phase_outputs
+)
+from core.services.timeline.reschedule import (
+    deadline_dependencies,
+    propagate_deadline,
+    reschedule_deadline
+)
+from core.services.timeline.simulation import (
+    load_timeline_model,
+    assess_schedule_risk,
+    simulate_timeline
+)
+from core.services.timeline.working_calendar import (
+    WorkingCalendar,
+    load_working_calendar,
+    distribute_deadlines
 )
 
 # Export all functions for use in views
@@ -11,5 +29,17 @@ __all__ = [
     'set_project_timeline',
     'set_phase_timeline',
     'update_timeline_progress',
-    'get_timeline_overview'
+    'get_timeline_overview',
+    'output_weights',
+    'plan_timeline',
+    'load_phase_outputs',
+    'deadline_dependencies',
+    'propagate_deadline',
+    'reschedule_deadline',
+    'load_timeline_model',
+    'assess_schedule_risk',
+    'simulate_timeline',
+    'WorkingCalendar',
+    'load_working_calendar',
+    'distribute_deadlines'
 ]
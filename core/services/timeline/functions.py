@@ -1,94 +1,189 @@
-from datetime import datetime, timedelta
 from django.db import transaction
+from django.utils import timezone
 from core.models import Project, PPAP, Phase, Output, History
+from core.services.history.editor import set_history_deadlines
+from core.services.analyse.critical_path import DEFAULT_OUTPUT_DURATION, template_duration_estimates
+from core.services.project.rollup import rollup_project_activity
+from core.services.statistics.snapshots import bump_statistics_version_on_commit
+from core.services.timeline.working_calendar import distribute_deadlines, load_working_calendar
 
+# History rows written per UPDATE statement
+HISTORY_BATCH_SIZE = 500
+
+def _aware(value):
+    """Interpret naive datetimes in the current time zone"""
+    if value is not None and timezone.is_naive(value):
+        return timezone.make_aware(value)
+    return value
+
+def output_weights(outputs):
+    """
+    Relative amount of work of outputs
+
+    The weight is the "weight" of the output template configuration when
+    set, else the mean historical duration of the template (or of its
+    phase template), else DEFAULT_OUTPUT_DURATION.
+
+    Args:
+        outputs (list): Output rows with template_id, phase_template_id and
+            configuration
+
+    Returns:
+        dict: {output_id: weight}
+    """
+    by_template, by_phase_template = template_duration_estimates({output['template_id'] for output in outputs})
+
+    weights = {}
+    for output in outputs:
+        configuration = output['configuration'] if isinstance(output['configuration'], dict) else {}
+        weight = configuration.get('weight')
+        if not isinstance(weight, (int, float)) or weight <= 0:
+            weight = by_template.get(output['template_id']) or by_phase_template.get(output['phase_template_id'])
+        weights[output['id']] = weight or DEFAULT_OUTPUT_DURATION
+    return weights
+
+def plan_timeline(calendar, start, deadline, phases, outputs_by_phase, weights, phase_weights=None):
+    """
+    Plan the deadlines of consecutive phases and of their outputs
+
+    Phases share the working days until the deadline in proportion to the
+    total weight of their outputs; the outputs of a phase then share the
+    working days of the phase the same way. Nothing is read or written.
+
+    Args:
+        calendar (WorkingCalendar): Calendar covering start to deadline
+        start (datetime): Start of the first phase
+        deadline (datetime): Deadline of the last phase
+        phases (list): Phase IDs, in order
+        outputs_by_phase (dict): {phase_id: [output_id]}, outputs in order
+        weights (dict): {output_id: weight}
+        phase_weights (dict, optional): {phase_id: weight} overriding the
+            total weight of the outputs of some phases
+
+    Returns:
+        tuple: ({phase_id: deadline}, {output_id: deadline})
+    """
+    overrides = phase_weights or {}
+    phase_weights = [
+        overrides.get(phase_id)
+        or sum(weights[output_id] for output_id in outputs_by_phase.get(phase_id, ()))
+        or DEFAULT_OUTPUT_DURATION
+        for phase_id in phases
+    ]
+    phase_deadlines = dict(zip(phases, distribute_deadlines(calendar, start, deadline, phase_weights)))
+
+    output_deadlines = {}
+    phase_start = start
+    for phase_id in phases:
+        output_ids = outputs_by_phase.get(phase_id, [])
+        output_deadlines.update(zip(output_ids, distribute_deadlines(
+            calendar, phase_start, phase_deadlines[phase_id], [weights[output_id] for output_id in output_ids]
+        )))
+        phase_start = phase_deadlines[phase_id]
+    return phase_deadlines, output_deadlines
+
+def load_phase_outputs(phase_ids):
+    """
+    Load the outputs of some phases for planning, with one query
+
+    Args:
+        phase_ids (list): Phase IDs
+
+    Returns:
+        tuple: ({phase_id: [output_id]} in output order, [output rows])
+    """
+    outputs = [
+        {
+            'id': output_id, 'phase_id': phase_id, 'history_id': history_id,
+            'template_id': template_id, 'phase_template_id': phase_template_id,
+            'configuration': configuration
+        }
+        for output_id, phase_id, history_id, template_id, phase_template_id, configuration in Output.objects.filter(
+            phase_id__in=phase_ids
+        ).order_by('phase_id', 'id').values_list(
+            'id', 'phase_id', 'history_id', 'template_id', 'template__phase_id', 'template__configuration'
+        )
+    ]
+
+    outputs_by_phase = {}
+    for output in outputs:
+        outputs_by_phase.setdefault(output['phase_id'], []).append(output['id'])
+    return outputs_by_phase, outputs
+
+def _set_deadlines(deadlines_by_history_id):
+    """Write deadlines in bulk, with a deadline_change event per moved record"""
+    return set_history_deadlines(deadlines_by_history_id, batch_size=HISTORY_BATCH_SIZE)
+
+def _timeline_changed(project_id):
+    """Refresh what depends on deadlines written without signals"""
+    rollup_project_activity(project_id)
+    bump_statistics_version_on_commit(project_id)
+
+@transaction.atomic
 def set_project_timeline(project_id, deadline):
     """
     Set project timeline with deadline and calculate phase deadlines
+
+    Phase and output deadlines are planned in memory over working days
+    (see plan_timeline) and written with one bulk update, with a
+    deadline_change event for every deadline that moved.
     """
+    deadline = _aware(deadline)
+    now = timezone.now()
     project = Project.objects.get(id=project_id)
-    ppap = project.ppap
-    
-    # Update history record with deadline
-    history = History.objects.get(id=project.history_id)
-    history.deadline = deadline
-    history.save()
-    
-    # Calculate phase deadlines
-    phases = Phase.objects.filter(ppap=ppap).order_by('template__order')
-    total_phases = phases.count()
-    
-    if total_phases > 0:
-        # Calculate time per phase
-        now = datetime.now()
-        total_days = (deadline - now).days
-        days_per_phase = max(1, total_days // total_phases)
-        
-        # Set phase deadlines
-        current_deadline = now
-        for i, phase in enumerate(phases):
-            # Last phase gets the project deadline
-            if i == total_phases - 1:
-                phase_deadline = deadline
-            else:
-                # Add days for this phase
-                current_deadline += timedelta(days=days_per_phase)
-                phase_deadline = current_deadline
-            
-            # Update phase history with deadline
-            phase_history = History.objects.get(id=phase.history_id)
-            phase_history.deadline = phase_deadline
-            phase_history.save()
-            
-            # Calculate output deadlines within this phase
-            set_phase_timeline(phase.id, phase_deadline)
-    
+
+    phases = list(Phase.objects.filter(ppap_id=project.ppap_id).order_by('template__order').values_list(
+        'id', 'history_id'
+    ))
+    outputs_by_phase, outputs = load_phase_outputs([phase_id for phase_id, _ in phases])
+
+    calendar = load_working_calendar(timezone.localtime(now).date(), timezone.localtime(deadline).date())
+    phase_deadlines, output_deadlines = plan_timeline(
+        calendar, now, deadline, [phase_id for phase_id, _ in phases], outputs_by_phase, output_weights(outputs)
+    )
+
+    deadlines = {project.history_id: deadline}
+    deadlines.update({history_id: phase_deadlines[phase_id] for phase_id, history_id in phases})
+    deadlines.update({output['history_id']: output_deadlines[output['id']] for output in outputs})
+    _set_deadlines(deadlines)
+
+    _timeline_changed(project.id)
     return True
 
+@transaction.atomic
 def set_phase_timeline(phase_id, deadline):
     """
     Set phase timeline with deadline and calculate output deadlines
+
+    Output deadlines are planned in memory over working days, in
+    proportion to their weight, and written with one bulk update, with a
+    deadline_change event for every deadline that moved.
     """
-    phase = Phase.objects.get(id=phase_id)
-    
-    # Update history record with deadline
-    history = History.objects.get(id=phase.history_id)
-    history.deadline = deadline
-    history.save()
-    
-    # Calculate output deadlines
-    outputs = Output.objects.filter(phase=phase)
-    total_outputs = outputs.count()
-    
-    if total_outputs > 0:
-        # Calculate time per output
-        now = datetime.now()
-        total_days = (deadline - now).days
-        days_per_output = max(1, total_days // total_outputs)
-        
-        # Set output deadlines
-        current_deadline = now
-        for i, output in enumerate(outputs):
-            # Last output gets the phase deadline
-            if i == total_outputs - 1:
-                output_deadline = deadline
-            else:
-                # Add days for this output
-                current_deadline += timedelta(days=days_per_output)
-                output_deadline = current_deadline
-            
-            # Update output history with deadline
-            output_history = History.objects.get(id=output.history_id)
-            output_history.deadline = output_deadline
-            output_history.save()
-    
+    deadline = _aware(deadline)
+    now = timezone.now()
+    phase = Phase.objects.select_related('ppap').get(id=phase_id)
+
+    outputs_by_phase, outputs = load_phase_outputs([phase.id])
+    weights = output_weights(outputs)
+    output_ids = outputs_by_phase.get(phase.id, [])
+
+    calendar = load_working_calendar(timezone.localtime(now).date(), timezone.localtime(deadline).date())
+    output_deadlines = dict(zip(output_ids, distribute_deadlines(
+        calendar, now, deadline, [weights[output_id] for output_id in output_ids]
+    )))
+
+    deadlines = {phase.history_id: deadline}
+    deadlines.update({output['history_id']: output_deadlines[output['id']] for output in outputs})
+    _set_deadlines(deadlines)
+
+    _timeline_changed(phase.ppap.project_id)
     return True
 
 def update_timeline_progress(entity_type, entity_id, status):
     """
     Update timeline progress based on status changes
     """
-    now = datetime.now()
+    now = timezone.now()
     
     if entity_type == 'project':
         project = Project.objects.get(id=entity_id)
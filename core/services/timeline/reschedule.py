@@ -0,0 +1,222 @@
+# Incremental reschedule of downstream deadlines
+from datetime import timedelta
+from itertools import groupby
+from django.db import transaction
+from django.db.models import DateTimeField, OuterRef, Subquery
+from core.models import Phase, Output, History
+from core.services.history.phase import record_phase_deadline_change
+from core.services.history.output import record_output_deadline_change
+from core.services.history.editor import set_history_deadlines
+from core.services.timeline.functions import HISTORY_BATCH_SIZE, _timeline_changed
+
+def _history_field(field):
+    return Subquery(
+        History.objects.filter(id=OuterRef('history_id')).values(field)[:1],
+        output_field=DateTimeField()
+    )
+
+def deadline_dependencies(phases, outputs):
+    """
+    Build the deadline dependencies of a PPAP
+
+    Edges carry the lag to keep between the two deadlines: an output must
+    end before its phase (lag 0); phases of the next order, their outputs
+    and outputs depending on another output (template configuration
+    "depends_on", OutputTemplate IDs or names) keep their current gap.
+    Entities without a deadline are left out.
+
+    Args:
+        phases (list): Phase rows (id, order, deadline), in order
+        outputs (list): Output rows (id, phase_id, template_id,
+            template_name, configuration, deadline)
+
+    Returns:
+        tuple: ({node: deadline}, {node: [(successor, lag, contains)]},
+            {phase node: [output nodes]}), nodes being ('phase', id) or
+            ('output', id) and contains telling output -> phase edges apart
+    """
+    deadlines = {('phase', phase['id']): phase['deadline'] for phase in phases if phase['deadline']}
+    deadlines.update({('output', output['id']): output['deadline'] for output in outputs if output['deadline']})
+    successors = {node: [] for node in deadlines}
+
+    def link(node, successor, contains=False):
+        if node in deadlines and successor in deadlines and node != successor:
+            lag = timedelta(0) if contains else deadlines[successor] - deadlines[node]
+            successors[node].append((successor, lag, contains))
+
+    outputs_by_phase = {}
+    members = {}
+    for output in outputs:
+        outputs_by_phase.setdefault(output['phase_id'], []).append(output)
+        members.setdefault(('phase', output['phase_id']), []).append(('output', output['id']))
+        link(('output', output['id']), ('phase', output['phase_id']), contains=True)
+
+    previous_group = []
+    for _, group in groupby(phases, key=lambda phase: phase['order']):
+        group = list(group)
+        for previous in previous_group:
+            for phase in group:
+                link(('phase', previous['id']), ('phase', phase['id']))
+                for output in outputs_by_phase.get(phase['id'], []):
+                    link(('phase', previous['id']), ('output', output['id']))
+        previous_group = group
+
+    nodes_by_template = {}
+    for output in outputs:
+        nodes_by_template.setdefault(output['template_id'], []).append(('output', output['id']))
+        nodes_by_template.setdefault(output['template_name'], []).append(('output', output['id']))
+
+    for output in outputs:
+        configuration = output['configuration'] if isinstance(output['configuration'], dict) else {}
+        depends_on = configuration.get('depends_on', [])
+        for dependency in depends_on if isinstance(depends_on, list) else [depends_on]:
+            for predecessor in nodes_by_template.get(dependency, []):
+                link(predecessor, ('output', output['id']))
+
+    return deadlines, successors, members
+
+def propagate_deadline(deadlines, successors, members, node, deadline):
+    """
+    Move one deadline and shift the dependent deadlines, in memory
+
+    A later deadline pushes its successors as far as needed to keep their
+    lag, transitively. An earlier phase deadline pulls the following
+    phases and dependent outputs back by as much and brings its own
+    outputs back within it; an earlier output deadline moves nothing else.
+    Only the affected part of the graph is visited.
+
+    Args:
+        deadlines (dict): Current deadlines, see deadline_dependencies
+        successors (dict): Dependencies, see deadline_dependencies
+        members (dict): Outputs of every phase, see deadline_dependencies
+        node (tuple): ('phase', id) or ('output', id) being moved
+        deadline (datetime): New deadline of node
+
+    Returns:
+        dict: {node: new deadline} of every deadline that changed
+    """
+    changed = {node: deadline}
+    old = deadlines.get(node)
+    if old is None:
+        return changed
+
+    if deadline >= old:
+        pending = [node]
+        while pending:
+            current = pending.pop()
+            for successor, lag, _ in successors.get(current, ()):
+                candidate = changed[current] + lag
+                if candidate > changed.get(successor, deadlines[successor]):
+                    changed[successor] = candidate
+                    pending.append(successor)
+        return changed
+
+    if node[0] == 'output':
+        return changed
+
+    shift = deadline - old
+    pending = [node]
+    while pending:
+        current = pending.pop()
+        for successor, _, contains in successors.get(current, ()):
+            if not contains and successor not in changed:
+                changed[successor] = deadlines[successor] + shift
+                pending.append(successor)
+
+    # Outputs of the phase cannot end after it
+    for output in members.get(node, ()):
+        if output in deadlines and deadlines[output] > deadline:
+            changed[output] = deadline
+    return changed
+
+def _load_ppap_deadlines(ppap_id):
+    """Phase and output rows of a PPAP with their deadlines, in two queries"""
+    phases = [
+        {'id': phase_id, 'history_id': history_id, 'order': order, 'deadline': deadline}
+        for phase_id, history_id, order, deadline in Phase.objects.filter(ppap_id=ppap_id).annotate(
+            deadline=_history_field('deadline')
+        ).order_by('template__order', 'id').values_list('id', 'history_id', 'template__order', 'deadline')
+    ]
+    outputs = [
+        {
+            'id': output_id, 'history_id': history_id, 'phase_id': phase_id, 'template_id': template_id,
+            'template_name': template_name, 'configuration': configuration, 'deadline': deadline
+        }
+        for output_id, history_id, phase_id, template_id, template_name, configuration, deadline in
+        Output.objects.filter(phase__ppap_id=ppap_id).annotate(
+            deadline=_history_field('deadline')
+        ).order_by('id').values_list(
+            'id', 'history_id', 'phase_id', 'template_id', 'template__name', 'template__configuration', 'deadline'
+        )
+    ]
+    return phases, outputs
+
+@transaction.atomic
+def reschedule_deadline(entity_type, entity_id, deadline):
+    """
+    Change the deadline of a phase or output and shift what depends on it
+
+    The moved entity gets its deadline change event; shifted entities are
+    written with one History bulk update and one bulk insert of their
+    deadline_change events (see propagate_deadline for the rules).
+
+    Args:
+        entity_type (str): 'phase' or 'output'
+        entity_id (int): Entity ID
+        deadline (datetime): New deadline (aware)
+
+    Returns:
+        dict: changes (entity_type, entity_id, old_deadline, new_deadline
+            of every changed deadline) and changed_count
+
+    Raises:
+        ValueError: If the entity type is not supported
+        Phase.DoesNotExist, Output.DoesNotExist: If the entity does not exist
+    """
+    if entity_type == 'phase':
+        entity = Phase.objects.select_related('ppap').get(id=entity_id)
+        ppap = entity.ppap
+    elif entity_type == 'output':
+        entity = Output.objects.select_related('template', 'phase__ppap').get(id=entity_id)
+        ppap = entity.phase.ppap
+    else:
+        raise ValueError(f"Unsupported entity_type: {entity_type}")
+
+    phases, outputs = _load_ppap_deadlines(ppap.id)
+    deadlines, successors, members = deadline_dependencies(phases, outputs)
+    node = (entity_type, entity.id)
+    changed = propagate_deadline(deadlines, successors, members, node, deadline)
+
+    history_ids = {('phase', phase['id']): phase['history_id'] for phase in phases}
+    history_ids.update({('output', output['id']): output['history_id'] for output in outputs})
+
+    # The moved entity is recorded with its event, the rest in bulk
+    if entity_type == 'phase':
+        record_phase_deadline_change(entity, deadlines.get(node), deadline)
+    else:
+        record_output_deadline_change(entity, deadlines.get(node), deadline)
+
+    set_history_deadlines(
+        {history_ids[key]: value for key, value in changed.items() if key != node},
+        batch_size=HISTORY_BATCH_SIZE
+    )
+
+    _timeline_changed(ppap.project_id)
+
+    changes = [
+        {
+            "entity_type": key[0],
+            "entity_id": key[1],
+            "old_deadline": deadlines.get(key),
+            "new_deadline": value
+        }
+        for key, value in sorted(changed.items())
+        if value != deadlines.get(key)
+    ]
+    return {
+        "entity_type": entity_type,
+        "entity_id": entity.id,
+        "deadline": deadline,
+        "changes": changes,
+        "changed_count": len(changes)
+    }
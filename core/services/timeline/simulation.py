@@ -0,0 +1,262 @@
+# What-if timeline simulation on an in-memory PPAP tree
+from django.db.models import DateTimeField, F, OuterRef, Subquery
+from django.utils import timezone
+from core.models import Project, Phase, Output, User, History
+from core.services.analyse.critical_path import (
+    CLOSED_OUTPUT_STATUSES, DEFAULT_OUTPUT_DURATION, template_duration_estimates
+)
+from core.services.statistics.snapshots import get_statistics_snapshot
+from core.services.timeline.functions import output_weights, plan_timeline
+from core.services.timeline.reschedule import deadline_dependencies, propagate_deadline
+from core.services.timeline.working_calendar import load_working_calendar
+
+# Seconds a loaded tree is reused; any change to the project discards it sooner
+TIMELINE_MODEL_TTL = 60
+
+COMPLETED_PHASE_STATUSES = ('Completed', 'Approved')
+
+def _history_field(field):
+    return Subquery(
+        History.objects.filter(id=OuterRef('history_id')).values(field)[:1],
+        output_field=DateTimeField()
+    )
+
+def _build_timeline_model(project_id):
+    """Load the PPAP tree of a project with its deadlines, weights and estimates"""
+    project = Project.objects.annotate(deadline=_history_field('deadline')).values(
+        'id', 'name', 'ppap_id', 'deadline'
+    ).get(id=project_id)
+
+    phases = list(Phase.objects.filter(ppap_id=project['ppap_id']).annotate(
+        deadline=_history_field('deadline'),
+        order=F('template__order'),
+        name=F('template__name')
+    ).order_by('order', 'id').values('id', 'order', 'name', 'status', 'responsible_id', 'deadline'))
+
+    outputs = list(Output.objects.filter(phase__ppap_id=project['ppap_id']).annotate(
+        deadline=_history_field('deadline'),
+        started_at=_history_field('started_at'),
+        template_name=F('template__name'),
+        phase_template_id=F('template__phase_id'),
+        configuration=F('template__configuration')
+    ).order_by('id').values(
+        'id', 'phase_id', 'template_id', 'template_name', 'phase_template_id', 'configuration',
+        'status', 'user_id', 'deadline', 'started_at'
+    ))
+
+    by_template, by_phase_template = template_duration_estimates({output['template_id'] for output in outputs})
+    estimates = {
+        output['id']: by_template.get(output['template_id'])
+        or by_phase_template.get(output['phase_template_id'])
+        or DEFAULT_OUTPUT_DURATION
+        for output in outputs
+    }
+
+    return {
+        'project': project,
+        'phases': phases,
+        'outputs': outputs,
+        'weights': output_weights(outputs),
+        'estimates': estimates,
+    }
+
+def load_timeline_model(project_id):
+    """
+    Get the in-memory timeline model of a project
+
+    The tree is loaded in a handful of queries and cached for
+    TIMELINE_MODEL_TTL seconds, keyed by the project's statistics version
+    so that any change to the project discards it.
+
+    Args:
+        project_id (int): Project ID
+
+    Returns:
+        dict: project, phases and outputs rows, output weights and
+            estimated durations (days)
+
+    Raises:
+        Project.DoesNotExist: If the project does not exist
+    """
+    return get_statistics_snapshot(
+        'timeline', project_id, project_id, lambda: _build_timeline_model(project_id),
+        timeout=TIMELINE_MODEL_TTL
+    )
+
+def assess_schedule_risk(model, deadlines, assignees, now):
+    """
+    Overdue and late-finish risk of a schedule
+
+    An open output is overdue when its deadline has passed and at risk
+    when its estimated remaining work (template duration minus the time
+    since it started) ends after its deadline.
+
+    Args:
+        model (dict): Timeline model, see load_timeline_model
+        deadlines (dict): {('phase'|'output', id): deadline}
+        assignees (dict): {output_id: user ID}
+        now (datetime): Reference time
+
+    Returns:
+        dict: Overdue and at-risk counts, overall and per assigned user
+    """
+    summary = {'overdue_outputs': 0, 'at_risk_outputs': 0, 'overdue_phases': 0}
+    by_user = {}
+
+    for output in model['outputs']:
+        if output['status'] in CLOSED_OUTPUT_STATUSES:
+            continue
+
+        remaining = model['estimates'][output['id']]
+        if output['started_at'] and output['status'] != 'Not Started':
+            remaining = max(remaining - (now - output['started_at']).total_seconds() / 86400, 0.0)
+        deadline = deadlines.get(('output', output['id']))
+        overdue = deadline is not None and deadline < now
+        at_risk = deadline is not None and not overdue and (deadline - now).total_seconds() / 86400 < remaining
+
+        user = by_user.setdefault(assignees.get(output['id']), {
+            'open_outputs': 0, 'remaining_days': 0.0, 'overdue_outputs': 0, 'at_risk_outputs': 0
+        })
+        user['open_outputs'] += 1
+        user['remaining_days'] += remaining
+        user['overdue_outputs'] += overdue
+        user['at_risk_outputs'] += at_risk
+        summary['overdue_outputs'] += overdue
+        summary['at_risk_outputs'] += at_risk
+
+    for phase in model['phases']:
+        deadline = deadlines.get(('phase', phase['id']))
+        if phase['status'] not in COMPLETED_PHASE_STATUSES and deadline is not None and deadline < now:
+            summary['overdue_phases'] += 1
+
+    summary['by_user'] = [
+        {'user_id': user_id, **counts, 'remaining_days': round(counts['remaining_days'], 2)}
+        for user_id, counts in sorted(by_user.items(), key=lambda item: (item[0] is None, item[0] or 0))
+    ]
+    return summary
+
+def simulate_timeline(project_id, project_deadline=None, phase_weights=None, deadline_changes=None,
+                      reassignments=None):
+    """
+    Apply proposed timeline changes to a project in memory
+
+    Changes are applied in order: a new project deadline replans every
+    phase and output over working days (see plan_timeline), optionally
+    with other phase weights; deadline changes are then propagated to
+    downstream entities (see propagate_deadline); reassignments change
+    the responsible of phases and outputs. Nothing is written.
+
+    Phase weights given without a new project deadline replan the project
+    up to its current deadline.
+
+    Args:
+        project_id (int): Project ID
+        project_deadline (datetime, optional): New project deadline
+        phase_weights (dict, optional): {phase_id: weight} used to replan
+        deadline_changes (list, optional): (entity_type, entity_id, deadline)
+            with entity_type 'phase' or 'output'
+        reassignments (list, optional): (entity_type, entity_id, user_id)
+
+    Returns:
+        dict: Resulting phase schedule, changed deadlines and assignees,
+            and the overdue risk of the current and simulated schedules
+
+    Raises:
+        Project.DoesNotExist: If the project does not exist
+        ValueError: If a change targets an entity outside the project, or
+            phase weights are given for a project without a deadline
+    """
+    now = timezone.now()
+    model = load_timeline_model(project_id)
+    phase_ids = [phase['id'] for phase in model['phases']]
+    known = {('phase', phase_id) for phase_id in phase_ids}
+    known.update(('output', output['id']) for output in model['outputs'])
+
+    def check(entity_type, entity_id):
+        if (entity_type, entity_id) not in known:
+            raise ValueError(f"{entity_type.capitalize()} {entity_id} is not part of project {project_id}")
+
+    baseline = {('phase', phase['id']): phase['deadline'] for phase in model['phases'] if phase['deadline']}
+    baseline.update({('output', output['id']): output['deadline'] for output in model['outputs'] if output['deadline']})
+    deadlines = dict(baseline)
+
+    for phase_id in phase_weights or {}:
+        check('phase', phase_id)
+
+    replan_deadline = project_deadline
+    if replan_deadline is None and phase_weights:
+        replan_deadline = model['project']['deadline']
+        if replan_deadline is None:
+            raise ValueError("phase_weights need a project_deadline, the project has no deadline")
+
+    if replan_deadline is not None:
+        outputs_by_phase = {}
+        for output in model['outputs']:
+            outputs_by_phase.setdefault(output['phase_id'], []).append(output['id'])
+        calendar = load_working_calendar(timezone.localtime(now).date(), timezone.localtime(replan_deadline).date())
+        phase_deadlines, output_deadlines = plan_timeline(
+            calendar, now, replan_deadline, phase_ids, outputs_by_phase, model['weights'], phase_weights
+        )
+        deadlines.update({('phase', phase_id): value for phase_id, value in phase_deadlines.items()})
+        deadlines.update({('output', output_id): value for output_id, value in output_deadlines.items()})
+
+    for entity_type, entity_id, deadline in deadline_changes or []:
+        check(entity_type, entity_id)
+        phases = [{**phase, 'deadline': deadlines.get(('phase', phase['id']))} for phase in model['phases']]
+        outputs = [{**output, 'deadline': deadlines.get(('output', output['id']))} for output in model['outputs']]
+        current, successors, members = deadline_dependencies(phases, outputs)
+        deadlines.update(propagate_deadline(current, successors, members, (entity_type, entity_id), deadline))
+
+    phase_responsible = {phase['id']: phase['responsible_id'] for phase in model['phases']}
+    output_users = {output['id']: output['user_id'] for output in model['outputs']}
+    user_ids = {user_id for _, _, user_id in reassignments or [] if user_id is not None}
+    existing_users = set(User.objects.filter(id__in=user_ids).values_list('id', flat=True)) if user_ids else set()
+    reassigned = []
+    for entity_type, entity_id, user_id in reassignments or []:
+        check(entity_type, entity_id)
+        if user_id is not None and user_id not in existing_users:
+            raise ValueError(f"User {user_id} not found")
+        assignees = phase_responsible if entity_type == 'phase' else output_users
+        reassigned.append({
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "old_user_id": assignees[entity_id],
+            "new_user_id": user_id
+        })
+        assignees[entity_id] = user_id
+
+    changes = [
+        {
+            "entity_type": key[0],
+            "entity_id": key[1],
+            "old_deadline": baseline.get(key),
+            "new_deadline": value
+        }
+        for key, value in sorted(deadlines.items())
+        if value != baseline.get(key)
+    ]
+
+    return {
+        "project_id": model['project']['id'],
+        "project_name": model['project']['name'],
+        "project_deadline": project_deadline or model['project']['deadline'],
+        "phases": [
+            {
+                "phase_id": phase['id'],
+                "name": phase['name'],
+                "status": phase['status'],
+                "responsible_id": phase_responsible[phase['id']],
+                "current_deadline": phase['deadline'],
+                "deadline": deadlines.get(('phase', phase['id']))
+            }
+            for phase in model['phases']
+        ],
+        "changes": changes,
+        "reassignments": reassigned,
+        "risk": {
+            "current": assess_schedule_risk(
+                model, baseline, {output['id']: output['user_id'] for output in model['outputs']}, now
+            ),
+            "simulated": assess_schedule_risk(model, deadlines, output_users, now)
+        }
+    }
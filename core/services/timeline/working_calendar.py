@@ -0,0 +1,106 @@
+# Business-day calendar and proportional deadline distribution
+from bisect import bisect_right
+from datetime import date, datetime
+from django.conf import settings
+from django.utils import timezone
+
+# Days of the week that are not worked (Monday is 0)
+DEFAULT_WEEKEND_DAYS = (5, 6)
+
+class WorkingCalendar:
+    """
+    Working days of a date range, as a sorted list of day ordinals
+
+    Weekends and holidays are left out when the calendar is built, so
+    offsets and counts are binary searches in O(log n).
+    """
+
+    def __init__(self, start, end, weekend_days=DEFAULT_WEEKEND_DAYS, holidays=()):
+        holidays = {holiday.toordinal() for holiday in holidays}
+        self.days = [
+            ordinal for ordinal in range(start.toordinal(), end.toordinal() + 1)
+            if ordinal not in holidays and date.fromordinal(ordinal).weekday() not in weekend_days
+        ]
+
+    def is_working_day(self, day):
+        """Whether a date is a working day of the calendar"""
+        index = bisect_right(self.days, day.toordinal())
+        return index > 0 and self.days[index - 1] == day.toordinal()
+
+    def count_between(self, start, end):
+        """Number of working days after start, up to and including end"""
+        return max(bisect_right(self.days, end.toordinal()) - bisect_right(self.days, start.toordinal()), 0)
+
+    def add_working_days(self, start, count):
+        """
+        Get the count-th working day after a date
+
+        Args:
+            start (date): Date to count from (excluded)
+            count (int): Working days to add, at least 1
+
+        Returns:
+            date: The working day, or the last one of the calendar
+        """
+        index = min(bisect_right(self.days, start.toordinal()) + count - 1, len(self.days) - 1)
+        return date.fromordinal(self.days[index]) if index >= 0 else start
+
+def load_working_calendar(start, end):
+    """
+    Build the working calendar of a date range from the settings
+
+    Weekend days come from TIMELINE_WEEKEND_DAYS (defaults to Saturday and
+    Sunday) and plant holidays from TIMELINE_HOLIDAYS (ISO dates).
+
+    Args:
+        start (date): First day
+        end (date): Last day
+
+    Returns:
+        WorkingCalendar: The calendar
+    """
+    return WorkingCalendar(
+        start, end,
+        weekend_days=tuple(getattr(settings, 'TIMELINE_WEEKEND_DAYS', DEFAULT_WEEKEND_DAYS)),
+        holidays=[date.fromisoformat(str(day)) for day in getattr(settings, 'TIMELINE_HOLIDAYS', [])]
+    )
+
+def distribute_deadlines(calendar, start, deadline, weights):
+    """
+    Split the working days between two times among consecutive items
+
+    Item k ends after the share of working days given by the cumulative
+    weight of items 0..k, at the time of day of the deadline; the last
+    item ends on the deadline itself. Every item gets at least one working
+    day while there are enough of them.
+
+    Args:
+        calendar (WorkingCalendar): Calendar covering start to deadline
+        start (datetime): Start of the first item
+        deadline (datetime): Deadline of the last item
+        weights (list): Positive weight of every item, in order
+
+    Returns:
+        list: Deadline of every item, in order
+    """
+    if not weights:
+        return []
+
+    start_date = timezone.localtime(start).date()
+    local_deadline = timezone.localtime(deadline)
+    available = calendar.count_between(start_date, local_deadline.date())
+    if available == 0:
+        return [deadline] * len(weights)
+
+    total = sum(weights)
+    deadlines = []
+    cumulative = 0.0
+    for position, weight in enumerate(weights[:-1]):
+        cumulative += weight
+        days = min(max(round(available * cumulative / total), position + 1), available)
+        day = calendar.add_working_days(start_date, days)
+        deadlines.append(min(
+            timezone.make_aware(datetime.combine(day, local_deadline.time()), local_deadline.tzinfo),
+            deadline
+        ))
+    return deadlines + [deadline]
@@ -0,0 +1,55 @@
+# Signal receivers of the core app
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from core.models import PhaseTemplate, OutputTemplate, PPAPElement, Project, Phase, Output, Document, Todo, History
+from core.services.template.plan import invalidate_template_plans
+from core.services.statistics.snapshots import (
+    project_id_for, project_id_for_history, bump_statistics_version_on_commit
+)
+
+@receiver(post_save, sender=PPAPElement)
+def sync_element_levels(sender, instance, raw=False, **kwargs):
+    """Keep the normalized level rows in line with PPAPElement.level"""
+    if not raw:
+        instance.sync_levels()
+
+@receiver([post_save, post_delete], sender=PhaseTemplate)
+@receiver([post_save, post_delete], sender=OutputTemplate)
+@receiver([post_save, post_delete], sender=PPAPElement)
+def template_changed(sender, **kwargs):
+    """
+    Discard cached template plans when templates or PPAP elements change
+    
+    Registered after sync_element_levels so the level rows are already
+    up to date when plans are rebuilt.
+    """
+    invalidate_template_plans()
+
+@receiver([post_save, post_delete], sender=Project)
+@receiver([post_save, post_delete], sender=Output)
+@receiver([post_save, post_delete], sender=Phase)
+@receiver([post_save, post_delete], sender=Document)
+@receiver([post_save, post_delete], sender=Todo)
+@receiver([post_save, post_delete], sender=History)
+def statistics_changed(sender, instance, raw=False, **kwargs):
+    """
+    Discard the cached statistics snapshots of the affected project
+    
+    The project version also versions the calendar feeds. Outputs are
+    resolved through their phase, phases through their PPAP, documents and
+    todos through their output, so the entity itself need not exist
+    anymore on delete.
+    """
+    if raw:
+        return
+    if sender is Project:
+        project_id = instance.id
+    elif sender is Output:
+        project_id = project_id_for('phase', instance.phase_id)
+    elif sender is Phase:
+        project_id = project_id_for('ppap', instance.ppap_id)
+    elif sender in (Document, Todo):
+        project_id = project_id_for('output', instance.output_id)
+    else:
+        project_id = project_id_for_history(instance)
+    bump_statistics_version_on_commit(project_id)
@@ -0,0 +1,126 @@
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+from core.models import (
+    Authorization, Client, Output, OutputTemplate, Person, Phase, PhaseTemplate, PPAP, PPAPElement, Project, Team,
+    User
+)
+from core.services.analyse.critical_path import (
+    DEFAULT_OUTPUT_DURATION, compute_critical_path, schedule_network, topological_order
+)
+
+
+class TopologicalOrderTests(SimpleTestCase):
+
+    def test_predecessors_come_first(self):
+        predecessors = {'c': ['a', 'b'], 'b': ['a']}
+
+        order, successors = topological_order(['c', 'b', 'a'], predecessors)
+
+        self.assertEqual(order, ['a', 'b', 'c'])
+        successors = {node: sorted(nodes) for node, nodes in successors.items()}
+        self.assertEqual(successors, {'a': ['b', 'c'], 'b': ['c'], 'c': []})
+
+    def test_cycle_is_reported_with_its_nodes(self):
+        predecessors = {'b': ['a', 'c'], 'c': ['b'], 'd': ['c']}
+
+        # Nodes after the cycle are reported with it, nodes before it are not
+        with self.assertRaisesRegex(ValueError, r'^Dependency cycle between b, c, d$'):
+            topological_order(['a', 'b', 'c', 'd'], predecessors)
+
+
+class ScheduleNetworkTests(SimpleTestCase):
+
+    def test_chain_has_no_slack(self):
+        times = schedule_network({'a': 2.0, 'b': 3.0}, {'b': ['a']})
+
+        self.assertEqual(times['b']['earliest_start'], 2.0)
+        self.assertEqual(times['b']['earliest_finish'], 5.0)
+        self.assertEqual(times['a']['slack'], 0.0)
+        self.assertEqual(times['b']['slack'], 0.0)
+
+    def test_parallel_activities_get_the_slack_of_the_longest(self):
+        # Two outputs of one phase feed its zero-duration milestone
+        times = schedule_network({'a': 2.0, 'b': 5.0, 'phase': 0.0}, {'phase': ['a', 'b']})
+
+        self.assertEqual(times['a']['slack'], 3.0)
+        self.assertEqual(times['a']['latest_start'], 3.0)
+        self.assertEqual(times['b']['slack'], 0.0)
+        self.assertEqual(times['phase']['earliest_start'], 5.0)
+
+    def test_depends_on_edge_moves_the_critical_path(self):
+        durations = {'start': 1.0, 'x': 2.0, 'y': 4.0, 'z': 3.0, 'end': 0.0}
+        predecessors = {'x': ['start'], 'y': ['start'], 'z': ['start'], 'end': ['x', 'y', 'z']}
+
+        self.assertEqual(schedule_network(durations, predecessors)['z']['slack'], 1.0)
+
+        # z depends on x: start, x, z (6 days) is now longer than start, y
+        predecessors['z'] = ['start', 'x']
+        times = schedule_network(durations, predecessors)
+
+        self.assertEqual(times['z']['earliest_start'], 3.0)
+        self.assertEqual(times['end']['earliest_finish'], 6.0)
+        self.assertEqual(times['x']['slack'], 0.0)
+        self.assertEqual(times['y']['slack'], 1.0)
+
+    def test_cycle_raises(self):
+        with self.assertRaises(ValueError):
+            schedule_network({'a': 1.0, 'b': 1.0}, {'a': ['b'], 'b': ['a']})
+
+    def test_empty_network(self):
+        self.assertEqual(schedule_network({}, {}), {})
+
+
+class ProjectCriticalPathTests(TestCase):
+    """Output templates listing each other under depends_on"""
+
+    def setUp(self):
+        authorization = Authorization.objects.create(name='admin')
+        self.user = User.objects.create_user(
+            username='user', password='x', authorization=authorization,
+            person=Person.objects.create(first_name='First', last_name='Last')
+        )
+        team = Team.objects.create(name='Team')
+        client = Client(name='Client', address='Address', team=team)
+        client.save()
+        self.project = Project.objects.create(name='Project', client=client, team=team)
+        self.ppap = PPAP.objects.create(project=self.project, level=3)
+        phase_template = PhaseTemplate.objects.create(name='Phase', order=1)
+        phase = Phase.objects.create(template=phase_template, ppap=self.ppap)
+        element = PPAPElement.objects.create(name='Element', level='3')
+        self.templates = {}
+        for name in ('A', 'B'):
+            self.templates[name] = OutputTemplate.objects.create(name=name, phase=phase_template, ppap_element=element)
+            Output.objects.create(template=self.templates[name], phase=phase)
+
+    def _depends(self, name, dependency):
+        self.templates[name].configuration = {'depends_on': [dependency]}
+        self.templates[name].save()
+
+    def test_dependent_output_starts_after_its_dependency(self):
+        self._depends('B', 'A')
+
+        (phase,) = compute_critical_path(self.ppap)['schedule']
+        outputs = {output['output_name']: output for output in phase['outputs']}
+
+        self.assertEqual(outputs['B']['earliest_start'], DEFAULT_OUTPUT_DURATION)
+        self.assertTrue(outputs['A']['is_critical'])
+        self.assertTrue(outputs['B']['is_critical'])
+
+    def test_dependency_cycle_returns_400(self):
+        self._depends('A', 'B')
+        self._depends('B', 'A')
+        api = APIClient()
+        api.force_authenticate(self.user)
+
+        response = api.get('/api/analyse/critical_path/', {'project_id': self.project.id})
+
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertIn('cycle', response.data['error'])
+
+    def test_unknown_project_returns_404(self):
+        api = APIClient()
+        api.force_authenticate(self.user)
+
+        response = api.get('/api/analyse/critical_path/', {'project_id': self.project.id + 1})
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,90 @@
+from datetime import timedelta
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from core.models import (
+    Authorization, Client, History, Output, OutputTemplate, Person, Phase, PhaseTemplate, PPAP, PPAPElement, Project,
+    Team, User
+)
+from core.services.analyse.durations import (
+    DEFAULT_BOTTLENECK_DAYS, MIN_BOTTLENECK_SAMPLES, bottleneck_threshold, get_output_template_durations,
+    percentile, refresh_duration_statistics
+)
+
+
+class BottleneckThresholdTests(SimpleTestCase):
+
+    def test_percentile_interpolates_between_ranks(self):
+        values = [float(day) for day in range(1, 11)]
+
+        self.assertAlmostEqual(percentile(values, 0.9), 9.1)
+        self.assertEqual(percentile(values, 0.5), 5.5)
+        self.assertIsNone(percentile([], 0.9))
+
+    def test_p90_is_used_with_enough_samples(self):
+        self.assertEqual(bottleneck_threshold({'count': MIN_BOTTLENECK_SAMPLES, 'p90': 9.1}), 9.1)
+
+    def test_default_is_used_with_too_few_samples(self):
+        statistics = {'count': MIN_BOTTLENECK_SAMPLES - 1, 'p90': 3.0}
+
+        self.assertEqual(bottleneck_threshold(statistics), DEFAULT_BOTTLENECK_DAYS)
+        self.assertEqual(bottleneck_threshold(None), DEFAULT_BOTTLENECK_DAYS)
+
+
+class PhaseBottleneckTests(TestCase):
+    """An in-progress output is a bottleneck past the p90 of its template"""
+
+    def setUp(self):
+        self.now = timezone.now()
+        self.user = User.objects.create_user(
+            username='user', password='x', authorization=Authorization.objects.create(name='admin'),
+            person=Person.objects.create(first_name='First', last_name='Last')
+        )
+        team = Team.objects.create(name='Team')
+        client = Client(name='Client', address='Address', team=team)
+        client.save()
+        ppap = PPAP.objects.create(project=Project.objects.create(name='Project', client=client, team=team), level=3)
+        phase_template = PhaseTemplate.objects.create(name='Phase', order=1)
+        self.phase = Phase.objects.create(template=phase_template, ppap=ppap)
+        self.template = OutputTemplate.objects.create(
+            name='Output', phase=phase_template, ppap_element=PPAPElement.objects.create(name='Element', level='3')
+        )
+        self.in_progress = self._output('In Progress', started_days_ago=10)
+
+    def _output(self, status, started_days_ago, duration=None):
+        output = Output.objects.create(template=self.template, phase=self.phase, status=status)
+        started_at = self.now - timedelta(days=started_days_ago)
+        History.objects.create(
+            id=output.history_id, title='Output', event='[]', table_name='output', started_at=started_at,
+            finished_at=started_at + timedelta(days=duration) if duration is not None else None
+        )
+        return output
+
+    def _complete(self, durations):
+        for duration in durations:
+            self._output('Completed', started_days_ago=30, duration=duration)
+        refresh_duration_statistics(output_template_ids=[self.template.id])
+
+    def _bottlenecks(self):
+        api = APIClient()
+        api.force_authenticate(self.user)
+        response = api.get(f'/api/analyse/{self.phase.id}/phase/')
+        self.assertEqual(response.status_code, 200, response.content)
+        return [b for b in response.data['bottlenecks'] if b.get('output_id') == self.in_progress.id]
+
+    def test_output_past_the_p90_is_a_bottleneck(self):
+        self._complete(range(1, 11))
+
+        statistics = get_output_template_durations([self.template.id])[self.template.id]
+        self.assertEqual(statistics['count'], 10)
+        self.assertEqual(statistics['p90'], 9.1)
+
+        (bottleneck,) = self._bottlenecks()
+        self.assertEqual(bottleneck['days_in_progress'], 10)
+        self.assertEqual(bottleneck['expected_days'], 9.1)
+
+    def test_too_few_samples_fall_back_to_the_default(self):
+        # A p90 of 2 days from two samples would flag the output
+        self._complete([1, 2])
+
+        self.assertEqual(self._bottlenecks(), [])
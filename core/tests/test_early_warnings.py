@@ -0,0 +1,89 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from core.models import (
+    Authorization, Client, EarlyWarning, EarlyWarningRun, History, HistoryEvent, Output, OutputTemplate,
+    Person, Phase, PhaseTemplate, PPAP, PPAPElement, Project, Team, User
+)
+from core.services.analyse.early_warnings import EVENT_COMMIT_OVERLAP, refresh_early_warnings
+
+
+class RefreshEarlyWarningsTests(TestCase):
+    """Incremental refreshes pick up events from the last run's watermarks"""
+
+    def setUp(self):
+        team = Team.objects.create(name='Team')
+        client = Client(name='Client', address='Address', team=team)
+        client.save()
+        project = Project.objects.create(name='Project', client=client, team=team)
+        ppap = PPAP.objects.create(project=project, level=3)
+        phase_template = PhaseTemplate.objects.create(name='Phase', order=1)
+        responsible = User.objects.create_user(
+            username='user', password='x',
+            person=Person.objects.create(first_name='First', last_name='Last'),
+            authorization=Authorization.objects.create(name='admin')
+        )
+        phase = Phase.objects.create(template=phase_template, ppap=ppap, responsible=responsible)
+        element = PPAPElement.objects.create(name='Element', level='3')
+        self.output = Output.objects.create(
+            template=OutputTemplate.objects.create(name='Output', phase=phase_template, ppap_element=element),
+            phase=phase
+        )
+        History.objects.create(id=self.output.history_id, title='Output', event='[]', table_name='output')
+
+    def _reject(self, timestamp=None):
+        """Reject the output without a refresh, as a concurrent request would"""
+        Output.objects.filter(id=self.output.id).update(status='Rejected')
+        return HistoryEvent.objects.create(
+            history_id=self.output.history_id, type='status_change', details='Rejected',
+            timestamp=timestamp or timezone.now()
+        )
+
+    def _rejected(self):
+        return EarlyWarning.objects.filter(type='rejected_output', entity_id=str(self.output.id)).exists()
+
+    def _previous_run(self, started_at, last_event_id):
+        return EarlyWarningRun.objects.create(
+            full=True, started_at=started_at, finished_at=started_at, last_event_id=last_event_id
+        )
+
+    def test_first_run_is_full_and_next_run_without_events_evaluates_nothing(self):
+        first = refresh_early_warnings()
+        second = refresh_early_warnings()
+
+        self.assertTrue(first.full)
+        self.assertFalse(second.full)
+        self.assertEqual(second.evaluated, 0)
+        self.assertEqual(second.last_event_id, first.last_event_id)
+
+    def test_events_above_the_watermark_are_evaluated(self):
+        refresh_early_warnings()
+        event = self._reject()
+
+        run = refresh_early_warnings()
+
+        self.assertFalse(run.full)
+        self.assertEqual(run.last_event_id, event.id)
+        self.assertTrue(self._rejected())
+
+    def test_late_commit_within_the_overlap_is_picked_up(self):
+        # The event got an ID below the watermark, its transaction having
+        # committed after the previous run read the last event ID
+        now = timezone.now()
+        event = self._reject(timestamp=now - EVENT_COMMIT_OVERLAP / 2)
+        self._previous_run(now, event.id)
+
+        refresh_early_warnings()
+
+        self.assertTrue(self._rejected())
+
+    def test_late_commit_before_the_overlap_is_missed_until_a_full_refresh(self):
+        now = timezone.now()
+        event = self._reject(timestamp=now - EVENT_COMMIT_OVERLAP - timedelta(minutes=1))
+        self._previous_run(now, event.id)
+
+        refresh_early_warnings()
+        self.assertFalse(self._rejected())
+
+        refresh_early_warnings(full=True)
+        self.assertTrue(self._rejected())
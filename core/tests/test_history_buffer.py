@@ -0,0 +1,63 @@
+from django.db import transaction
+from django.test import TestCase
+from core.models import History, HistoryEvent
+from core.services.history.buffer import buffered_history
+from core.services.history.initialization import add_history_event, get_history_events, initialize_history
+
+
+class Failure(Exception):
+    pass
+
+
+class BufferedHistoryRollbackTests(TestCase):
+    """Writes buffered inside a savepoint that rolls back are not flushed"""
+
+    def _history(self, history_id):
+        return initialize_history(history_id, 'create', f'{history_id} created', 'note', history_id=history_id)
+
+    def test_caught_inner_failures_discard_their_writes(self):
+        with buffered_history():
+            self._history('outer-hist')
+            try:
+                with buffered_history():
+                    self._history('inner-hist')
+                    raise Failure()
+            except Failure:
+                pass
+            try:
+                with transaction.atomic():
+                    self._history('inner2-hist')
+                    raise Failure()
+            except Failure:
+                pass
+            self._history('after-hist')
+
+        self.assertEqual(sorted(History.objects.values_list('id', flat=True)), ['after-hist', 'outer-hist'])
+        self.assertEqual(
+            sorted(HistoryEvent.objects.values_list('history_id', flat=True)), ['after-hist', 'outer-hist']
+        )
+
+    def test_rolled_back_events_and_fields_of_existing_rows_are_discarded(self):
+        history = self._history('note-hist')
+
+        with buffered_history():
+            add_history_event(history, 'update', 'kept')
+            try:
+                with transaction.atomic():
+                    add_history_event(history, 'update', 'discarded')
+                    raise Failure()
+            except Failure:
+                pass
+
+        details = [event['details'] for event in get_history_events(History.objects.get(id='note-hist'))]
+        self.assertIn('kept', details)
+        self.assertNotIn('discarded', details)
+
+    def test_inner_block_that_completes_is_flushed_with_the_outer_one(self):
+        with buffered_history():
+            self._history('outer-hist')
+            with buffered_history():
+                self._history('inner-hist')
+            self.assertFalse(History.objects.filter(id='inner-hist').exists())
+
+        self.assertEqual(sorted(History.objects.values_list('id', flat=True)), ['inner-hist', 'outer-hist'])
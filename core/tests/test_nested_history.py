@@ -0,0 +1,84 @@
+from django.test import TestCase
+from django.utils import timezone
+from core.models import (
+    Authorization, Client, Document, History, HistoryEvent, Output, OutputTemplate, Person, Phase,
+    PhaseTemplate, PPAP, PPAPElement, Project, Team, User
+)
+from core.services.history.nested_history import load_nested_projects_history
+
+
+class LoadNestedProjectsHistoryTests(TestCase):
+    """The nested history is loaded with the same number of queries at any size"""
+
+    # Queries for phases, outputs, documents, team members, users, History and events
+    QUERY_COUNT = 7
+
+    def _history(self, instance, table_name):
+        History.objects.create(id=instance.history_id, title=str(instance.pk), event='[]', table_name=table_name)
+        HistoryEvent.objects.create(
+            history_id=instance.history_id, type='create', details=f'{table_name} created', timestamp=timezone.now()
+        )
+        return instance
+
+    def _build(self, projects, phases, outputs, documents, members):
+        """Create projects with phases x outputs x documents each, and a team of members"""
+        authorization = Authorization.objects.create(name='admin')
+        team = self._history(Team.objects.create(name='Team'), 'team')
+        for index in range(members):
+            person = self._history(Person.objects.create(first_name=f'First{index}', last_name=f'Last{index}'), 'person')
+            person.teams.add(team)
+            User.objects.create_user(
+                username=f'{team.id}-user{index}', password='x', person=person, authorization=authorization
+            )
+        client = Client(name='Client', address='Address', team=team)
+        client.save()
+        element = PPAPElement.objects.create(name='Element', level='3')
+
+        for project_index in range(projects):
+            project = self._history(
+                Project.objects.create(name=f'Project {project_index}', client=client, team=team), 'project'
+            )
+            ppap = self._history(PPAP.objects.create(project=project, level=3), 'ppap')
+            project.ppap = ppap
+            project.save()
+            for phase_index in range(phases):
+                phase_template = PhaseTemplate.objects.create(name=f'Phase {phase_index}', order=phase_index)
+                phase = self._history(Phase.objects.create(template=phase_template, ppap=ppap), 'phase')
+                for output_index in range(outputs):
+                    output_template = OutputTemplate.objects.create(
+                        name=f'Output {output_index}', phase=phase_template, ppap_element=element
+                    )
+                    output = self._history(Output.objects.create(template=output_template, phase=phase), 'output')
+                    for document_index in range(documents):
+                        self._history(Document.objects.create(
+                            name=f'Document {document_index}', file_path='doc.pdf', file_type='pdf',
+                            file_size=1, output=output, version='1'
+                        ), 'document')
+        return team
+
+    def _load(self, team):
+        projects = list(Project.objects.filter(team=team).select_related('ppap', 'team'))
+        with self.assertNumQueries(self.QUERY_COUNT):
+            return load_nested_projects_history(projects)
+
+    def test_small_tree(self):
+        team = self._build(projects=1, phases=1, outputs=1, documents=1, members=1)
+        histories = self._load(team)
+
+        (nested,) = histories.values()
+        self.assertEqual(len(nested['project']), 1)
+        self.assertEqual(nested['project'][0]['events'][0]['type'], 'create')
+
+    def test_large_tree(self):
+        team = self._build(projects=3, phases=4, outputs=5, documents=2, members=4)
+        histories = self._load(team)
+
+        self.assertEqual(len(histories), 3)
+        for nested in histories.values():
+            phases = nested['ppap']['phases']
+            self.assertEqual(len(phases), 4)
+            for phase in phases.values():
+                self.assertEqual(len(phase['outputs']), 5)
+                for output in phase['outputs'].values():
+                    self.assertEqual(len(output['documents']), 2)
+                    self.assertEqual(len(output['history']), 1)
@@ -0,0 +1,84 @@
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from core.models import (
+    Authorization, Client, History, HistoryEvent, Output, OutputTemplate, Person, Phase, PhaseTemplate, PPAP,
+    PPAPElement, Project, ProjectRollup, Team, User
+)
+from core.services.output.functions import add_document_to_output, update_output
+from core.services.project.rollup import rebuild_project_rollup
+
+
+class ProjectRollupTests(TestCase):
+    """Output status and document changes keep the project rollup up to date"""
+
+    def _history(self, instance, table_name):
+        History.objects.create(id=instance.history_id, title=str(instance.pk), event='[]', table_name=table_name)
+        HistoryEvent.objects.create(
+            history_id=instance.history_id, type='create', details=f'{table_name} created', timestamp=timezone.now()
+        )
+        return instance
+
+    def setUp(self):
+        authorization = Authorization.objects.create(name='admin')
+        team = Team.objects.create(name='Team')
+        person = Person.objects.create(first_name='First', last_name='Last')
+        self.user = User.objects.create_user(
+            username='user', password='x', person=person, authorization=authorization
+        )
+        client = Client(name='Client', address='Address', team=team)
+        client.save()
+        element = PPAPElement.objects.create(name='Element', level='3')
+
+        self.project = self._history(Project.objects.create(name='Project', client=client, team=team), 'project')
+        ppap = self._history(PPAP.objects.create(project=self.project, level=3), 'ppap')
+        phase_template = PhaseTemplate.objects.create(name='Phase', order=1)
+        self.phase = self._history(Phase.objects.create(template=phase_template, ppap=ppap), 'phase')
+        self.outputs = [
+            self._history(Output.objects.create(
+                template=OutputTemplate.objects.create(name=f'Output {index}', phase=phase_template, ppap_element=element),
+                phase=self.phase
+            ), 'output')
+            for index in range(2)
+        ]
+        rebuild_project_rollup(self.project.id)
+
+    def _rollup(self):
+        return ProjectRollup.objects.get(project_id=self.project.id)
+
+    def test_output_status_changes_move_counters_and_complete_the_phase(self):
+        update_output(self.outputs[0].id, {'status': 'In Progress'})
+
+        rollup = self._rollup()
+        self.assertEqual(rollup.outputs_by_status, {'Not Started': 1, 'In Progress': 1})
+        self.assertEqual(Phase.objects.get(id=self.phase.id).status, 'In Progress')
+        self.assertEqual(rollup.phases_completed, 0)
+
+        update_output(self.outputs[0].id, {'status': 'Completed'})
+        update_output(self.outputs[1].id, {'status': 'Completed'})
+
+        rollup = self._rollup()
+        self.assertEqual(rollup.outputs_by_status, {'Completed': 2})
+        self.assertEqual(rollup.outputs_total, 2)
+        self.assertEqual(Phase.objects.get(id=self.phase.id).status, 'Completed')
+        self.assertEqual(rollup.phases_completed, 1)
+
+    def test_added_documents_are_counted(self):
+        for index in range(2):
+            add_document_to_output(self.outputs[0].id, {
+                'name': f'Document {index}', 'file_path': 'doc.pdf', 'file_type': 'pdf', 'file_size': 1
+            }, self.user.id)
+
+        self.assertEqual(self._rollup().documents, 2)
+        self.assertEqual(rebuild_project_rollup(self.project.id).documents, 2)
+
+    def test_project_analysis_serves_rollup_counters(self):
+        update_output(self.outputs[0].id, {'status': 'Approved'})
+        api = APIClient()
+        api.force_authenticate(self.user)
+
+        response = api.get(f'/api/analyse/{self.project.id}/project/')
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data['counters']['outputs_by_status'], {'Not Started': 1, 'Approved': 1})
+        self.assertEqual(response.data['quality_metrics']['approval_rate'], 50)
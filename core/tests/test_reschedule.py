@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta, timezone
+from django.test import SimpleTestCase
+from core.services.timeline.reschedule import deadline_dependencies, propagate_deadline
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def day(offset):
+    return START + timedelta(days=offset)
+
+
+class PropagateDeadlineTests(SimpleTestCase):
+    """
+    Three phases in order, with outputs:
+
+        phase 1 (day 10): output 1 "A" (day 8)
+        phase 2 (day 20): output 2 "B" (day 15), output 3 "C" (day 18, depends on "A")
+        phase 3 (day 30): output 4 "D" (day 25)
+    """
+
+    def setUp(self):
+        phases = [
+            {'id': 1, 'order': 1, 'deadline': day(10)},
+            {'id': 2, 'order': 2, 'deadline': day(20)},
+            {'id': 3, 'order': 3, 'deadline': day(30)},
+        ]
+        outputs = [
+            {'id': 1, 'phase_id': 1, 'template_id': 11, 'template_name': 'A', 'configuration': {}, 'deadline': day(8)},
+            {'id': 2, 'phase_id': 2, 'template_id': 12, 'template_name': 'B', 'configuration': {}, 'deadline': day(15)},
+            {'id': 3, 'phase_id': 2, 'template_id': 13, 'template_name': 'C',
+             'configuration': {'depends_on': ['A']}, 'deadline': day(18)},
+            {'id': 4, 'phase_id': 3, 'template_id': 14, 'template_name': 'D', 'configuration': {}, 'deadline': day(25)},
+        ]
+        self.graph = deadline_dependencies(phases, outputs)
+
+    def move(self, node, deadline):
+        return propagate_deadline(*self.graph, node, deadline)
+
+    def test_later_phase_deadline_pushes_following_phases_and_outputs(self):
+        changed = self.move(('phase', 1), day(14))
+
+        self.assertEqual(changed, {
+            ('phase', 1): day(14),
+            ('phase', 2): day(24),
+            ('output', 2): day(19),
+            ('output', 3): day(22),
+            ('phase', 3): day(34),
+            ('output', 4): day(29),
+        })
+
+    def test_later_output_deadline_pushes_dependent_outputs_only(self):
+        # Output 3 depends on "A" with a 10-day gap and stays within phase 2
+        changed = self.move(('output', 1), day(9))
+
+        self.assertEqual(changed, {('output', 1): day(9), ('output', 3): day(19)})
+
+    def test_push_past_the_phase_extends_it(self):
+        changed = self.move(('output', 2), day(22))
+
+        self.assertEqual(changed[('phase', 2)], day(22))
+        self.assertEqual(changed[('phase', 3)], day(32))
+        self.assertEqual(changed[('output', 4)], day(27))
+
+    def test_earlier_phase_deadline_pulls_following_phases(self):
+        changed = self.move(('phase', 2), day(17))
+
+        self.assertEqual(changed[('phase', 3)], day(27))
+        self.assertEqual(changed[('output', 4)], day(22))
+
+    def test_earlier_phase_deadline_clamps_its_own_outputs(self):
+        changed = self.move(('phase', 2), day(17))
+
+        # Output 3 ended after the new deadline, output 2 already fits
+        self.assertEqual(changed[('output', 3)], day(17))
+        self.assertNotIn(('output', 2), changed)
+        self.assertNotIn(('phase', 1), changed)
+
+    def test_earlier_output_deadline_moves_nothing_else(self):
+        changed = self.move(('output', 2), day(12))
+
+        self.assertEqual(changed, {('output', 2): day(12)})
+
+    def test_entity_without_deadline_is_moved_alone(self):
+        deadlines, successors, members = self.graph
+        del deadlines[('output', 4)]
+
+        changed = propagate_deadline(deadlines, successors, members, ('output', 4), day(40))
+
+        self.assertEqual(changed, {('output', 4): day(40)})
+
+    def test_depends_on_accepts_template_ids(self):
+        phases = [{'id': 1, 'order': 1, 'deadline': day(10)}]
+        outputs = [
+            {'id': 1, 'phase_id': 1, 'template_id': 11, 'template_name': 'A', 'configuration': {}, 'deadline': day(4)},
+            {'id': 2, 'phase_id': 1, 'template_id': 12, 'template_name': 'B',
+             'configuration': {'depends_on': 11}, 'deadline': day(6)},
+        ]
+        deadlines, successors, members = deadline_dependencies(phases, outputs)
+
+        self.assertIn((('output', 2), timedelta(days=2), False), successors[('output', 1)])
+        changed = propagate_deadline(deadlines, successors, members, ('output', 1), day(7))
+        self.assertEqual(changed[('output', 2)], day(9))
@@ -0,0 +1,89 @@
+import math
+from datetime import timedelta
+import numpy as np
+from django.test import TestCase
+from django.utils import timezone
+from core.models import (
+    Client, DurationStatistics, History, Output, OutputTemplate, Phase, PhaseTemplate, PPAP, PPAPElement, Project,
+    Team
+)
+from core.services.analyse.critical_path import DEFAULT_OUTPUT_DURATION
+from core.services.analyse.schedule_risk import (
+    DEFAULT_LOG_SIGMA, Z_90, analyze_schedule_risk, simulate_ppap_completion
+)
+
+ITERATIONS = 20000
+SEED = 42
+
+
+class SimulatePPAPCompletionTests(TestCase):
+    """Seeded simulations of a one-phase PPAP"""
+
+    def setUp(self):
+        team = Team.objects.create(name='Team')
+        client = Client(name='Client', address='Address', team=team)
+        client.save()
+        self.project = Project.objects.create(name='Project', client=client, team=team)
+        History.objects.create(id=self.project.history_id, title='Project', event='[]', table_name='project')
+        self.ppap = PPAP.objects.create(project=self.project, level=3)
+        self.phase_template = PhaseTemplate.objects.create(name='Phase', order=1)
+        self.phase = Phase.objects.create(template=self.phase_template, ppap=self.ppap)
+        self.element = PPAPElement.objects.create(name='Element', level='3')
+
+    def _output(self, name, statistics=None, status='Not Started'):
+        template = OutputTemplate.objects.create(name=name, phase=self.phase_template, ppap_element=self.element)
+        if statistics:
+            DurationStatistics.objects.create(output_template=template, **statistics)
+        return Output.objects.create(template=template, phase=self.phase, status=status)
+
+    def _simulate(self):
+        return simulate_ppap_completion(self.ppap, ITERATIONS, seed=SEED)
+
+    def test_same_seed_gives_the_same_simulation(self):
+        self._output('A')
+
+        np.testing.assert_array_equal(self._simulate(), self._simulate())
+
+    def test_template_without_samples_uses_the_default_distribution(self):
+        self._output('A')
+
+        p50, p90 = np.percentile(self._simulate(), [50, 90])
+
+        self.assertAlmostEqual(p50 / DEFAULT_OUTPUT_DURATION, 1, delta=0.03)
+        expected_p90 = DEFAULT_OUTPUT_DURATION * math.exp(DEFAULT_LOG_SIGMA * Z_90)
+        self.assertAlmostEqual(p90 / expected_p90, 1, delta=0.03)
+
+    def test_closed_outputs_take_no_time(self):
+        self._output('A', status='Completed')
+
+        self.assertEqual(self._simulate().max(), 0.0)
+
+    def test_percentiles_are_ordered(self):
+        self._output('A', {'count': 10, 'mean': 12, 'p50': 10, 'p90': 20, 'p95': 25})
+        self._output('B')
+
+        results = analyze_schedule_risk(self.project.id, iterations=ITERATIONS, seed=SEED)
+
+        remaining = results['remaining_days']
+        self.assertLess(remaining['p50'], remaining['p80'])
+        self.assertLess(remaining['p80'], remaining['p95'])
+        self.assertLess(results['completion_dates']['p50'], results['completion_dates']['p95'])
+        # The phase ends with the later of its two parallel outputs
+        self.assertGreater(remaining['p50'], 10)
+
+    def test_probability_on_time_at_known_deadlines(self):
+        # Log-normal fitted to a median of 10 days and a p90 of 20 days
+        self._output('A', {'count': 10, 'mean': 12, 'p50': 10, 'p90': 20, 'p95': 25})
+
+        for days, expected in ((10, 0.5), (20, 0.9)):
+            deadline = timezone.now() + timedelta(days=days)
+            History.objects.filter(id=self.project.history_id).update(deadline=deadline)
+
+            results = analyze_schedule_risk(self.project.id, iterations=ITERATIONS, seed=SEED)
+
+            self.assertAlmostEqual(results['probability_on_time'], expected, delta=0.02)
+
+    def test_no_deadline_gives_no_probability(self):
+        self._output('A')
+
+        self.assertIsNone(analyze_schedule_risk(self.project.id, iterations=100, seed=SEED)['probability_on_time'])
@@ -0,0 +1,100 @@
+from django.db import connection, transaction
+from django.test import TransactionTestCase
+from core.models import Client, History, Phase, PhaseTemplate, PPAP, Project, Team
+from core.services.statistics.snapshots import (
+    bump_statistics_version, bump_statistics_version_on_commit, get_statistics_snapshot, project_id_for_history,
+    project_versions
+)
+
+
+class Failure(Exception):
+    pass
+
+
+class StatisticsVersionTests(TransactionTestCase):
+    """Project versions are bumped once per transaction and key the snapshots"""
+
+    def setUp(self):
+        team = Team.objects.create(name='Team')
+        client = Client(name='Client', address='Address', team=team)
+        client.save()
+        self.project = Project.objects.create(name='Project', client=client, team=team)
+        self.other = Project.objects.create(name='Other', client=client, team=team)
+
+    def _version(self, project):
+        return project_versions([project.id])[project.id]
+
+    def _pending_callbacks(self):
+        return len(connection.run_on_commit)
+
+    def test_bumps_are_registered_once_per_project(self):
+        with transaction.atomic():
+            for _ in range(3):
+                bump_statistics_version_on_commit(self.project.id)
+            bump_statistics_version_on_commit(self.other.id)
+            bump_statistics_version_on_commit(None)
+
+            self.assertEqual(self._pending_callbacks(), 2)
+
+    def test_bump_of_a_rolled_back_savepoint_does_not_suppress_later_bumps(self):
+        version = self._version(self.project)
+
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    bump_statistics_version_on_commit(self.project.id)
+                    raise Failure()
+            except Failure:
+                pass
+            bump_statistics_version_on_commit(self.project.id)
+
+            self.assertEqual(self._pending_callbacks(), 1)
+
+        self.assertNotEqual(self._version(self.project), version)
+
+    def test_bump_happens_at_commit_only(self):
+        version = self._version(self.project)
+        other_version = self._version(self.other)
+
+        with transaction.atomic():
+            bump_statistics_version_on_commit(self.project.id)
+            self.assertEqual(self._version(self.project), version)
+
+        self.assertNotEqual(self._version(self.project), version)
+        self.assertEqual(self._version(self.other), other_version)
+
+    def test_snapshots_are_recomputed_after_a_bump(self):
+        computed = []
+
+        def compute():
+            computed.append(1)
+            return {'count': len(computed)}
+
+        def snapshot():
+            return get_statistics_snapshot('project', self.project.id, self.project.id, compute)
+
+        self.assertEqual(snapshot(), {'count': 1})
+        self.assertEqual(snapshot(), {'count': 1})
+
+        bump_statistics_version(self.other.id)
+        self.assertEqual(snapshot(), {'count': 1})
+
+        bump_statistics_version(self.project.id)
+        self.assertEqual(snapshot(), {'count': 2})
+
+    def test_phase_save_bumps_its_project(self):
+        ppap = PPAP.objects.create(project=self.project, level=3)
+        version = self._version(self.project)
+
+        Phase.objects.create(template=PhaseTemplate.objects.create(name='Phase', order=1), ppap=ppap)
+
+        self.assertNotEqual(self._version(self.project), version)
+
+    def test_project_of_a_history_record_is_looked_up_once(self):
+        ppap = PPAP.objects.create(project=self.project, level=3)
+        phase = Phase.objects.create(template=PhaseTemplate.objects.create(name='Phase', order=1), ppap=ppap)
+        history = History(id=phase.history_id, title='Phase', event='[]', table_name='phase')
+
+        with self.assertNumQueries(1):
+            self.assertEqual(project_id_for_history(history), self.project.id)
+            self.assertEqual(project_id_for_history(history), self.project.id)
@@ -0,0 +1,56 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from core.models import (
+    Client, History, Output, OutputTemplate, Phase, PhaseTemplate, PPAP, PPAPElement, Project, Team
+)
+from core.services.timeline.simulation import simulate_timeline
+
+
+class SimulatePhaseWeightsTests(TestCase):
+    """Phase weights without a new project deadline replan up to the current one"""
+
+    def setUp(self):
+        team = Team.objects.create(name='Team')
+        client = Client(name='Client', address='Address', team=team)
+        client.save()
+        self.project = Project.objects.create(name='Project', client=client, team=team)
+        ppap = PPAP.objects.create(project=self.project, level=3)
+        self.project.ppap = ppap
+        self.project.save()
+        self.deadline = timezone.now().replace(microsecond=0) + timedelta(days=60)
+        History.objects.create(
+            id=self.project.history_id, title='Project', event='[]', table_name='project', deadline=self.deadline
+        )
+
+        element = PPAPElement.objects.create(name='Element', level='3')
+        self.phases = []
+        for order in (1, 2):
+            phase_template = PhaseTemplate.objects.create(name=f'Phase {order}', order=order)
+            phase = Phase.objects.create(template=phase_template, ppap=ppap)
+            output_template = OutputTemplate.objects.create(
+                name=f'Output {order}', phase=phase_template, ppap_element=element
+            )
+            output = Output.objects.create(template=output_template, phase=phase)
+            for entity, table_name in ((phase, 'phase'), (output, 'output')):
+                History.objects.create(id=entity.history_id, title=table_name, event='[]', table_name=table_name)
+            self.phases.append(phase)
+
+    def _phase_deadlines(self, **changes):
+        return [phase['deadline'] for phase in simulate_timeline(self.project.id, **changes)['phases']]
+
+    def test_weights_replan_up_to_the_current_deadline(self):
+        weights = {self.phases[0].id: 3, self.phases[1].id: 1}
+
+        deadlines = self._phase_deadlines(phase_weights=weights)
+
+        self.assertEqual(deadlines, self._phase_deadlines(project_deadline=self.deadline, phase_weights=weights))
+        self.assertEqual(deadlines[1], self.deadline)
+        # The first phase gets about three quarters of the time
+        self.assertGreater(deadlines[0], timezone.now() + timedelta(days=40))
+
+    def test_weights_without_any_deadline_are_rejected(self):
+        History.objects.filter(id=self.project.history_id).update(deadline=None)
+
+        with self.assertRaisesRegex(ValueError, 'project_deadline'):
+            simulate_timeline(self.project.id, phase_weights={self.phases[0].id: 2})
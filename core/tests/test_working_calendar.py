@@ -0,0 +1,87 @@
+from datetime import date, datetime, timezone
+from django.test import SimpleTestCase, override_settings
+from core.services.timeline.working_calendar import WorkingCalendar, distribute_deadlines, load_working_calendar
+
+# January 2025: the 1st is a Wednesday, weekends fall on 4-5, 11-12, 18-19 and 25-26
+NEW_YEAR = date(2025, 1, 1)
+
+
+def at(day, hour):
+    return datetime(2025, 1, day, hour, tzinfo=timezone.utc)
+
+
+@override_settings(TIME_ZONE='UTC')
+class WorkingCalendarTests(SimpleTestCase):
+
+    def setUp(self):
+        self.calendar = WorkingCalendar(date(2025, 1, 1), date(2025, 1, 31), holidays=[NEW_YEAR])
+
+    def test_weekends_and_holidays_are_skipped(self):
+        self.assertFalse(self.calendar.is_working_day(NEW_YEAR))
+        self.assertFalse(self.calendar.is_working_day(date(2025, 1, 4)))
+        self.assertFalse(self.calendar.is_working_day(date(2025, 1, 5)))
+        self.assertTrue(self.calendar.is_working_day(date(2025, 1, 6)))
+
+    def test_count_between_excludes_start_and_includes_end(self):
+        # 2, 3, 6, 7, 8, 9 and 10
+        self.assertEqual(self.calendar.count_between(date(2025, 1, 1), date(2025, 1, 10)), 7)
+        self.assertEqual(self.calendar.count_between(date(2025, 1, 3), date(2025, 1, 6)), 1)
+        self.assertEqual(self.calendar.count_between(date(2025, 1, 10), date(2025, 1, 3)), 0)
+
+    def test_add_working_days_skips_the_weekend(self):
+        self.assertEqual(self.calendar.add_working_days(date(2025, 1, 3), 1), date(2025, 1, 6))
+        self.assertEqual(self.calendar.add_working_days(date(2025, 1, 4), 2), date(2025, 1, 7))
+
+    def test_add_working_days_stops_at_the_end_of_the_calendar(self):
+        self.assertEqual(self.calendar.add_working_days(date(2025, 1, 30), 5), date(2025, 1, 31))
+
+    @override_settings(TIMELINE_WEEKEND_DAYS=[4, 5], TIMELINE_HOLIDAYS=['2025-01-02'])
+    def test_calendar_is_loaded_from_the_settings(self):
+        calendar = load_working_calendar(date(2025, 1, 1), date(2025, 1, 10))
+
+        self.assertFalse(calendar.is_working_day(date(2025, 1, 2)))
+        self.assertFalse(calendar.is_working_day(date(2025, 1, 3)))
+        self.assertTrue(calendar.is_working_day(date(2025, 1, 5)))
+
+
+@override_settings(TIME_ZONE='UTC')
+class DistributeDeadlinesTests(SimpleTestCase):
+
+    def setUp(self):
+        self.calendar = WorkingCalendar(date(2025, 1, 1), date(2025, 1, 31), holidays=[NEW_YEAR])
+
+    def test_working_days_are_split_by_weight_at_the_deadline_time(self):
+        # Seven working days: the first item ends after four of them, on the 7th
+        deadlines = distribute_deadlines(self.calendar, at(1, 9), at(10, 17), [1, 1])
+
+        self.assertEqual(deadlines, [at(7, 17), at(10, 17)])
+
+    def test_weights_skip_weekends_and_holidays(self):
+        # Of seven working days, the first item gets one (the 2nd) and the
+        # second ends after three, on the 6th after the weekend
+        deadlines = distribute_deadlines(self.calendar, at(1, 9), at(10, 17), [1, 2, 4])
+
+        self.assertEqual(deadlines, [at(2, 17), at(6, 17), at(10, 17)])
+        for deadline in deadlines:
+            self.assertTrue(self.calendar.is_working_day(deadline.date()))
+
+    def test_deadline_in_the_past_gives_every_item_the_deadline(self):
+        deadlines = distribute_deadlines(self.calendar, at(10, 9), at(6, 17), [1, 1, 1])
+
+        self.assertEqual(deadlines, [at(6, 17)] * 3)
+
+    def test_fewer_working_days_than_items_keeps_the_order(self):
+        # Two working days (the 2nd and 3rd) for four phases
+        deadlines = distribute_deadlines(self.calendar, at(1, 9), at(3, 17), [1, 1, 1, 1])
+
+        self.assertEqual(deadlines, [at(2, 17), at(3, 17), at(3, 17), at(3, 17)])
+        self.assertEqual(deadlines, sorted(deadlines))
+
+    def test_span_without_working_days_gives_every_item_the_deadline(self):
+        # From Friday to Saturday there is no working day at all
+        deadlines = distribute_deadlines(self.calendar, at(3, 9), at(4, 12), [1, 1])
+
+        self.assertEqual(deadlines, [at(4, 12), at(4, 12)])
+
+    def test_no_items(self):
+        self.assertEqual(distribute_deadlines(self.calendar, at(1, 9), at(10, 17), []), [])
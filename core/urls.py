@@ -4,7 +4,9 @@ from core.views import (
     project_view, ppap_view, phase_view, output_view, document_view, 
     user_view, client_view, team_view, history_view, api_view, timeline_view,
     person_view, contact_view, department_view, template_view, todo_view,
-    ppap_element_view, authorization_view ,auth_api
+    ppap_element_view, authorization_view ,auth_api, history_editor_view,
+    statistics_view, analyse_view, report_job_view, export_view,
+    calendar_view
 )
 from core.views.history_view import (
     get_nested_history,
@@ -23,6 +25,7 @@ router.register(r'users', user_view.UserViewSet)
 router.register(r'clients', client_view.ClientViewSet)
 router.register(r'teams', team_view.TeamViewSet)
 router.register(r'history', history_view.HistoryViewSet)
+router.register(r'history-editor', history_editor_view.HistoryEditorViewSet, basename='history-editor')
 router.register(r'timeline', timeline_view.TimelineViewSet, basename='timeline')
 router.register(r'persons', person_view.PersonViewSet)
 router.register(r'contacts', contact_view.ContactViewSet)
@@ -32,6 +35,9 @@ router.register(r'output-templates', template_view.OutputTemplateViewSet)
 router.register(r'todos', todo_view.TodoViewSet)
 router.register(r'ppap-elements', ppap_element_view.PPAPElementViewSet)
 router.register(r'authorizations', authorization_view.AuthorizationViewSet)
+router.register(r'statistics', statistics_view.StatisticsViewSet, basename='statistics')
+router.register(r'analyse', analyse_view.AnalyseViewSet, basename='analyse')
+router.register(r'report-jobs', report_job_view.ReportJobViewSet, basename='report-jobs')
 
 # Get a reference to the ViewSet class
 timeline_viewset = timeline_view.TimelineViewSet.as_view({
@@ -46,12 +52,23 @@ timeline_overview_viewset = timeline_view.TimelineViewSet.as_view({
 
 # Define URL patterns
 urlpatterns = [
+    # Nested history (declared before the router so 'nested-history' is not taken as a project pk)
+    path('projects/<int:project_id>/nested-history/', get_nested_history, name='project-nested-history'),
+    path('projects/nested-history/', get_all_projects_nested_history, name='all-projects-nested-history'),
+
     # Include all router URLs
     path('', include(router.urls)),
     
     # API testing endpoint
     path('test/', api_view.test_api, name='test_api'),
     
+    # Tabular exports (CSV, or Parquet with ?format=parquet)
+    path('export/<str:dataset>/', export_view.export_dataset, name='export-dataset'),
+    
+    # iCalendar deadline feeds
+    path('calendar/users/<int:user_id>/', calendar_view.user_calendar_feed, name='user-calendar-feed'),
+    path('calendar/teams/<int:team_id>/', calendar_view.team_calendar_feed, name='team-calendar-feed'),
+    
     # Dashboard view
     path('dashboard/', api_view.dashboard_view, name='dashboard'),
     
@@ -72,10 +89,6 @@ urlpatterns = [
     path('auth/logout/', auth_api.api_logout, name='api_logout'),
     path('auth/user/', auth_api.api_get_user, name='api_get_user'),
 
-    # Nested history
-    path('projects/<int:project_id>/nested-history/', get_nested_history, name='project-nested-history'),
-    path('projects/nested-history/', get_all_projects_nested_history, name='all-projects-nested-history'),
-
     # Simple test
     path('simple-test/', simple_test_view, name='simple-test'),
 
@@ -2,6 +2,7 @@ from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.pagination import PageNumberPagination
 from django.db.models import Count, Avg, Q, F, Sum, Case, When, IntegerField
 from django.utils import timezone
 from datetime import timedelta
@@ -10,12 +11,28 @@ from django.db import transaction
 from core.services.analyse.api import (
     analyze_deadline_violations,
     analyze_critical_path,
+    compute_critical_path,
     detect_resource_allocation_problems,
-    generate_early_warnings,
-    analyze_historical_patterns
+    get_early_warnings,
+    serialize_early_warning,
+    analyze_historical_patterns,
+    analyze_schedule_risk,
+    MAX_ITERATIONS,
+    get_duration_statistics,
+    get_output_template_durations,
+    bottleneck_threshold,
+    normalize_report_parameters,
+    get_cached_report,
+    build_report
 )
+from core.services.project.api import get_project_rollup
 from core.models import Project, PPAP, Phase, Output, User, Team, Document, History
 
+class EarlyWarningPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
 class AnalyseViewSet(viewsets.ViewSet):
     """
     ViewSet for advanced analysis and reporting
@@ -26,21 +43,29 @@ class AnalyseViewSet(viewsets.ViewSet):
     def project(self, request, pk=None):
         """
         Get advanced analysis for a specific project
+        
+        Counters and quality rates are served from the project rollup (see
+        core.services.project.rollup).
         """
         try:
             project = Project.objects.get(id=pk)
+            rollup = get_project_rollup(project.id)
             
             # Get PPAP
             ppap = PPAP.objects.filter(project=project).first()
             
             # Get phases
-            phases = Phase.objects.filter(ppap=ppap) if ppap else []
+            phases = list(
+                Phase.objects.filter(ppap=ppap).select_related('template', 'responsible')
+            ) if ppap else []
             
             # Get outputs
-            outputs = Output.objects.filter(phase__in=phases)
+            outputs = list(
+                Output.objects.filter(phase__ppap=ppap).select_related('template', 'phase__template', 'user')
+            ) if ppap else []
             
             # Calculate critical path
-            critical_path = self._calculate_critical_path(phases)
+            critical_path = compute_critical_path(ppap)['critical_path'] if ppap else []
             
             # Calculate bottlenecks
             bottlenecks = self._identify_bottlenecks(outputs)
@@ -52,11 +77,21 @@ class AnalyseViewSet(viewsets.ViewSet):
             efficiency_metrics = self._calculate_efficiency_metrics(project, phases, outputs)
             
             # Calculate quality metrics
-            quality_metrics = self._calculate_quality_metrics(outputs)
+            quality_metrics = self._calculate_quality_metrics(outputs, rollup.outputs_by_status)
             
             return Response({
                 'project_id': project.id,
                 'project_name': project.name,
+                'counters': {
+                    'phases_total': rollup.phases_total,
+                    'phases_completed': rollup.phases_completed,
+                    'outputs_total': rollup.outputs_total,
+                    'outputs_by_status': rollup.outputs_by_status,
+                    'overdue_outputs': rollup.overdue_outputs,
+                    'overdue_as_of': rollup.overdue_as_of,
+                    'documents': rollup.documents,
+                    'last_activity': rollup.last_activity_at
+                },
                 'critical_path': critical_path,
                 'bottlenecks': bottlenecks,
                 'risk_areas': risk_areas,
@@ -84,10 +119,10 @@ class AnalyseViewSet(viewsets.ViewSet):
             phase = Phase.objects.get(id=pk)
             
             # Get outputs
-            outputs = Output.objects.filter(phase=phase)
+            outputs = list(Output.objects.filter(phase=phase).select_related('template', 'phase__template', 'user'))
             
             # Calculate bottlenecks
-            bottlenecks = self._identify_bottlenecks([outputs])
+            bottlenecks = self._identify_bottlenecks(outputs)
             
             # Calculate risk areas
             risk_areas = self._identify_risk_areas([phase], outputs)
@@ -164,63 +199,22 @@ class AnalyseViewSet(viewsets.ViewSet):
     def custom_report(self, request):
         """
         Generate a custom report based on specified parameters
+
+        Computed synchronously; large reports should be submitted to
+        report-jobs instead.
         """
         try:
-            # Get parameters from request
-            start_date = request.data.get('start_date')
-            end_date = request.data.get('end_date')
-            project_ids = request.data.get('project_ids', [])
-            team_ids = request.data.get('team_ids', [])
-            user_ids = request.data.get('user_ids', [])
-            metrics = request.data.get('metrics', [])
-            
-            # Validate parameters
-            if not start_date or not end_date:
-                return Response(
-                    {"error": "start_date and end_date are required"},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            # Parse dates
             try:
-                start_date = timezone.make_aware(timezone.datetime.fromisoformat(start_date.replace('Z', '+00:00')))
-                end_date = timezone.make_aware(timezone.datetime.fromisoformat(end_date.replace('Z', '+00:00')))
-            except ValueError:
-                return Response(
-                    {"error": "Invalid date format. Use ISO format (YYYY-MM-DDTHH:MM:SS)"},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            # Build report data
-            report_data = {
-                'parameters': {
-                    'start_date': start_date.isoformat(),
-                    'end_date': end_date.isoformat(),
-                    'project_ids': project_ids,
-                    'team_ids': team_ids,
-                    'user_ids': user_ids,
-                    'metrics': metrics
-                },
-                'data': {}
-            }
-            
-            # Add requested metrics
-            if 'project_progress' in metrics:
-                report_data['data']['project_progress'] = self._get_project_progress(project_ids, start_date, end_date)
+                parameters = normalize_report_parameters(request.data)
+            except ValueError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
             
-            if 'team_performance' in metrics:
-                report_data['data']['team_performance'] = self._get_team_performance(team_ids, start_date, end_date)
+            # Serve a recent identical report when there is one
+            cached = get_cached_report(parameters)
+            if cached:
+                return Response(cached.result)
             
-            if 'user_productivity' in metrics:
-                report_data['data']['user_productivity'] = self._get_user_productivity(user_ids, start_date, end_date)
-            
-            if 'quality_metrics' in metrics:
-                report_data['data']['quality_metrics'] = self._get_quality_metrics(project_ids, start_date, end_date)
-            
-            if 'timeline_adherence' in metrics:
-                report_data['data']['timeline_adherence'] = self._get_timeline_adherence(project_ids, start_date, end_date)
-            
-            return Response(report_data)
+            return Response(build_report(parameters))
             
         except Exception as e:
             return Response(
@@ -230,48 +224,11 @@ class AnalyseViewSet(viewsets.ViewSet):
     
     # Helper methods for analysis
     
-    def _calculate_critical_path(self, phases):
+    def _histories(self, entities):
         """
-        Calculate the critical path for a set of phases
+        Get the History records of entities in one query, keyed by ID
         """
-        critical_path = []
-        
-        # Sort phases by order
-        sorted_phases = sorted(phases, key=lambda p: p.template.order if p.template else 0)
-        
-        for phase in sorted_phases:
-            # Get phase deadline from history
-            history = History.objects.filter(history_id=phase.history_id).order_by('-created_at').first()
-            deadline = history.deadline if history else None
-            
-            # Get outputs for this phase
-            outputs = Output.objects.filter(phase=phase)
-            
-            # Find the output with the latest deadline
-            latest_output = None
-            latest_deadline = None
-            
-            for output in outputs:
-                output_history = History.objects.filter(history_id=output.history_id).order_by('-created_at').first()
-                if output_history and output_history.deadline:
-                    if latest_deadline is None or output_history.deadline > latest_deadline:
-                        latest_output = output
-                        latest_deadline = output_history.deadline
-            
-            # Add to critical path if this phase has a deadline or critical output
-            if deadline or latest_output:
-                critical_path.append({
-                    'phase_id': phase.id,
-                    'phase_name': phase.template.name if phase.template else "Unknown",
-                    'deadline': deadline.isoformat() if deadline else None,
-                    'critical_output': {
-                        'id': latest_output.id,
-                        'name': latest_output.template.name if latest_output and latest_output.template else "Unknown",
-                        'deadline': latest_deadline.isoformat() if latest_deadline else None
-                    } if latest_output else None
-                })
-        
-        return critical_path
+        return History.objects.in_bulk([entity.history_id for entity in entities if entity.history_id])
     
     def _identify_bottlenecks(self, outputs):
         """
@@ -286,22 +243,31 @@ class AnalyseViewSet(viewsets.ViewSet):
                 outputs_by_status[output.status] = []
             outputs_by_status[output.status].append(output)
         
-        # Check for bottlenecks in "In Progress" outputs
+        # Check for bottlenecks in "In Progress" outputs: in progress for
+        # longer than 90% of past outputs of the same template took, or
+        # more than 2 weeks when the template has too little history
         in_progress_outputs = outputs_by_status.get('In Progress', [])
+        started_at = dict(History.objects.filter(
+            id__in=[output.history_id for output in in_progress_outputs]
+        ).values_list('id', 'started_at'))
+        expected_durations = get_output_template_durations(
+            {output.template_id for output in in_progress_outputs}
+        )
+        now = timezone.now()
         
         for output in in_progress_outputs:
-            # Get history for this output
-            history = History.objects.filter(history_id=output.history_id).order_by('-created_at').first()
+            output_started_at = started_at.get(output.history_id)
             
-            # Check if output has been in progress for a long time
-            if history and history.started_at:
-                days_in_progress = (timezone.now() - history.started_at).days
+            if output_started_at:
+                days_in_progress = (now - output_started_at).days
+                expected_days = bottleneck_threshold(expected_durations.get(output.template_id))
                 
-                if days_in_progress > 14:  # More than 2 weeks in progress
+                if days_in_progress > expected_days:
                     bottlenecks.append({
                         'output_id': output.id,
                         'output_name': output.template.name if output.template else "Unknown",
                         'days_in_progress': days_in_progress,
+                        'expected_days': expected_days,
                         'phase_id': output.phase_id,
                         'phase_name': output.phase.template.name if output.phase and output.phase.template else "Unknown",
                         'responsible': output.user.username if output.user else None
@@ -333,8 +299,9 @@ class AnalyseViewSet(viewsets.ViewSet):
         risk_areas = []
         
         # Check for phases close to deadline
+        histories = self._histories(phases)
         for phase in phases:
-            history = History.objects.filter(history_id=phase.history_id).order_by('-created_at').first()
+            history = histories.get(phase.history_id)
             
             if history and history.deadline:
                 days_to_deadline = (history.deadline - timezone.now()).days
@@ -388,11 +355,12 @@ class AnalyseViewSet(viewsets.ViewSet):
         total_completion_time = 0
         outputs_with_time = 0
         
+        histories = self._histories(completed_outputs)
         for output in completed_outputs:
-            history = History.objects.filter(history_id=output.history_id).order_by('-created_at').first()
+            history = histories.get(output.history_id)
             
-            if history and history.started_at and history.completed_at:
-                completion_time = (history.completed_at - history.started_at).days
+            if history and history.started_at and history.finished_at:
+                completion_time = (history.finished_at - history.started_at).days
                 total_completion_time += completion_time
                 outputs_with_time += 1
         
@@ -402,16 +370,17 @@ class AnalyseViewSet(viewsets.ViewSet):
         phase_transition_times = []
         
         sorted_phases = sorted(phases, key=lambda p: p.template.order if p.template else 0)
+        phase_histories = self._histories(sorted_phases)
         
         for i in range(1, len(sorted_phases)):
             prev_phase = sorted_phases[i-1]
             curr_phase = sorted_phases[i]
             
-            prev_history = History.objects.filter(history_id=prev_phase.history_id).order_by('-created_at').first()
-            curr_history = History.objects.filter(history_id=curr_phase.history_id).order_by('-created_at').first()
+            prev_history = phase_histories.get(prev_phase.history_id)
+            curr_history = phase_histories.get(curr_phase.history_id)
             
-            if prev_history and curr_history and prev_history.completed_at and curr_history.started_at:
-                transition_time = (curr_history.started_at - prev_history.completed_at).days
+            if prev_history and curr_history and prev_history.finished_at and curr_history.started_at:
+                transition_time = (curr_history.started_at - prev_history.finished_at).days
                 
                 phase_transition_times.append({
                     'from_phase': prev_phase.template.name if prev_phase.template else "Unknown",
@@ -449,11 +418,12 @@ class AnalyseViewSet(viewsets.ViewSet):
         total_completion_time = 0
         outputs_with_time = 0
         
+        histories = self._histories(completed_outputs)
         for output in completed_outputs:
-            history = History.objects.filter(history_id=output.history_id).order_by('-created_at').first()
+            history = histories.get(output.history_id)
             
-            if history and history.started_at and history.completed_at:
-                completion_time = (history.completed_at - history.started_at).days
+            if history and history.started_at and history.finished_at:
+                completion_time = (history.finished_at - history.started_at).days
                 total_completion_time += completion_time
                 outputs_with_time += 1
         
@@ -478,29 +448,38 @@ class AnalyseViewSet(viewsets.ViewSet):
             }
         }
     
-    def _calculate_quality_metrics(self, outputs):
+    def _calculate_quality_metrics(self, outputs, outputs_by_status=None):
         """
         Calculate quality metrics for outputs
+        
+        Rates use outputs_by_status ({status: count}, e.g. from the project
+        rollup) when given, and are counted from outputs otherwise.
         """
-        total_outputs = len(outputs)
-        rejected_outputs = len([o for o in outputs if o.status == 'Rejected'])
-        approved_outputs = len([o for o in outputs if o.status == 'Approved'])
+        if outputs_by_status is None:
+            outputs_by_status = {}
+            for output in outputs:
+                outputs_by_status[output.status] = outputs_by_status.get(output.status, 0) + 1
+        
+        total_outputs = sum(outputs_by_status.values())
+        rejected_outputs = outputs_by_status.get('Rejected', 0)
+        approved_outputs = outputs_by_status.get('Approved', 0)
         
         rejection_rate = rejected_outputs / total_outputs * 100 if total_outputs > 0 else 0
         approval_rate = approved_outputs / total_outputs * 100 if total_outputs > 0 else 0
         
-        # Calculate revision counts
-        revision_counts = {}
+        # Count document versions as revisions, in one query
+        outputs_by_id = {output.id: output for output in outputs}
+        document_counts = Document.objects.filter(output_id__in=list(outputs_by_id)).values_list(
+            'output_id'
+        ).annotate(count=Count('id')).order_by()
         
-        for output in outputs:
-            # Count document versions as revisions
-            documents = Document.objects.filter(output=output)
-            
-            if documents:
-                revision_counts[output.id] = {
-                    'output_name': output.template.name if output.template else "Unknown",
-                    'revisions': documents.count()
-                }
+        revision_counts = {}
+        for output_id, count in document_counts:
+            output = outputs_by_id[output_id]
+            revision_counts[output_id] = {
+                'output_name': output.template.name if output.template else "Unknown",
+                'revisions': count
+            }
         
         return {
             'rejection_rate': rejection_rate,
@@ -550,11 +529,12 @@ class AnalyseViewSet(viewsets.ViewSet):
         # Calculate on-time delivery rate
         on_time_projects = 0
         
+        histories = self._histories(projects)
         for project in projects:
-            history = History.objects.filter(history_id=project.history_id).order_by('-created_at').first()
+            history = histories.get(project.history_id)
             
-            if history and history.deadline and history.completed_at:
-                if history.completed_at <= history.deadline:
+            if history and history.deadline and history.finished_at:
+                if history.finished_at <= history.deadline:
                     on_time_projects += 1
         
         on_time_rate = on_time_projects / completed_projects * 100 if completed_projects > 0 else 0
@@ -581,199 +561,6 @@ class AnalyseViewSet(viewsets.ViewSet):
             'shared_outputs': 0  # Placeholder
         }
     
-    def _get_project_progress(self, project_ids, start_date, end_date):
-        """
-        Get project progress data for the specified projects and date range
-        """
-        projects = Project.objects.filter(id__in=project_ids) if project_ids else Project.objects.all()
-        
-        progress_data = []
-        
-        for project in projects:
-            # Get PPAP
-            ppap = PPAP.objects.filter(project=project).first()
-            
-            # Get phases
-            phases = Phase.objects.filter(ppap=ppap) if ppap else []
-            
-            # Calculate progress
-            total_phases = len(phases)
-            completed_phases = sum(1 for phase in phases if phase.status in ['Completed', 'Approved'])
-            
-            progress_percentage = completed_phases / total_phases * 100 if total_phases > 0 else 0
-            
-            # Get history events in the date range
-            history_events = History.objects.filter(
-                Q(table_name='project') & Q(history_id=project.history_id),
-                created_at__gte=start_date,
-                created_at__lte=end_date
-            ).order_by('created_at')
-            
-            progress_data.append({
-                'project_id': project.id,
-                'project_name': project.name,
-                'progress_percentage': progress_percentage,
-                'total_phases': total_phases,
-                'completed_phases': completed_phases,
-                'history_events': [
-                    {
-                        'event': event.event,
-                        'created_at': event.created_at.isoformat()
-                    } for event in history_events
-                ]
-            })
-        
-        return progress_data
-    
-    def _get_team_performance(self, team_ids, start_date, end_date):
-        """
-        Get team performance data for the specified teams and date range
-        """
-        teams = Team.objects.filter(id__in=team_ids) if team_ids else Team.objects.all()
-        
-        performance_data = []
-        
-        for team in teams:
-            # Get projects for this team
-            projects = Project.objects.filter(team=team)
-            
-            # Calculate performance metrics
-            team_performance = self._calculate_team_performance(team, projects)
-            
-            # Get history events in the date range
-            project_history_ids = [project.history_id for project in projects]
-            
-            history_events = History.objects.filter(
-                history_id__in=project_history_ids,
-                created_at__gte=start_date,
-                created_at__lte=end_date
-            ).order_by('created_at')
-            
-            performance_data.append({
-                'team_id': team.id,
-                'team_name': team.name,
-                'performance_metrics': team_performance,
-                'history_events': [
-                    {
-                        'event': event.event,
-                        'created_at': event.created_at.isoformat()
-                    } for event in history_events
-                ]
-            })
-        
-        return performance_data
-    
-    def _get_user_productivity(self, user_ids, start_date, end_date):
-        """
-        Get user productivity data for the specified users and date range
-        """
-        users = User.objects.filter(id__in=user_ids) if user_ids else User.objects.all()
-        
-        productivity_data = []
-        
-        for user in users:
-            # Get todos for this user
-            from core.models import Todo
-            todos = Todo.objects.filter(user=user)
-            
-            # Get outputs assigned to this user
-            outputs = Output.objects.filter(id__in=[todo.output_id for todo in todos])
-            
-            # Calculate productivity metrics
-            completed_outputs = [o for o in outputs if o.status in ['Completed', 'Approved']]
-            
-            # Get history events in the date range
-            history_events = History.objects.filter(
-                user=user.id,
-                created_at__gte=start_date,
-                created_at__lte=end_date
-            ).order_by('created_at')
-            
-            productivity_data.append({
-                'user_id': user.id,
-                'username': user.username,
-                'total_outputs': len(outputs),
-                'completed_outputs': len(completed_outputs),
-                'completion_rate': len(completed_outputs) / len(outputs) * 100 if outputs else 0,
-                'history_events': [
-                    {
-                        'event': event.event,
-                        'created_at': event.created_at.isoformat()
-                    } for event in history_events
-                ]
-            })
-        
-        return productivity_data
-    
-    def _get_quality_metrics(self, project_ids, start_date, end_date):
-        """
-        Get quality metrics for the specified projects and date range
-        """
-        projects = Project.objects.filter(id__in=project_ids) if project_ids else Project.objects.all()
-        
-        quality_data = []
-        
-        for project in projects:
-            # Get PPAP
-            ppap = PPAP.objects.filter(project=project).first()
-            
-            # Get phases
-            phases = Phase.objects.filter(ppap=ppap) if ppap else []
-            
-            # Get outputs
-            outputs = Output.objects.filter(phase__in=phases)
-            
-            # Calculate quality metrics
-            quality_metrics = self._calculate_quality_metrics(outputs)
-            
-            quality_data.append({
-                'project_id': project.id,
-                'project_name': project.name,
-                'quality_metrics': quality_metrics
-            })
-        
-        return quality_data
-    
-    def _get_timeline_adherence(self, project_ids, start_date, end_date):
-        """
-        Get timeline adherence data for the specified projects and date range
-        """
-        projects = Project.objects.filter(id__in=project_ids) if project_ids else Project.objects.all()
-        
-        timeline_data = []
-        
-        for project in projects:
-            # Get PPAP
-            ppap = PPAP.objects.filter(project=project).first()
-            
-            # Get phases
-            phases = Phase.objects.filter(ppap=ppap) if ppap else []
-            
-            # Calculate timeline adherence
-            phases_with_deadlines = 0
-            phases_completed_on_time = 0
-            
-            for phase in phases:
-                history = History.objects.filter(history_id=phase.history_id).order_by('-created_at').first()
-                
-                if history and history.deadline:
-                    phases_with_deadlines += 1
-                    
-                    if history.completed_at and history.completed_at <= history.deadline:
-                        phases_completed_on_time += 1
-            
-            adherence_rate = phases_completed_on_time / phases_with_deadlines * 100 if phases_with_deadlines > 0 else 0
-            
-            timeline_data.append({
-                'project_id': project.id,
-                'project_name': project.name,
-                'phases_with_deadlines': phases_with_deadlines,
-                'phases_completed_on_time': phases_completed_on_time,
-                'adherence_rate': adherence_rate
-            })
-        
-        return timeline_data
-
     @action(detail=False, methods=['get'])
     def deadline_violations(self, request):
         """Analyze project deadline violations"""
@@ -795,8 +582,17 @@ class AnalyseViewSet(viewsets.ViewSet):
             return Response({"error": "project_id parameter is required"}, status=status.HTTP_400_BAD_REQUEST)
         
         try:
+            if not Project.objects.filter(id=project_id).exists():
+                return Response({"error": f"Project with ID {project_id} not found"},
+                                status=status.HTTP_404_NOT_FOUND)
+            
             results = analyze_critical_path(project_id)
+            if "error" in results:
+                return Response(results, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
             return Response(results)
+        except ValueError as e:
+            # Dependency cycle between outputs, or a malformed project_id
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -813,12 +609,88 @@ class AnalyseViewSet(viewsets.ViewSet):
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @action(detail=False, methods=['get'])
+    def schedule_risk(self, request):
+        """
+        Simulate project completion (Monte Carlo)
+
+        Optional parameters: iterations (default 10000) and seed.
+        """
+        project_id = request.query_params.get('project_id')
+        if not project_id:
+            return Response({"error": "project_id parameter is required"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            project_id = int(project_id)
+            iterations = int(request.query_params.get('iterations', 10000))
+            seed = request.query_params.get('seed')
+            seed = int(seed) if seed is not None else None
+        except ValueError:
+            return Response({"error": "project_id, iterations and seed must be integers"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= iterations <= MAX_ITERATIONS:
+            return Response({"error": f"iterations must be between 1 and {MAX_ITERATIONS}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            if not Project.objects.filter(id=project_id).exists():
+                return Response({"error": f"Project with ID {project_id} not found"},
+                                status=status.HTTP_404_NOT_FOUND)
+            
+            results = analyze_schedule_risk(project_id, iterations=iterations, seed=seed)
+            if "error" in results:
+                return Response(results, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            if "message" in results:
+                # The project has no PPAP to simulate
+                return Response({"error": results["message"]}, status=status.HTTP_400_BAD_REQUEST)
+            return Response(results)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
     @action(detail=False, methods=['get'])
     def early_warnings(self, request):
-        """Get early warnings about potential issues"""
+        """
+        Get early warnings about potential issues, high level first
+
+        Reads the warnings maintained by the refresh_early_warnings command.
+        Optional filters: level, type, entity_type, project_id; paginated
+        with page and page_size.
+        """
+        try:
+            warnings = get_early_warnings(
+                level=request.query_params.get('level'),
+                warning_type=request.query_params.get('type'),
+                entity_type=request.query_params.get('entity_type'),
+                project_id=request.query_params.get('project_id')
+            )
+
+            paginator = EarlyWarningPagination()
+            page = paginator.paginate_queryset(warnings, request, view=self)
+            now = timezone.now()
+            return paginator.get_paginated_response(
+                [serialize_early_warning(warning, now) for warning in page]
+            )
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @action(detail=False, methods=['get'])
+    def duration_statistics(self, request):
+        """
+        Get cached duration distributions of templates
+
+        Optional filters: output_template_id and phase_template_id
+        (comma-separated IDs).
+        """
         try:
-            warnings = generate_early_warnings()
-            return Response(warnings)
+            filters = {}
+            for param in ['output_template_id', 'phase_template_id']:
+                value = request.query_params.get(param)
+                if value:
+                    filters[f"{param}s"] = [int(template_id) for template_id in value.split(',')]
+            
+            return Response(get_duration_statistics(**filters))
+        except ValueError:
+            return Response({"error": "Template IDs must be integers"}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -0,0 +1,66 @@
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from django.http import HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import parse_etags, quote_etag
+from core.models import User, Team
+from core.services.calendar.api import user_feed_etag, team_feed_etag, iter_user_feed, iter_team_feed
+from core.views.renderers import ICalendarRenderer
+
+def _feed_response(request, etag, build_feed, filename):
+    """
+    Answer a feed request, streaming the feed only when the client's copy is stale
+
+    The ETag comes from the feed's version (see feed_etag), so a matching
+    If-None-Match is answered with 304 before any event is loaded.
+    """
+    quoted = quote_etag(etag)
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match and (quoted in parse_etags(if_none_match) or if_none_match.strip() == '*'):
+        response = HttpResponseNotModified()
+    else:
+        response = StreamingHttpResponse(build_feed(), content_type=f'{ICalendarRenderer.media_type}; charset=utf-8')
+        response['Content-Disposition'] = f'inline; filename="{filename}"'
+    response['ETag'] = quoted
+    # Clients must revalidate every time, which is cheap thanks to the ETag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@renderer_classes([ICalendarRenderer])
+def user_calendar_feed(request, user_id):
+    """
+    iCalendar feed of a user's deadlines
+
+    Phases the user is responsible for and outputs assigned to them or on
+    their todo list. Supports If-None-Match.
+    """
+    try:
+        etag = user_feed_etag(user_id)
+    except User.DoesNotExist:
+        return Response({"error": f"User {user_id} not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    return _feed_response(
+        request, etag, lambda: iter_user_feed(User.objects.get(id=user_id)), f'user-{user_id}-deadlines.ics'
+    )
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@renderer_classes([ICalendarRenderer])
+def team_calendar_feed(request, team_id):
+    """
+    iCalendar feed of a team's deadlines
+
+    The team's projects with all their phases and outputs. Supports
+    If-None-Match.
+    """
+    try:
+        etag = team_feed_etag(team_id)
+    except Team.DoesNotExist:
+        return Response({"error": f"Team {team_id} not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    return _feed_response(
+        request, etag, lambda: iter_team_feed(Team.objects.get(id=team_id)), f'team-{team_id}-deadlines.ics'
+    )
@@ -0,0 +1,59 @@
+from datetime import datetime
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from core.services.export.api import EXPORT_DATASETS, PARQUET_AVAILABLE, iter_csv, iter_parquet
+from core.views.renderers import CSVRenderer, ParquetRenderer
+
+def _parse_datetime(value):
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@renderer_classes([CSVRenderer, ParquetRenderer])
+def export_dataset(request, dataset):
+    """
+    Stream a flat dataset as CSV (default) or Parquet (?format=parquet)
+
+    Datasets: projects, phases, outputs, documents, history-events.
+
+    Query parameters:
+        project_id (int, optional): Restrict to one project (not for history-events)
+        since (datetime, optional): history-events at or after this time
+        until (datetime, optional): history-events before this time
+    """
+    build_dataset = EXPORT_DATASETS.get(dataset)
+    if build_dataset is None:
+        return Response({"error": f"Unknown dataset '{dataset}', expected one of: {', '.join(EXPORT_DATASETS)}"},
+                        status=status.HTTP_404_NOT_FOUND)
+
+    export_format = request.accepted_renderer.format
+    if export_format == 'parquet' and not PARQUET_AVAILABLE:
+        return Response({"error": "Parquet export requires pyarrow to be installed"},
+                        status=status.HTTP_501_NOT_IMPLEMENTED)
+
+    try:
+        project_id = request.query_params.get('project_id')
+        since = request.query_params.get('since')
+        until = request.query_params.get('until')
+        filters = {
+            'project_id': int(project_id) if project_id else None,
+            'since': _parse_datetime(since) if since else None,
+            'until': _parse_datetime(until) if until else None,
+        }
+    except ValueError:
+        return Response({"error": "project_id must be an integer and since/until ISO datetimes"},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    queryset, columns = build_dataset(**filters)
+
+    if export_format == 'parquet':
+        response = StreamingHttpResponse(iter_parquet(queryset, columns), content_type=ParquetRenderer.media_type)
+    else:
+        response = StreamingHttpResponse(iter_csv(queryset, columns), content_type=f'{CSVRenderer.media_type}; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="{dataset}.{export_format}"'
+    return response
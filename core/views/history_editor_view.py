@@ -14,6 +14,7 @@ from core.services.history.api import (
     get_entity_deadline,
     bulk_update_entity_deadlines
 )
+from core.services.timeline.reschedule import reschedule_deadline
 
 class HistoryEditorViewSet(viewsets.ViewSet):
     """
@@ -100,10 +101,15 @@ class HistoryEditorViewSet(viewsets.ViewSet):
     def set_deadline(self, request):
         """
         Set deadline for an entity
+        
+        Downstream deadlines are shifted as well unless "propagate" is false
+        (see core.services.timeline.reschedule); the response then lists
+        every changed deadline.
         """
         entity_type = request.data.get('entity_type')
         entity_id = request.data.get('entity_id')
         deadline = request.data.get('deadline')
+        propagate = request.data.get('propagate', True) not in (False, 'false', '0', 0)
         
         if not all([entity_type, entity_id, deadline]):
             return Response({
@@ -112,7 +118,9 @@ class HistoryEditorViewSet(viewsets.ViewSet):
         
         # Parse deadline
         try:
-            deadline_date = timezone.make_aware(datetime.fromisoformat(deadline.replace('Z', '+00:00')))
+            deadline_date = datetime.fromisoformat(deadline.replace('Z', '+00:00'))
+            if timezone.is_naive(deadline_date):
+                deadline_date = timezone.make_aware(deadline_date)
         except ValueError:
             return Response({"error": "Invalid deadline format"}, status=status.HTTP_400_BAD_REQUEST)
         
@@ -128,6 +136,17 @@ class HistoryEditorViewSet(viewsets.ViewSet):
                     "error": f"Unsupported entity_type: {entity_type}"
                 }, status=status.HTTP_400_BAD_REQUEST)
             
+            if propagate:
+                result = reschedule_deadline(entity_type.lower(), entity.id, deadline_date)
+                return Response({
+                    "success": True,
+                    "entity_type": entity_type,
+                    "entity_id": entity_id,
+                    "deadline": deadline_date.isoformat(),
+                    "changes": result['changes'],
+                    "changed_count": result['changed_count']
+                })
+            
             result = set_entity_deadline(entity, deadline_date, entity_type.lower())
             
             return Response({
@@ -237,7 +256,8 @@ class HistoryEditorViewSet(viewsets.ViewSet):
                 "failed_count": result['failed_count'],
                 "total": result['total'],
                 "deadline": deadline_date.isoformat(),
-                "updated_entities": result['updated_entities']
+                "updated_entities": result['updated_entities'],
+                "results": result['results']
             })
             
         except Exception as e:
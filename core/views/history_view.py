@@ -1,10 +1,14 @@
 from rest_framework import viewsets, status
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import action, api_view, permission_classes, renderer_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from core.models import History, Project
 from core.serializers.history_serializer import HistorySerializer
-from core.services.history.nested_history import get_nested_project_history
+from core.services.history.nested_history import get_nested_project_history, load_nested_projects_history
+from core.services.history.initialization import get_history_events
+from core.views.renderers import NDJSONRenderer
+from core.views.project_history_view import stream_projects_history_ndjson
 import json
 from concurrent.futures import ThreadPoolExecutor
 import threading
@@ -12,23 +16,23 @@ import threading
 # At the top of history_view.py
 
 class HistoryViewSet(viewsets.ModelViewSet):
-    queryset = History.objects.all()
+    queryset = History.objects.prefetch_related('history_events')
     serializer_class = HistorySerializer
     
     @action(detail=True, methods=['get'])
     def events(self, request, pk=None):
         """Get all events for a specific history record"""
         history = self.get_object()
+        events = get_history_events(history)
         
-        try:
-            events = json.loads(history.event)
-            return Response(events)
-        except (json.JSONDecodeError, TypeError):
+        if not events:
             return Response([{
                 "type": "unknown",
-                "details": history.event or "No details available",
+                "details": "No details available",
                 "timestamp": history.created_at.isoformat() if history.created_at else None
             }])
+        
+        return Response(events)
     
     @action(detail=False, methods=['get'])
     def project(self, request, project_id=None):
@@ -86,10 +90,14 @@ def get_nested_history(request, project_id):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@renderer_classes(api_settings.DEFAULT_RENDERER_CLASSES + [NDJSONRenderer])
 def get_all_projects_nested_history(request):
     """
-    Get nested history for all projects
+    Get nested history for all projects (use ?format=ndjson to stream every project)
     """
+    if request.query_params.get('format') == 'ndjson':
+        return stream_projects_history_ndjson(request)
+    
     # Immediate test response to confirm function is being called
     if request.query_params.get('test') == 'true':
         return Response({"status": "success", "test": True}, status=status.HTTP_200_OK)
@@ -136,47 +144,18 @@ def get_all_projects_nested_history(request):
             }, status=status.HTTP_200_OK)
         
         # Get the paginated subset of projects
-        paginated_projects = all_projects[start:end]
+        paginated_projects = list(all_projects.select_related('ppap', 'team')[start:end])
         print(f"Processing {len(paginated_projects)} projects for page {page}")
         
-        # Extract project IDs and names safely
-        project_data = {}
-        for project in paginated_projects:
-            try:
-                project_data[project.id] = {
-                    "id": project.id,
-                    "name": project.name if hasattr(project, 'name') else f"Project {project.id}"
-                }
-            except Exception as e:
-                print(f"Error extracting data from project {getattr(project, 'id', 'unknown')}: {e}")
-                continue
+        # Load the nested history of the whole page with a fixed number of queries
+        nested_histories = load_nested_projects_history(paginated_projects)
         
-        # Process projects one by one
         all_nested_history = {}
-        for project_id, data in project_data.items():
-            print(f"Processing project {project_id} ({data['name']})")
-            
-            try:
-                # Call the nested history function
-                project_nested_history = get_nested_project_history(project_id)
-                
-                # Check if there was an error
-                if isinstance(project_nested_history, dict) and "error" in project_nested_history:
-                    print(f"Error for project {project_id}: {project_nested_history['error']}")
-                    continue
-                
-                # Store the result
-                all_nested_history[project_id] = {
-                    "project_name": data['name'],
-                    "history": project_nested_history
-                }
-                print(f"Successfully processed project {project_id}")
-                
-            except Exception as e:
-                print(f"Exception while processing project {project_id}: {str(e)}")
-                import traceback
-                traceback.print_exc()
-                continue
+        for project in paginated_projects:
+            all_nested_history[project.id] = {
+                "project_name": project.name if hasattr(project, 'name') else f"Project {project.id}",
+                "history": nested_histories[project.id]
+            }
         
         # Construct the final response
         response = {
@@ -1,14 +1,54 @@
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, renderer_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from django.http import StreamingHttpResponse
 from core.models import Project
-from core.services.history.nested_history import get_nested_project_history
+from core.services.history.nested_history import (
+    load_nested_projects_history,
+    iter_nested_projects_history
+)
+from core.views.renderers import NDJSONRenderer, ndjson_line
+
+NDJSON_BATCH_SIZE = 50
+
+def stream_projects_history_ndjson(request):
+    """
+    Stream the nested history of every project as NDJSON, one project per line
+    
+    Query parameters:
+        after_id (int, optional): Resume after this project ID (keyset cursor)
+        batch_size (int, optional): Projects loaded per batch (max 200)
+    """
+    try:
+        after_id = request.query_params.get('after_id')
+        after_id = int(after_id) if after_id else None
+        batch_size = max(min(int(request.query_params.get('batch_size', NDJSON_BATCH_SIZE)), 200), 1)
+    except (ValueError, TypeError):
+        return Response({"error": "after_id and batch_size must be integers"},
+                        status=status.HTTP_400_BAD_REQUEST)
+    
+    def generate():
+        for project, project_history in iter_nested_projects_history(
+            batch_size=batch_size, after_id=after_id
+        ):
+            yield ndjson_line({
+                "project_id": project.id,
+                "project_name": project.name,
+                "history": project_history
+            })
+    
+    return StreamingHttpResponse(generate(), content_type=NDJSONRenderer.media_type)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@renderer_classes(api_settings.DEFAULT_RENDERER_CLASSES + [NDJSONRenderer])
 def all_projects_history(request):
-    """Get history data for all projects"""
+    """Get history data for all projects (use ?format=ndjson to stream every project)"""
+    if request.query_params.get('format') == 'ndjson':
+        return stream_projects_history_ndjson(request)
+    
     try:
         # Get pagination parameters
         try:
@@ -28,26 +68,19 @@ def all_projects_history(request):
         start_index = (page - 1) * page_size
         end_index = min(start_index + page_size, total)
         
-        paginated_projects = all_projects[start_index:end_index]
+        paginated_projects = list(all_projects.select_related('ppap', 'team')[start_index:end_index])
+        
+        # Load the nested history of the whole page at once
+        nested_histories = load_nested_projects_history(paginated_projects)
         
         # Process each project
         results = {}
         for project in paginated_projects:
-            try:
-                project_history = get_nested_project_history(project.id)
-                
-                if isinstance(project_history, dict) and "error" in project_history:
-                    print(f"Error for project {project.id}: {project_history['error']}")
-                    continue
-                
-                project_name = project.name if hasattr(project, 'name') else f"Project {project.id}"
-                results[str(project.id)] = {
-                    "project_name": project_name,
-                    "history": project_history
-                }
-            except Exception as e:
-                print(f"Error processing project {project.id}: {e}")
-                continue
+            project_name = project.name if hasattr(project, 'name') else f"Project {project.id}"
+            results[str(project.id)] = {
+                "project_name": project_name,
+                "history": nested_histories[project.id]
+            }
         
         # Return paginated response
         return Response({
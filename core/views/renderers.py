@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline-delimited JSON renderer
+    
+    Streaming views return a StreamingHttpResponse directly; this renderer
+    lets DRF accept ?format=ndjson and renders plain responses (errors) as
+    a single JSON line.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        return ''.join(ndjson_line(row) for row in rows).encode(self.charset)
+
+def ndjson_line(data):
+    """Serialize one object as a newline-terminated JSON line"""
+    return json.dumps(data, cls=DjangoJSONEncoder) + '\n'
+
+class CSVRenderer(BaseRenderer):
+    """
+    CSV renderer for streamed exports
+    
+    Export views return a StreamingHttpResponse directly; plain responses
+    (errors) are rendered as a header line and one row.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        rows = data if isinstance(data, list) else [data]
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(rows[0]) if rows else [])
+        writer.writeheader()
+        writer.writerows(rows)
+        return buffer.getvalue().encode(self.charset)
+
+class ParquetRenderer(BaseRenderer):
+    """
+    Parquet renderer for streamed exports
+    
+    Lets DRF accept ?format=parquet; plain responses (errors) are rendered
+    as JSON since they are not tabular.
+    """
+    media_type = 'application/vnd.apache.parquet'
+    format = 'parquet'
+    charset = None
+    render_style = 'binary'
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return json.dumps(data, cls=DjangoJSONEncoder).encode('utf-8')
+
+class ICalendarRenderer(BaseRenderer):
+    """
+    iCalendar renderer for deadline feeds
+    
+    Feed views return a StreamingHttpResponse directly; this renderer lets
+    DRF accept text/calendar (and ?format=ics) and renders plain responses
+    (errors) as JSON since they are not calendars.
+    """
+    media_type = 'text/calendar'
+    format = 'ics'
+    charset = 'utf-8'
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return json.dumps(data, cls=DjangoJSONEncoder).encode(self.charset)
@@ -0,0 +1,56 @@
+from rest_framework import viewsets, status
+from rest_framework.response import Response
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+
+from core.models import ReportJob
+from core.services.analyse.api import submit_report_job, serialize_report_job
+
+class ReportJobViewSet(viewsets.ViewSet):
+    """
+    ViewSet to submit custom reports and poll for their results
+
+    Jobs are computed by `manage.py run_report_worker`.
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def create(self, request):
+        """
+        Submit a report (same parameters as analyse/custom_report)
+        
+        Returns 200 with the job when an identical report is already
+        available, 202 while it is pending or running.
+        """
+        try:
+            job = submit_report_job(request.data, request.user)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        
+        return Response(
+            serialize_report_job(job),
+            status=status.HTTP_200_OK if job.status == 'completed' else status.HTTP_202_ACCEPTED
+        )
+    
+    def retrieve(self, request, pk=None):
+        """Get the status of a report job"""
+        job = ReportJob.objects.filter(id=pk).first()
+        if job is None:
+            return Response({"error": f"Report job with ID {pk} not found"}, status=status.HTTP_404_NOT_FOUND)
+        
+        return Response(serialize_report_job(job))
+    
+    @action(detail=True, methods=['get'])
+    def result(self, request, pk=None):
+        """Get the report of a completed job"""
+        job = ReportJob.objects.filter(id=pk).first()
+        if job is None:
+            return Response({"error": f"Report job with ID {pk} not found"}, status=status.HTTP_404_NOT_FOUND)
+        
+        if job.status == 'failed':
+            return Response({"error": job.error}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        if job.status != 'completed':
+            return Response(serialize_report_job(job), status=status.HTTP_202_ACCEPTED)
+        
+        return Response(job.result)
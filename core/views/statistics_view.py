@@ -7,6 +7,11 @@ from django.utils import timezone
 from datetime import timedelta
 
 from core.models import Project, PPAP, Phase, Output, User, Team, Document, History
+from core.services.history.initialization import get_history_events
+from core.services.statistics.api import (
+    get_project_statistics, get_phase_statistics, get_portfolio_statistics,
+    get_statistics_snapshot
+)
 
 class StatisticsViewSet(viewsets.ViewSet):
     """
@@ -18,70 +23,14 @@ class StatisticsViewSet(viewsets.ViewSet):
     def project(self, request, pk=None):
         """
         Get statistics for a specific project
+        
+        Served from the project rollup (see core.services.project.rollup)
+        and cached until the project changes
         """
         try:
-            project = Project.objects.get(id=pk)
-            
-            # Get PPAP
-            ppap = PPAP.objects.filter(project=project).first()
-            
-            # Get phases
-            phases = Phase.objects.filter(ppap=ppap) if ppap else []
-            
-            # Get outputs
-            outputs = Output.objects.filter(phase__in=phases)
-            
-            # Calculate statistics
-            total_phases = len(phases)
-            completed_phases = sum(1 for phase in phases if phase.status in ['Completed', 'Approved'])
-            
-            total_outputs = outputs.count()
-            outputs_by_status = outputs.values('status').annotate(count=Count('status'))
-            
-            # Calculate timeline statistics
-            on_time_outputs = 0
-            delayed_outputs = 0
-            
-            for output in outputs:
-                history = History.objects.filter(history_id=output.history_id).order_by('-created_at').first()
-                if history and history.deadline and history.completed_at:
-                    if history.completed_at <= history.deadline:
-                        on_time_outputs += 1
-                    else:
-                        delayed_outputs += 1
-            
-            # Calculate document statistics
-            documents = Document.objects.filter(output__in=outputs)
-            documents_count = documents.count()
-            documents_by_type = documents.values('file_type').annotate(count=Count('file_type'))
-            
-            # Calculate user activity
-            user_activity = History.objects.filter(
-                Q(table_name='output') & Q(history_id__in=[o.history_id for o in outputs])
-            ).values('user').annotate(count=Count('user'))
-            
-            return Response({
-                'project_id': project.id,
-                'project_name': project.name,
-                'ppap_level': ppap.level if ppap else None,
-                'phases': {
-                    'total': total_phases,
-                    'completed': completed_phases,
-                    'completion_rate': (completed_phases / total_phases * 100) if total_phases > 0 else 0
-                },
-                'outputs': {
-                    'total': total_outputs,
-                    'by_status': outputs_by_status,
-                    'on_time': on_time_outputs,
-                    'delayed': delayed_outputs,
-                    'on_time_rate': (on_time_outputs / total_outputs * 100) if total_outputs > 0 else 0
-                },
-                'documents': {
-                    'total': documents_count,
-                    'by_type': documents_by_type
-                },
-                'user_activity': user_activity
-            })
+            return Response(get_statistics_snapshot(
+                'project', int(pk), int(pk), lambda: get_project_statistics(pk)
+            ))
             
         except Project.DoesNotExist:
             return Response(
@@ -98,54 +47,14 @@ class StatisticsViewSet(viewsets.ViewSet):
     def phase(self, request, pk=None):
         """
         Get statistics for a specific phase
+        
+        Cached until the project of the phase changes
         """
         try:
-            phase = Phase.objects.get(id=pk)
-            
-            # Get outputs
-            outputs = Output.objects.filter(phase=phase)
-            
-            # Calculate statistics
-            total_outputs = outputs.count()
-            outputs_by_status = outputs.values('status').annotate(count=Count('status'))
-            
-            # Calculate timeline statistics
-            on_time_outputs = 0
-            delayed_outputs = 0
-            
-            for output in outputs:
-                history = History.objects.filter(history_id=output.history_id).order_by('-created_at').first()
-                if history and history.deadline and history.completed_at:
-                    if history.completed_at <= history.deadline:
-                        on_time_outputs += 1
-                    else:
-                        delayed_outputs += 1
-            
-            # Calculate document statistics
-            documents = Document.objects.filter(output__in=outputs)
-            documents_count = documents.count()
-            
-            # Calculate user activity
-            user_activity = History.objects.filter(
-                Q(table_name='output') & Q(history_id__in=[o.history_id for o in outputs])
-            ).values('user').annotate(count=Count('user'))
-            
-            return Response({
-                'phase_id': phase.id,
-                'phase_name': phase.template.name if phase.template else "Unknown",
-                'status': phase.status,
-                'outputs': {
-                    'total': total_outputs,
-                    'by_status': outputs_by_status,
-                    'on_time': on_time_outputs,
-                    'delayed': delayed_outputs,
-                    'on_time_rate': (on_time_outputs / total_outputs * 100) if total_outputs > 0 else 0
-                },
-                'documents': {
-                    'total': documents_count
-                },
-                'user_activity': user_activity
-            })
+            project_id = Phase.objects.filter(id=pk).values_list('ppap__project_id', flat=True).get()
+            return Response(get_statistics_snapshot(
+                'phase', int(pk), project_id, lambda: get_phase_statistics(pk)
+            ))
             
         except Phase.DoesNotExist:
             return Response(
@@ -310,17 +219,16 @@ class StatisticsViewSet(viewsets.ViewSet):
             
             recent_activity = History.objects.filter(
                 created_at__gte=last_week
-            ).order_by('-created_at')[:10]
+            ).order_by('-created_at').prefetch_related('history_events')[:10]
             
             recent_activity_data = []
             for activity in recent_activity:
                 recent_activity_data.append({
                     'id': activity.id,
                     'title': activity.title,
-                    'event': activity.event,
+                    'events': get_history_events(activity),
                     'table_name': activity.table_name,
-                    'created_at': activity.created_at.isoformat(),
-                    'user': activity.user
+                    'created_at': activity.created_at.isoformat()
                 })
             
             return Response({
@@ -343,3 +251,36 @@ class StatisticsViewSet(viewsets.ViewSet):
                 {"error": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+    
+    @action(detail=False, methods=['get'])
+    def portfolio(self, request):
+        """
+        Get completion, on-time, overdue and document statistics of all projects
+        
+        Query parameters:
+            team_id (int, optional): Only projects of this team
+            client_id (int, optional): Only projects of this client
+            status (str, optional): Only projects with this status
+        """
+        try:
+            team_id = request.query_params.get('team_id')
+            client_id = request.query_params.get('client_id')
+            team_id = int(team_id) if team_id else None
+            client_id = int(client_id) if client_id else None
+        except ValueError:
+            return Response(
+                {"error": "team_id and client_id must be integers"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            return Response(get_portfolio_statistics(
+                team_id=team_id,
+                client_id=client_id,
+                status=request.query_params.get('status')
+            ))
+        except Exception as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
@@ -5,6 +5,50 @@ from rest_framework import status
 from core.services import timeline_api, logic_api
 from rest_framework import viewsets
 from rest_framework.decorators import action
+from datetime import datetime
+from django.utils import timezone
+from core.models import Project
+
+def _parse_deadline(value):
+    """Parse an ISO deadline, interpreting naive values in the current time zone"""
+    deadline = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    return timezone.make_aware(deadline) if timezone.is_naive(deadline) else deadline
+
+def _parse_simulation(data):
+    """
+    Read the proposed changes of a what-if simulation request
+    
+    Raises:
+        ValueError, TypeError, KeyError: If a change is malformed
+    """
+    entity_types = ('phase', 'output')
+    
+    deadline_changes = []
+    for change in data.get('deadlines') or []:
+        if change['entity_type'] not in entity_types:
+            raise ValueError(f"Unsupported entity_type: {change['entity_type']}")
+        deadline_changes.append((change['entity_type'], int(change['entity_id']), _parse_deadline(change['deadline'])))
+    
+    reassignments = []
+    for change in data.get('reassignments') or []:
+        if change['entity_type'] not in entity_types:
+            raise ValueError(f"Unsupported entity_type: {change['entity_type']}")
+        user_id = change.get('user_id')
+        reassignments.append((change['entity_type'], int(change['entity_id']), int(user_id) if user_id is not None else None))
+    
+    phase_weights = {}
+    for phase_id, weight in (data.get('phase_weights') or {}).items():
+        if float(weight) <= 0:
+            raise ValueError("Phase weights must be positive")
+        phase_weights[int(phase_id)] = float(weight)
+    
+    project_deadline = data.get('project_deadline')
+    return {
+        'project_deadline': _parse_deadline(project_deadline) if project_deadline else None,
+        'phase_weights': phase_weights,
+        'deadline_changes': deadline_changes,
+        'reassignments': reassignments
+    }
 
 class TimelineViewSet(viewsets.ViewSet):
     """
@@ -126,3 +170,51 @@ class TimelineViewSet(viewsets.ViewSet):
                 {"error": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+    
+    @action(detail=True, methods=['post'])
+    def simulate(self, request, pk=None):
+        """
+        Dry-run timeline changes on a project and return the resulting schedule
+        
+        Nothing is written. Body (every field optional):
+            project_deadline: New project deadline, replans every phase and output
+            phase_weights: {phase_id: weight} used when replanning, up to the
+                current project deadline if project_deadline is not given
+            deadlines: [{entity_type, entity_id, deadline}], propagated downstream
+            reassignments: [{entity_type, entity_id, user_id}]
+        """
+        user = request.user
+        project_id = pk
+        
+        try:
+            changes = _parse_simulation(request.data)
+        except (ValueError, TypeError, KeyError, AttributeError) as e:
+            return Response(
+                {"error": f"Invalid simulation request: {str(e)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            # Check authorization
+            if not logic_api.check_user_authorization(user.id, 'read', 'project', project_id):
+                return Response(
+                    {"error": "Not authorized to view project timeline"},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+            
+            return Response(timeline_api.simulate_timeline(int(project_id), **changes))
+        except Project.DoesNotExist:
+            return Response(
+                {"error": f"Project with ID {project_id} not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        except ValueError as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )